@@ -0,0 +1,90 @@
+"""
+Xotira benchmarki: oddiy dict yozuvlar va __slots__ li yozuvlar (database/models.py)
+
+Foydalanish:
+    python -m benchmarks.memory_bench                     # 1M foydalanuvchi
+    python -m benchmarks.memory_bench --collection orders --count 200000
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from benchmarks.synthetic import GENERATORS
+from database import serializers
+from database.models import Order, Product, User
+
+RECORD_TYPES = {"products": Product, "orders": Order, "users": User}
+
+
+def _measure(build: Callable[[], List]) -> Dict:
+    """
+    Yaratilgan ro'yxat egallagan xotira va yaratish vaqti
+
+    Args:
+        build: Ro'yxatni yaratuvchi funksiya
+
+    Returns:
+        Dict: {'bytes': ..., 'seconds': ...}
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    records = build()
+    seconds = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    gc.collect()
+    return {'bytes': size, 'seconds': seconds}
+
+
+def run(collection: str, count: int) -> Dict:
+    """
+    Benchmarkni bajarish
+
+    Yozuvlar fayldan o'qilgandek olinadi (JSON dan qayta yuklanadi),
+    shunda har bir qator alohida satr obyektlariga ega bo'ladi.
+
+    Args:
+        collection: "products", "orders" yoki "users"
+        count: Yozuvlar soni
+
+    Returns:
+        Dict: Natijalar
+    """
+    payload = serializers.get_dumper("json")(GENERATORS[collection](count))
+    record_type = RECORD_TYPES[collection]
+
+    dicts = _measure(lambda: serializers.loads(payload))
+    records = _measure(lambda: [record_type.from_dict(item) for item in serializers.loads(payload)])
+
+    return {
+        'collection': collection,
+        'records': count,
+        'dict_bytes': dicts['bytes'],
+        'slots_bytes': records['bytes'],
+        'dict_load_s': dicts['seconds'],
+        'slots_load_s': records['seconds'],
+        'saving': 1 - records['bytes'] / dicts['bytes'],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="dict va __slots__ yozuvlar xotirasi")
+    parser.add_argument("--collection", choices=sorted(RECORD_TYPES), default="users")
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--json", action="store_true", help="Natijani JSON ko'rinishida chiqarish")
+    args = parser.parse_args()
+
+    result = run(args.collection, args.count)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"{result['collection']}: {result['records']} ta yozuv")
+        print(f"  dict:    {result['dict_bytes'] / 1_048_576:8.1f} MB  ({result['dict_load_s']:.2f} s)")
+        print(f"  slots:   {result['slots_bytes'] / 1_048_576:8.1f} MB  ({result['slots_load_s']:.2f} s)")
+        print(f"  tejash:  {result['saving']:.0%}")
@@ -0,0 +1,107 @@
+"""
+Fayl formatlari benchmarki: yozish/o'qish vaqti va diskdagi hajm
+
+Foydalanish:
+    python -m benchmarks.serializers_bench                   # 10k, 100k va 1M
+    python -m benchmarks.serializers_bench --sizes 10000 100000   # tezroq, 1M siz
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from benchmarks.synthetic import GENERATORS
+from database import serializers
+
+
+def _stdlib_pretty(data: Any) -> bytes:
+    # Eski format: JSONDatabase avval shunday yozardi
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def _stdlib_load(payload: bytes) -> Any:
+    return json.loads(payload.decode('utf-8'))
+
+
+def _formats() -> List[Tuple[str, Callable[[Any], bytes], Callable[[bytes], Any]]]:
+    """
+    Solishtiriladigan formatlar: (nom, dump, load)
+    """
+    formats = [
+        ("stdlib indent=2", _stdlib_pretty, _stdlib_load),
+        ("stdlib compact",
+         lambda d: json.dumps(d, ensure_ascii=False, separators=(',', ':')).encode('utf-8'),
+         _stdlib_load),
+    ]
+    if serializers.orjson is not None:
+        formats.append(("orjson indent=2", serializers.get_dumper("pretty"), serializers.loads))
+        formats.append(("orjson compact", serializers.get_dumper("json"), serializers.loads))
+    if serializers.msgpack is not None:
+        formats.append(("msgpack", serializers.get_dumper("msgpack"), serializers.loads))
+    return formats
+
+
+def _best_of(func: Callable[[], Any], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes: List[int], repeat: int = 3) -> List[Dict]:
+    """
+    Benchmarkni bajarish
+
+    Args:
+        sizes: Yozuvlar soni (har bir kolleksiya uchun)
+        repeat: Har bir o'lchov necha marta takrorlanadi (eng yaxshisi olinadi)
+
+    Returns:
+        List[Dict]: Natijalar
+    """
+    results = []
+
+    for size in sizes:
+        for collection, generate in GENERATORS.items():
+            data = generate(size)
+            # Katta hajmlarda vaqtni tejash uchun kamroq takrorlash
+            rounds = repeat if size <= 100_000 else 1
+
+            for name, dump, load in _formats():
+                payload = dump(data)
+                assert load(payload) == data, name
+                results.append({
+                    'collection': collection,
+                    'records': size,
+                    'format': name,
+                    'dump_ms': _best_of(lambda: dump(data), rounds) * 1000,
+                    'load_ms': _best_of(lambda: load(payload), rounds) * 1000,
+                    'bytes': len(payload)
+                })
+
+    return results
+
+
+def _print_table(results: List[Dict]):
+    print(f"{'collection':<10} {'records':>9} {'format':<16} {'dump ms':>9} {'load ms':>9} {'MB':>8}")
+    for r in results:
+        print(f"{r['collection']:<10} {r['records']:>9} {r['format']:<16} "
+              f"{r['dump_ms']:>9.1f} {r['load_ms']:>9.1f} {r['bytes'] / 1_048_576:>8.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fayl formatlari benchmarki")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000],
+                        help="Har bir kolleksiyadagi yozuvlar soni")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="Natijani JSON ko'rinishida chiqarish")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        _print_table(results)
@@ -0,0 +1,374 @@
+"""
+JSONDatabase benchmarki: har bir ochiq metodning kechikishi (p50/p99) va xotirasi
+
+Har bir hajm uchun vaqtinchalik papkada sun'iy data/ yaratiladi (o'zbekcha
+tovar nomlari, config.DEFAULT_CATEGORIES, oxirgi bir yilga yoyilgan
+buyurtmalar) va alohida jarayonda o'lchanadi - shunda peak RSS va global
+db obyekti har bir hajm uchun toza bo'ladi.
+
+Natija JSON ko'rinishida - o'zgarishdan oldin va keyin solishtirish uchun:
+    python -m benchmarks.storage_bench --json > before.json
+    python -m benchmarks.storage_bench --sizes 10000 100000 1000000 --iterations 50
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import config
+from benchmarks.synthetic import STATUSES, make_categories, make_orders, make_products, make_users
+from database import serializers
+
+# Butun kolleksiyani aylanadigan metodlar kamroq takrorlanadi
+HEAVY_SHARE = 10
+
+# (nom, tayyorlash, chaqiruv, og'ir) - tayyorlash vaqti o'lchanmaydi va
+# chaqiruv argumentlarini qaytaradi
+Case = Tuple[str, Callable[[int], Tuple], Callable[..., Any], bool]
+
+
+def build_dataset(root: str, users: int, orders: int, products: int, seed: int = 1):
+    """
+    Sun'iy data/ papkasini yaratish
+
+    Buyurtmalar eski orders.json ko'rinishida yoziladi va JSONDatabase ni
+    birinchi ochishda haqiqiy ko'chirish yo'li bilan oylik partitsiyalarga
+    bo'linadi (eski oylar arxivga o'tadi).
+
+    Args:
+        root: Ishchi papka (ichida data/ yaratiladi)
+        users: Foydalanuvchilar soni
+        orders: Buyurtmalar soni
+        products: Tovarlar soni
+        seed: Tasodifiy generator boshlang'ich qiymati
+    """
+    start = datetime.now() - timedelta(days=365)
+    dump = serializers.get_dumper(config.DB_FORMAT)
+    data_dir = os.path.join(root, config.DATA_DIR)
+    os.makedirs(data_dir, exist_ok=True)
+
+    files = {
+        config.PRODUCTS_FILE: make_products(products, seed=seed, start=start),
+        config.USERS_FILE: make_users(users, seed=seed + 1, start=start),
+        config.ORDERS_FILE: make_orders(orders, users=users, products=products, seed=seed + 2, start=start),
+        config.CATEGORIES_FILE: make_categories(),
+    }
+    for filepath, data in files.items():
+        with open(os.path.join(root, filepath), 'wb') as f:
+            f.write(dump(data))
+
+
+def _percentile(samples: List[float], share: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+
+def _cases(db: Any, users: int, orders: int, products: int, rng: random.Random) -> List[Case]:
+    """
+    O'lchanadigan chaqiruvlar
+
+    ID'lar synthetic.py dagi kabi: tovar va buyurtmalar 1..N,
+    foydalanuvchilar 100_000_000 + i * 7.
+    """
+    categories = list(config.DEFAULT_CATEGORIES)
+    user_id = lambda: 100_000_000 + rng.randint(1, users) * 7
+    # Oxirgi ~5% buyurtmalar faol oylarda, birinchi yarmi arxivda
+    hot_order = lambda: rng.randint(max(int(orders * 0.95), 1), orders)
+    cold_order = lambda: rng.randint(1, max(orders // 2, 1))
+    month_ago = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d %H:%M:%S')
+    year_ago = (datetime.now() - timedelta(days=330)).strftime('%Y-%m-%d %H:%M:%S')
+    today = datetime.now().strftime('%Y-%m-%d 00:00:00')
+    week_ago = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d %H:%M:%S')
+    new_user_ids = iter(range(10_000_000, 20_000_000))
+    temp_categories = iter(f"🧪 Vaqtinchalik {i}" for i in range(10 ** 9))
+    renamed = {}
+    # Mavjud profillar (add_user o'zgarmagan ma'lumot bilan chaqirilganda)
+    profiles = [(u['user_id'], u.get('username'), u.get('first_name'), u.get('last_name'))
+                for u in db.get_all_users()[:1000]]
+
+    def rename_args(i):
+        # Har bir takrorda kategoriya nomi almashadi va keyingisida qaytariladi
+        old = renamed.get(i % 2, categories[i % 2])
+        new = f"{categories[i % 2]} ({i})" if old == categories[i % 2] else categories[i % 2]
+        renamed[i % 2] = new
+        return old, new
+
+    def delete_category_args(i):
+        # Kaskad o'chirish: yangi kategoriya va unga tegishli bir nechta tovar
+        category = next(temp_categories)
+        db.add_category(category)
+        for _ in range(5):
+            db.add_product(category, "Vaqtinchalik tovar", None, 10_000.0)
+        return (category,)
+
+    def delete_product_args(i):
+        product = db.add_product(rng.choice(categories), "O'chiriladigan tovar", None, 10_000.0)
+        return (product['id'],)
+
+    return [
+        # Kategoriyalar
+        ("get_categories", lambda i: (), db.get_categories, False),
+        ("add_category", lambda i: (next(temp_categories),), db.add_category, False),
+        ("update_category", rename_args, db.update_category, False),
+        ("delete_category", delete_category_args, db.delete_category, False),
+        # Tovarlar
+        ("get_product", lambda i: (rng.randint(1, products),), db.get_product, False),
+        ("get_products_by_category", lambda i: (rng.choice(categories),), db.get_products_by_category, False),
+        ("get_all_products", lambda i: (), db.get_all_products, False),
+        ("get_available_products", lambda i: (), db.get_available_products, False),
+        ("get_random_products", lambda i: (3,), db.get_random_products, False),
+        ("catalog", lambda i: (), db.catalog, False),
+        ("add_product",
+         lambda i: (rng.choice(categories), "Sport krossovka", "Benchmark", 250_000.0, "42"),
+         db.add_product, False),
+        ("update_product",
+         lambda i: (rng.randint(1, products), {'price': float(rng.randrange(10_000, 2_000_000, 1000))}),
+         lambda product_id, changes: db.update_product(product_id, **changes), False),
+        ("toggle_product_availability", lambda i: (rng.randint(1, products),),
+         db.toggle_product_availability, False),
+        ("delete_product", delete_product_args, db.delete_product, False),
+        ("compact_catalog", lambda i: (), db.compact_catalog, False),
+        # Buyurtmalar
+        ("create_order",
+         lambda i: (user_id(), "benchmark", rng.randint(1, products), "Ali Valiyev",
+                    "+998901234567", "Toshkent sh., Yunusobod tumani", rng.randint(1, 3)),
+         db.create_order, False),
+        ("get_order (hot)", lambda i: (hot_order(),), db.get_order, False),
+        ("get_order (archive)", lambda i: (cold_order(),), db.get_order, False),
+        ("get_user_orders", lambda i: (user_id(),), db.get_user_orders, False),
+        ("count_user_orders", lambda i: (user_id(),), db.count_user_orders, False),
+        ("update_order_status", lambda i: (hot_order(), rng.choice(STATUSES)), db.update_order_status, False),
+        ("get_order_status_counts", lambda i: (), db.get_order_status_counts, False),
+        ("next_order", lambda i: (), db.next_order, False),
+        ("get_statistics", lambda i: (), db.get_statistics, False),
+        ("get_sales_report", lambda i: (30,), db.get_sales_report, False),
+        ("record_post_event", lambda i: (rng.choice(("posted", "opened")),), db.record_post_event, False),
+        ("get_orders (last 30 days)", lambda i: (month_ago,), db.get_orders, False),
+        ("get_orders (limit 20)", lambda i: (None, None, 20), db.get_orders, False),
+        ("query_orders (status)", lambda i: (rng.choice(STATUSES),),
+         lambda status: db.query_orders(status=status), False),
+        ("query_orders (user)", lambda i: (user_id(),),
+         lambda uid: db.query_orders(user_id=uid), False),
+        ("query_orders (page 10)", lambda i: (),
+         lambda: _tenth_page(db), False),
+        ("get_orders (year)", lambda i: (year_ago,), db.get_orders, True),
+        ("get_all_orders", lambda i: (), db.get_all_orders, True),
+        ("iter_orders (year)", lambda i: (year_ago,),
+         lambda since: sum(len(batch) for batch in db.iter_orders(since)), True),
+        ("count_orders (today)", lambda i: (today,), db.count_orders, False),
+        ("count_orders (year)", lambda i: (year_ago,), db.count_orders, False),
+        ("compact_orders", lambda i: (), db.compact_orders, True),
+        ("archive_orders", lambda i: (), db.archive_orders, False),
+        # Foydalanuvchilar
+        ("add_user (unchanged)", lambda i: rng.choice(profiles), db.add_user, False),
+        ("add_user (existing)",
+         lambda i: (user_id(), f"user{i}", "Sardor", "Karimov"), db.add_user, False),
+        ("add_user (new)", lambda i: (next(new_user_ids), None, "Jasur", None), db.add_user, False),
+        ("get_all_users", lambda i: (), db.get_all_users, True),
+        ("iter_users", lambda i: (), lambda: sum(len(batch) for batch in db.iter_users()), True),
+        ("get_users_count", lambda i: (), db.get_users_count, False),
+        ("get_users (week)", lambda i: (week_ago,), db.get_users, False),
+        ("count_users (week)", lambda i: (week_ago,), db.count_users, False),
+        ("flush", lambda i: (), db.flush, False),
+    ]
+
+
+def _tenth_page(db: Any) -> Dict:
+    """Kursor bo'yicha 10-sahifagacha varaqlash"""
+    page = db.query_orders()
+    for _ in range(9):
+        if not page['next']:
+            break
+        page = db.query_orders(cursor=page['next'])
+    return page
+
+
+def _run_case(case: Case, iterations: int) -> Dict:
+    """
+    Bitta metodni o'lchash
+
+    Vaqt tracemalloc siz o'lchanadi, keyin bitta qo'shimcha chaqiruvda
+    metod ajratgan eng ko'p xotira (peak) o'lchanadi.
+    """
+    name, prepare, call, heavy = case
+    rounds = max(iterations // HEAVY_SHARE, 3) if heavy else iterations
+    samples = []
+
+    for i in range(rounds):
+        args = prepare(i)
+        start = time.perf_counter()
+        call(*args)
+        samples.append(time.perf_counter() - start)
+
+    args = prepare(rounds)
+    gc.collect()
+    tracemalloc.start()
+    call(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'method': name,
+        'calls': rounds,
+        'p50_ms': _percentile(samples, 0.50) * 1000,
+        'p99_ms': _percentile(samples, 0.99) * 1000,
+        'max_ms': max(samples) * 1000,
+        'peak_alloc_bytes': peak,
+    }
+
+
+def _peak_rss() -> int:
+    # Linux da KiB, macOS da bayt
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+def run_size(users: int, orders: int, products: int, iterations: int,
+             workdir: Optional[str] = None, seed: int = 1) -> Dict:
+    """
+    Bitta hajm uchun benchmark (joriy jarayonda)
+
+    Joriy papka ishchi papkaga o'zgartiriladi, chunki config dagi yo'llar
+    nisbiy (data/...) va database.json_db import qilinganda global db
+    yaratiladi. Shuning uchun har bir hajm alohida jarayonda ishga
+    tushiriladi (run() ga qarang).
+
+    Args:
+        users: Foydalanuvchilar soni
+        orders: Buyurtmalar soni
+        products: Tovarlar soni
+        iterations: Har bir metod necha marta chaqiriladi
+        workdir: Ishchi papka (default: vaqtinchalik, oxirida o'chiriladi)
+        seed: Tasodifiy generator boshlang'ich qiymati
+
+    Returns:
+        Dict: Hajm, tayyorlash vaqtlari va metodlar natijalari
+    """
+    root = workdir or tempfile.mkdtemp(prefix="storage_bench_")
+    cwd = os.getcwd()
+
+    try:
+        start = time.perf_counter()
+        build_dataset(root, users, orders, products, seed)
+        generate_seconds = time.perf_counter() - start
+
+        os.chdir(root)
+        start = time.perf_counter()
+        from database.json_db import JSONDatabase, db
+        if not isinstance(db, JSONDatabase):
+            db = JSONDatabase()
+        open_seconds = time.perf_counter() - start
+
+        # Birinchi ochish ko'chirish va arxivlashni o'z ichiga oladi,
+        # sovuq yuklash esa shundan keyin alohida o'lchanadi
+        start = time.perf_counter()
+        db.get_users_count()
+        db.get_all_products()
+        db.get_order_status_counts()
+        load_seconds = time.perf_counter() - start
+
+        rng = random.Random(seed)
+        results = [_run_case(case, iterations) for case in _cases(db, users, orders, products, rng)]
+        db.flush()
+    finally:
+        os.chdir(cwd)
+        if workdir is None:
+            shutil.rmtree(root, ignore_errors=True)
+
+    return {
+        'users': users,
+        'orders': orders,
+        'products': products,
+        'iterations': iterations,
+        'generate_s': generate_seconds,
+        'open_s': open_seconds,
+        'load_s': load_seconds,
+        'peak_rss_bytes': _peak_rss(),
+        'methods': results,
+    }
+
+
+def run(sizes: List[int], products: int, iterations: int, seed: int = 1) -> Dict:
+    """
+    Benchmarkni bajarish - har bir hajm alohida jarayonda
+
+    Args:
+        sizes: Foydalanuvchilar va buyurtmalar soni (har bir hajm uchun)
+        products: Tovarlar soni
+        iterations: Har bir metod necha marta chaqiriladi
+        seed: Tasodifiy generator boshlang'ich qiymati
+
+    Returns:
+        Dict: Muhit haqida ma'lumot va har bir hajm natijalari
+    """
+    runs = []
+    for size in sizes:
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.storage_bench", "--worker",
+             "--sizes", str(size), "--products", str(products),
+             "--iterations", str(iterations), "--seed", str(seed)],
+            check=True, stdout=subprocess.PIPE
+        ).stdout
+        runs.append(json.loads(output))
+
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'db_format': config.DB_FORMAT,
+        'write_behind': config.DB_WRITE_BEHIND,
+        'orjson': serializers.orjson is not None,
+        'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'runs': runs,
+    }
+
+
+def _print_table(report: Dict):
+    for result in report['runs']:
+        print(f"\nusers={result['users']} orders={result['orders']} products={result['products']} "
+              f"open={result['open_s']:.2f}s load={result['load_s']:.2f}s "
+              f"peak RSS={result['peak_rss_bytes'] / 1_048_576:.0f} MB")
+        print(f"{'method':<28} {'calls':>6} {'p50 ms':>9} {'p99 ms':>9} {'peak KB':>10}")
+        for m in result['methods']:
+            print(f"{m['method']:<28} {m['calls']:>6} {m['p50_ms']:>9.3f} {m['p99_ms']:>9.3f} "
+                  f"{m['peak_alloc_bytes'] / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="JSONDatabase benchmarki")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000],
+                        help="Foydalanuvchilar va buyurtmalar soni")
+    parser.add_argument("--products", type=int, default=1_000)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--workdir", help="data/ shu papkada yaratiladi va o'chirilmaydi (bitta hajm uchun)")
+    parser.add_argument("--json", action="store_true", help="Natijani JSON ko'rinishida chiqarish")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker or args.workdir:
+        # Ichki rejim: bitta hajm, natija stdout ga JSON (loglar stderr da)
+        result = run_size(args.sizes[0], args.sizes[0], args.products, args.iterations,
+                          workdir=args.workdir, seed=args.seed)
+        if args.worker:
+            print(json.dumps(result))
+            sys.exit(0)
+        report = {'runs': [result]}
+    else:
+        report = run(args.sizes, args.products, args.iterations, args.seed)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_table(report)
@@ -0,0 +1,167 @@
+"""
+Benchmarklar uchun sun'iy ma'lumotlar generatori
+Yozuvlar JSONDatabase yaratadigan yozuvlar bilan bir xil ko'rinishda
+"""
+
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+import config
+from database.models import OrderStatus
+
+STATUSES = [status.value for status in OrderStatus]
+_START = datetime(2024, 1, 1)
+
+# Kategoriya -> tovar turlari (nomlar shulardan yig'iladi)
+_PRODUCT_KINDS = {
+    "👕 Kiyimlar": ["ko'ylak", "shim", "kurtka", "futbolka", "chopon", "do'ppi"],
+    "👟 Poyabzal": ["krossovka", "tufli", "etik", "shippak"],
+    "🎒 Sumkalar": ["ryukzak", "sumka", "hamyon", "chamadon"],
+    "⌚ Aksessuarlar": ["soat", "kamar", "ko'zoynak", "uzuk"],
+    "📱 Elektronika": ["telefon", "quloqchin", "zaryadlovchi", "planshet"],
+    "🏠 Uy-ro'zg'or": ["choynak", "piyola", "gilam", "ko'rpacha", "lagan"],
+}
+_ADJECTIVES = ["Erkaklar", "Ayollar", "Bolalar", "Klassik", "Sport", "Milliy", "Yozgi", "Qishki"]
+_DESCRIPTIONS = [
+    "Sifatli mahsulot, kafolat bilan",
+    "Toshkent bo'ylab yetkazib berish bepul",
+    "Yangi kolleksiya, cheklangan miqdorda",
+]
+_FIRST_NAMES = ["Ali", "Vali", "Dilnoza", "Sardor", "Malika", "Jasur", "Gulnora", "Bekzod", "Nodira", "Otabek"]
+_LAST_NAMES = [None, "Karimov", "Rahimova", "Toshmatov", "Yusupova", "Ergashev"]
+
+
+def _timestamp(rng: random.Random, index: int, count: int, start: datetime = None) -> str:
+    # Vaqt ID bilan birga o'sadi (haqiqiy bazadagidek), bir yil oralig'ida
+    moment = (start or _START) + timedelta(seconds=int(index * 365 * 86400 / max(count, 1)) + rng.randint(0, 59))
+    return moment.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def product_name(rng: random.Random, category: str) -> str:
+    """
+    Kategoriyaga mos o'zbekcha tovar nomi ("Milliy chopon", "Sport krossovka")
+
+    Args:
+        rng: Tasodifiy generator
+        category: Kategoriya
+
+    Returns:
+        str: Tovar nomi
+    """
+    kind = rng.choice(_PRODUCT_KINDS.get(category, ["mahsulot"]))
+    return f"{rng.choice(_ADJECTIVES)} {kind}"
+
+
+def make_categories() -> List[Dict]:
+    """
+    Kategoriyalar: config.DEFAULT_CATEGORIES, ID'lar 1 dan
+
+    Returns:
+        List[Dict]: Kategoriyalar ro'yxati
+    """
+    return [{'id': i, 'name': name} for i, name in enumerate(config.DEFAULT_CATEGORIES, 1)]
+
+
+def make_products(count: int, seed: int = 1, start: datetime = None) -> List[Dict]:
+    """
+    Sun'iy tovarlar
+
+    Args:
+        count: Tovarlar soni
+        seed: Tasodifiy generator boshlang'ich qiymati
+        start: Birinchi yozuv vaqti (default: 2024-01-01), yozuvlar bir yilga yoyiladi
+
+    Returns:
+        List[Dict]: Tovarlar ro'yxati
+    """
+    rng = random.Random(seed)
+    categories = [rng.choice(make_categories()) for _ in range(count)]
+    return [
+        {
+            'id': i,
+            'category_id': category['id'],
+            'name': product_name(rng, category['name']),
+            'description': rng.choice(_DESCRIPTIONS) if rng.random() < 0.7 else None,
+            'price': float(rng.randrange(10_000, 2_000_000, 1000)),
+            'size': rng.choice([None, "S", "M", "L", "XL", "42"]),
+            'photo_id': f"AgACAgIAAxkBAAI{i:010d}" if rng.random() < 0.8 else None,
+            'is_available': rng.random() < 0.8,
+            'created_at': _timestamp(rng, i, count, start)
+        }
+        for i, category in enumerate(categories, 1)
+    ]
+
+
+def make_users(count: int, seed: int = 2, start: datetime = None) -> List[Dict]:
+    """
+    Sun'iy foydalanuvchilar
+
+    Args:
+        count: Foydalanuvchilar soni
+        seed: Tasodifiy generator boshlang'ich qiymati
+        start: Birinchi yozuv vaqti (default: 2024-01-01)
+
+    Returns:
+        List[Dict]: Foydalanuvchilar ro'yxati
+    """
+    rng = random.Random(seed)
+    return [
+        {
+            'user_id': 100_000_000 + i * 7,
+            'username': f"user{i}" if rng.random() < 0.6 else None,
+            'first_name': rng.choice(_FIRST_NAMES),
+            'last_name': rng.choice(_LAST_NAMES),
+            'is_blocked': rng.random() < 0.02,
+            'created_at': _timestamp(rng, i, count, start)
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def make_orders(count: int, users: int = None, products: int = None, seed: int = 3,
+                start: datetime = None) -> List[Dict]:
+    """
+    Sun'iy buyurtmalar
+
+    Args:
+        count: Buyurtmalar soni
+        users: Foydalanuvchilar soni (default: count // 4)
+        products: Tovarlar soni (default: count // 10)
+        seed: Tasodifiy generator boshlang'ich qiymati
+        start: Birinchi yozuv vaqti (default: 2024-01-01)
+
+    Returns:
+        List[Dict]: Buyurtmalar ro'yxati
+    """
+    rng = random.Random(seed)
+    users = users or max(count // 4, 1)
+    products = products or max(count // 10, 1)
+    orders = []
+
+    for i in range(1, count + 1):
+        user_id = 100_000_000 + rng.randint(1, users) * 7
+        created_at = _timestamp(rng, i, count, start)
+        orders.append({
+            'id': i,
+            'order_number': f"ORD-{created_at[:10].replace('-', '')}{i:06d}-{user_id}",
+            'user_id': user_id,
+            'username': f"user{user_id}",
+            'product_id': rng.randint(1, products),
+            'customer_name': f"{rng.choice(_FIRST_NAMES)} {rng.choice(_LAST_NAMES[1:])}",
+            'phone': f"+99890{rng.randint(1_000_000, 9_999_999)}",
+            'address': "Toshkent sh., Chilonzor tumani, 5-kvartal",
+            'quantity': rng.randint(1, 3),
+            'status': rng.choice(STATUSES),
+            'created_at': created_at
+        })
+
+    return orders
+
+
+# Kolleksiya nomi -> generator
+GENERATORS = {
+    "products": make_products,
+    "orders": make_orders,
+    "users": make_users,
+}
@@ -27,6 +27,76 @@ PRODUCTS_FILE = f"{DATA_DIR}/products.json"
 ORDERS_FILE = f"{DATA_DIR}/orders.json"
 USERS_FILE = f"{DATA_DIR}/users.json"
 CATEGORIES_FILE = f"{DATA_DIR}/categories.json"
+# ID hisoblagichlari: kolleksiya -> oxirgi berilgan ID (ID'lar qayta ishlatilmaydi)
+SEQUENCES_FILE = f"{DATA_DIR}/sequences.json"
+# Savdo hisoboti: kunlik va tovarlar bo'yicha tayyor hisoblagichlar (database/sales.py)
+SALES_FILE = f"{DATA_DIR}/sales.json"
+# O'chirilgan tovar va kategoriyalar (tombstone): o'qishlarda yashiriladi,
+# fayllardan esa scheduler dagi siqish vazifasi olib tashlaydi
+TOMBSTONES_FILE = f"{DATA_DIR}/tombstones.json"
+# Siqishda olib tashlangan tovarlar - eski buyurtmalar tarixida ko'rsatish uchun
+DELETED_PRODUCTS_FILE = f"{DATA_DIR}/products.deleted.json"
+
+# Yangi bazada avtomatik yaratiladigan kategoriyalar
+DEFAULT_CATEGORIES = [
+    "👕 Kiyimlar",
+    "👟 Poyabzal",
+    "🎒 Sumkalar",
+    "⌚ Aksessuarlar",
+    "📱 Elektronika",
+    "🏠 Uy-ro'zg'or"
+]
+
+# Ma'lumotlar bazasi: "json" (data/*.json fayllar) yoki "sqlite"
+# SQLite ga o'tishdan oldin: python -m database.migrate
+DB_BACKEND = os.getenv("DB_BACKEND", "json")
+SQLITE_FILE = f"{DATA_DIR}/shop.db"
+
+# data/*.json fayllar formati: "json" (ixcham), "pretty" (indent=2, qo'lda
+# tahrirlash uchun) yoki "msgpack" (binar, katta kolleksiyalar uchun, pip
+# install msgpack). orjson o'rnatilgan bo'lsa JSON u orqali yoziladi/o'qiladi.
+# O'qishda format avtomatik aniqlanadi - o'zgartirish uchun migratsiya kerak emas
+DB_FORMAT = os.getenv("DB_FORMAT", "json")
+
+# Buyurtmalar oylar bo'yicha saqlanadi: data/orders/2026-10.jsonl
+# (append-only jurnal: yangi buyurtmalar va status o'zgarishlari).
+# Oxirgi ORDERS_HOT_MONTHS oy xotirada, eskilari gzip arxivda
+# (2025-06.jsonl.gz) va faqat kerak bo'lganda o'qiladi.
+# ORDERS_COMPACT_EVERY ta status yozuvidan keyin partitsiyalar siqiladi
+ORDERS_DIR = f"{DATA_DIR}/orders"
+ORDERS_MANIFEST_FILE = f"{ORDERS_DIR}/manifest.json"
+ORDERS_HOT_MONTHS = 3
+# Xotirada saqlanadigan o'qilgan arxiv partitsiyalar soni
+ORDERS_COLD_CACHE = 2
+ORDERS_COMPACT_EVERY = 500
+# Eski format (orders.json + jurnal) - birinchi ishga tushishda data/orders/ ga ko'chiriladi
+ORDERS_JOURNAL_FILE = f"{DATA_DIR}/orders.journal.jsonl"
+
+# Group commit: bir vaqtda kelgan yozishlar shu oyna (ms) ichida
+# bitta fsync ga birlashtiriladi
+DB_GROUP_COMMIT_WINDOW_MS = 5
+
+# Handlerlar bazaga shu hajmdagi thread pool orqali murojaat qiladi
+# (database/async_db.py), event loop fayl bilan ishlashni kutmaydi
+DB_THREAD_POOL_SIZE = 4
+
+# Write-behind rejimi: o'zgarishlar darhol emas, fon oqimi orqali yoziladi.
+# Kolleksiya DB_FLUSH_INTERVAL_MS davomida o'zgarmay qolsa yoki birinchi
+# yozilmagan o'zgarishdan beri DB_MAX_STALENESS_MS o'tsa, diskka yoziladi.
+# Jarayon kutilmaganda o'chsa, oxirgi DB_MAX_STALENESS_MS dagi o'zgarishlar yo'qolishi mumkin.
+# Faqat bitta jarayon uchun: yozilmagan o'zgarishlar boshqa jarayonlarga ko'rinmaydi
+DB_WRITE_BEHIND = os.getenv("DB_WRITE_BEHIND", "0") == "1"
+DB_FLUSH_INTERVAL_MS = 200
+DB_MAX_STALENESS_MS = 2000
+
+# Bir nechta jarayon (bot, alohida scheduler) bitta data/ bilan ishlashi uchun
+# qulf fayli: o'qish/yozish fcntl.flock bilan himoyalanadi, ichida esa avlod
+# raqami turadi - boshqa jarayon yozganini fayllarni o'qimasdan aniqlash uchun
+DB_LOCK_FILE = f"{DATA_DIR}/db.lock"
+
+# Avlod o'zgarmasa ham fayllar shuncha vaqtda bir tekshiriladi (ms) -
+# qo'lda tahrirlangan fayllar keshga shu muddatda yetib keladi
+DB_RECHECK_INTERVAL_MS = 1000
 
 # Avtomatik post vaqtlari (24-soatlik format)
 AUTO_POST_TIMES = [
@@ -0,0 +1,128 @@
+"""
+Ma'lumotlar bazasining asinxron (await qilinadigan) varianti
+Handlerlar shu moduldan foydalanadi - fayl bilan ishlash event loopni bloklamaydi
+"""
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, List
+
+import config
+from database.catalog import CatalogSnapshot
+from database.json_db import db
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDatabase:
+    """
+    Sinxron bazaning asinxron o'rami
+
+    Bazaning har bir public metodi shu yerda xuddi shu nom va argumentlar
+    bilan coroutine sifatida mavjud. Chaqiruv alohida thread pool da
+    bajariladi: JSON ni o'qish/yozish va fsync event loopni to'xtatmaydi,
+    bir vaqtda kelgan yozishlar esa group commit orqali birlashadi.
+
+    Foydalanish:
+        from database.async_db import adb
+
+        products = await adb.get_products_by_category(category)
+    """
+
+    def __init__(self, database: Any, max_workers: int = None):
+        """
+        Args:
+            database: Sinxron baza obyekti (JSONDatabase)
+            max_workers: Thread pool hajmi
+        """
+        self._db = database
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or config.DB_THREAD_POOL_SIZE,
+            thread_name_prefix="db"
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        """
+        Bazaning public metodini coroutine ga aylantirib qaytarish
+        (birinchi murojaatdan keyin obyektda saqlanadi)
+        """
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        attr = getattr(self._db, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def method(*args, **kwargs):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor,
+                functools.partial(attr, *args, **kwargs)
+            )
+
+        setattr(self, name, method)
+        return method
+
+    async def catalog(self) -> CatalogSnapshot:
+        """
+        Katalog snapshoti
+
+        Tayyor snapshot thread pool ga o'tmasdan, shu yerning o'zida
+        qulfsiz olinadi; faqat uni yangilash kerak bo'lganda fayllar
+        thread pool da tekshiriladi.
+
+        Foydalanish:
+            catalog = await adb.catalog()
+            products = catalog.products_in(category)
+        """
+        snapshot = self._db.current_catalog()
+        if snapshot is not None:
+            return snapshot
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._db.catalog)
+
+    async def _stream(self, name: str, *args, **kwargs) -> AsyncIterator[List[Dict]]:
+        """
+        Bazaning iter_* generatorini asinxron iteratsiya qilish: har bir
+        qism thread pool da olinadi
+        """
+        loop = asyncio.get_running_loop()
+        iterator = getattr(self._db, name)(*args, **kwargs)
+        done = object()
+
+        while True:
+            batch = await loop.run_in_executor(self._executor, next, iterator, done)
+            if batch is done:
+                return
+            yield batch
+
+    def iter_users(self, batch_size: int = 1000) -> AsyncIterator[List[Dict]]:
+        """
+        Foydalanuvchilarni qismlab olish
+
+        Foydalanish:
+            async for users in adb.iter_users(batch_size=500):
+                ...
+        """
+        return self._stream('iter_users', batch_size=batch_size)
+
+    def iter_orders(self, since: str = None, until: str = None,
+                    batch_size: int = 1000) -> AsyncIterator[List[Dict]]:
+        """
+        Buyurtmalarni qismlab olish (eng eskisi birinchi)
+        """
+        return self._stream('iter_orders', since=since, until=until, batch_size=batch_size)
+
+    def shutdown(self):
+        """
+        Thread pool ni yopish (bajarilayotgan chaqiruvlar tugashini kutadi)
+        """
+        self._executor.shutdown(wait=True)
+
+
+# Global asinxron database obyekti
+adb = AsyncDatabase(db)
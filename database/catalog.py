@@ -0,0 +1,89 @@
+"""
+Katalogning o'zgarmas (immutable) snapshoti
+
+Foydalanuvchilar katalogni ko'rganda har bir so'rov bazaning qulfini
+olmasligi uchun kategoriyalar va tovarlar bitta tayyor obyektga
+yig'iladi. Snapshot hech qachon o'zgartirilmaydi: katalog o'zgarganda
+baza eskisini tashlab, keyingi o'qishda yangisini quradi va bitta
+havola almashtirish bilan e'lon qiladi. Eski snapshotni ushlab turgan
+handler esa oxirigacha bir xil (izchil) ko'rinish bilan ishlaydi.
+"""
+
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+
+class CatalogSnapshot:
+    """
+    Katalog snapshoti
+
+    Tovarlar faqat o'qiladigan lug'at (MappingProxyType) ko'rinishida
+    saqlanadi va 'category' kalitida kategoriya nomi bor - handlerlar
+    ular bilan oddiy tovar lug'ati kabi ishlaydi (product['name'],
+    product.get('size')).
+
+    Attributes:
+        version: Snapshot tartib raqami (har bir qayta qurishda oshadi)
+        categories: Kategoriyalar nomlari (qo'shilgan tartibda)
+    """
+
+    __slots__ = ('version', 'categories', '_products', '_by_category')
+
+    def __init__(self, version: int, categories: Iterable[str], products: Iterable[Dict]):
+        """
+        Args:
+            version: Snapshot tartib raqami
+            categories: Kategoriyalar nomlari
+            products: O'chirilmagan tovarlar (yozuvlar yoki lug'atlar)
+        """
+        categories = tuple(categories)
+        views: Dict[int, Mapping[str, Any]] = {}
+        by_category: Dict[str, list] = {name: [] for name in categories}
+
+        for product in products:
+            # Faylda bo'lmagan maydonlar ham kalit sifatida (product['size'] -> None)
+            fields = {key: product[key] for key in getattr(product, 'KEYS', ())}
+            fields.update(product, category=product['category'])
+            view = MappingProxyType(fields)
+            views[view['id']] = view
+            if view.get('is_available', True) and view['category'] in by_category:
+                by_category[view['category']].append(view)
+
+        set_slot = object.__setattr__
+        set_slot(self, 'version', version)
+        set_slot(self, 'categories', categories)
+        set_slot(self, '_products', MappingProxyType(views))
+        set_slot(self, '_by_category', MappingProxyType(
+            {name: tuple(items) for name, items in by_category.items()}
+        ))
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("CatalogSnapshot o'zgartirilmaydi")
+
+    def product(self, product_id: int) -> Optional[Mapping[str, Any]]:
+        """
+        Tovarni ID bo'yicha olish (mavjud bo'lmasa ham)
+
+        Args:
+            product_id: Tovar ID
+
+        Returns:
+            Optional[Mapping[str, Any]]: Tovar yoki None
+        """
+        return self._products.get(product_id)
+
+    def products_in(self, category: str) -> Tuple[Mapping[str, Any], ...]:
+        """
+        Kategoriyadagi mavjud tovarlar
+
+        Args:
+            category: Kategoriya nomi
+
+        Returns:
+            Tuple[Mapping[str, Any], ...]: Tovarlar (kategoriya topilmasa bo'sh)
+        """
+        return self._by_category.get(category, ())
+
+    def __repr__(self) -> str:
+        return (f"CatalogSnapshot(version={self.version}, categories={len(self.categories)}, "
+                f"products={len(self._products)})")
@@ -3,44 +3,211 @@ JSON fayllar bilan ishlash moduli - To'liq versiya
 Barcha CRUD operatsiyalari bilan
 """
 
-import json
+import atexit
+import functools
 import os
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator, Tuple
 import config
 import random
 import logging
 
+from database import partitions, sales, serializers
+from database.catalog import CatalogSnapshot
+from database.models import Category, Order, OrderStatus, Product, User, format_epoch, to_epoch
+from database.storage import GroupCommitter, DatabaseError, ProcessLock
+
 logger = logging.getLogger(__name__)
 
 
+def _synchronized(method):
+    """
+    Metodni baza qulfi ostida bajarish (o'qish metodlari uchun)
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._reading():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _transactional(method):
+    """
+    O'zgartiruvchi metod: xotiradagi o'zgarish qulf ostida bajariladi,
+    diskka yozilishini kutish esa qulf bo'shagandan keyin - shunda boshqa
+    oqimlar o'z o'zgarishlarini shu commitga qo'shib ulguradi
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._transaction():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class JSONDatabase:
     """
     JSON fayllar bilan ishlash klassi
     Bu klass barcha ma'lumotlar bazasi operatsiyalarini amalga oshiradi
+
+    Har bir fayl birinchi o'qilgandan keyin xotirada saqlanadi (cache).
+    O'qishlar xotiradan bajariladi, yozishlar esa darhol faylga ham
+    yoziladi (write-through). Fayl tashqaridan o'zgartirilsa (mtime yoki
+    hajmi o'zgarsa), keyingi o'qishda u qaytadan yuklanadi.
+
+    Buyurtmalar oylar bo'yicha partitsiyalarda saqlanadi (data/orders/,
+    qarang: database/partitions.py). Yangi buyurtmalar va status
+    o'zgarishlari o'z oyining fayliga bitta qator qilib qo'shiladi va
+    vaqti-vaqti bilan siqiladi (compaction). Xotirada faqat oxirgi
+    config.ORDERS_HOT_MONTHS oy turadi; eski oylar gzip arxivga o'tkaziladi
+    va so'rov ularning vaqt oralig'iga tushgandagina o'qiladi.
+
+    Klass oqimlar uchun xavfsiz (thread-safe): barcha public metodlar
+    bitta qulf ostida ishlaydi, shuning uchun ularni thread pool dan
+    chaqirish mumkin (qarang: database/async_db.py).
+
+    Bir nechta jarayon ham bitta data/ papka bilan ishlay oladi: o'qishlar
+    umumiy, o'zgartirishlar eksklyuziv fayl qulfi ostida bajariladi
+    (storage.ProcessLock). Qulf olinganda avlod raqami o'zgarmagan bo'lsa,
+    kesh fayllarni tekshirmasdan ishlatiladi; o'zgargan bo'lsa - fayllar
+    holati solishtirilib, faqat boshqa jarayon yozgan kolleksiyalar qayta
+    o'qiladi. Shuning uchun o'zgartirish har doim diskdagi eng oxirgi
+    holat ustiga bajariladi va boshqa jarayonning yozgani yo'qolmaydi.
+
+    Tovar va kategoriyalar o'chirilganda fayllar qayta yozilmaydi: ularning
+    ID si tombstones.json ga yoziladi va yozuv barcha o'qish va indekslardan
+    yashiriladi. Fayllardan esa compact_catalog() olib tashlaydi (scheduler
+    orqali). O'chirilgan tovarlar eski buyurtmalar tarixi uchun
+    get_product(..., include_deleted=True) orqali olinadi.
+
+    Write-behind rejimida (config.DB_WRITE_BEHIND) o'zgarishlar faqat
+    xotirada bajariladi va kolleksiya "dirty" deb belgilanadi; fon oqimi
+    ularni config.DB_FLUSH_INTERVAL_MS tinch davrdan keyin, lekin
+    config.DB_MAX_STALENESS_MS dan kechiktirmay diskka yozadi. Ko'p
+    ketma-ket o'zgarishlar bitta yozishga birlashadi. To'xtashda flush()
+    chaqirilishi kerak.
     """
 
     def __init__(self):
         """
         Initsializatsiya - data papkasini va fayllarni yaratish
         """
+        # Xotiradagi kolleksiyalar: fayl yo'li -> ma'lumotlar
+        self._cache: Dict[str, Any] = {}
+        # Kesh qaysi fayl holatiga mos kelishi: fayl yo'li -> (mtime_ns, size, inode)
+        self._cache_stamps: Dict[str, Any] = {}
+        # Kesh fayllar bilan oxirgi solishtirilgan vaqt: fayl yo'li -> time.monotonic
+        # (avlod o'zgarganda tozalanadi)
+        self._verified: Dict[str, float] = {}
+        # oy -> faol partitsiyadagi (hali siqilmagan) status yozuvlari soni
+        self._partition_entries: Dict[str, int] = {}
+        # Fayllar formati (o'qishda format avtomatik aniqlanadi)
+        self._dumper = serializers.get_dumper(config.DB_FORMAT)
+        # Barcha yozishlar shu orqali diskka tushadi (atomik + group commit)
+        self._committer = GroupCommitter(window_ms=config.DB_GROUP_COMMIT_WINDOW_MS)
+
+        # Kesh va indekslarni himoya qiluvchi qulf
+        self._lock = threading.RLock()
+        # Har bir oqimning joriy tranzaksiyasi (ichma-ich chaqiruvlar uchun)
+        self._local = threading.local()
+        # kolleksiya -> navbatga qo'yilgan, lekin hali yozilmagan o'zgarishlar soni
+        self._inflight_writes: Dict[str, int] = {}
+        # Yozib bo'lmagan kolleksiyalar (oxirgi yozish tugaganda keshi tashlanadi)
+        self._failed_writes: set = set()
+
+        # Write-behind: fayl -> hali navbatga qo'yilmagan o'zgarishlar
+        # ({'base': ..., 'appends': [...]}, base=None - keshdan yoziladi)
+        self._write_behind = config.DB_WRITE_BEHIND
+        self._deferred: Dict[str, Dict[str, Any]] = {}
+        # kolleksiya -> birinchi yozilmagan o'zgarish vaqti (time.monotonic)
+        self._dirty_since: Dict[str, float] = {}
+        self._last_dirty = 0.0
+        self._flusher_stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        # Savdo ko'rinishiga hali yozilmagan o'zgarishlar. Har bir buyurtma
+        # yoki deep link bosilishida butun sales.json ni qayta yozmaslik
+        # uchun ular xotirada to'planadi va flush_sales da bitta yozishda tushadi:
+        # buyurtmalar deltasi (sales.empty() tuzilishida) va u qaysi
+        # ko'rinish (epoch) ustiga yig'ilgani, (kun, hodisa) -> post hodisalari
+        self._sales_pending: Dict = sales.empty()
+        self._sales_epoch: Optional[str] = None
+        self._post_events: Dict[Tuple[str, str], int] = {}
+        self._post_events_lock = threading.Lock()
+
+        # Indekslar: ID -> yozuv (keshdagi o'sha obyektlar)
+        self._categories_by_id: Dict[int, Category] = {}
+        self._categories_by_name: Dict[str, Category] = {}
+        self._products_by_id: Dict[int, Dict] = {}
+        # O'chirilgan (tombstone), lekin hali siqilmagan yozuvlar
+        self._deleted_product_ids: set = set()
+        self._deleted_category_ids: set = set()
+        self._deleted_products: Dict[int, Product] = {}
+        # Siqilgan o'chirilgan tovarlar arxivi: ID -> yozuv
+        self._archived_products: Dict[int, Product] = {}
+        # kategoriya ID -> {is_available: tovar ID'lari (o'sish tartibida)}
+        self._products_by_category: Dict[int, Dict[bool, List[int]]] = {}
+        self._orders_by_id: Dict[int, Dict] = {}
+        # user_id -> buyurtma ID'lari (eng yangisi birinchi)
+        self._orders_by_user: Dict[int, List[int]] = {}
+        # Faol buyurtmalar kalitlari (created_ts, id) o'sish tartibida:
+        # hammasi va status bo'yicha (query_orders sahifalari uchun)
+        self._order_keys: List[Tuple[int, int]] = []
+        self._order_keys_by_status: Dict[str, List[Tuple[int, int]]] = {}
+        # Ma'lum foydalanuvchilar: user_id -> yozuv (/start da ro'yxatni aylanmaslik uchun)
+        self._users_by_id: Dict[int, Dict] = {}
+        # Ro'yxatdan o'tish vaqti indeksi: saralangan (created_at epoch, user_id)
+        self._user_keys: List[Tuple[int, int]] = []
+        # Statistika hisoblagichlari (har bir o'zgarishda yangilanadi):
+        # is_available -> tovarlar soni, status -> faol oylardagi buyurtmalar soni
+        self._product_counts: Dict[bool, int] = {True: 0, False: 0}
+        self._order_status_counts: Dict[str, int] = {}
+        # O'qilgan arxiv partitsiyalar (LRU): oy -> (holat, buyurtmalar, ID -> buyurtma)
+        self._cold_orders: "OrderedDict[str, Tuple[Any, List[Dict], Dict[int, Dict]]]" = OrderedDict()
+        # Katalog snapshoti (qarang: catalog()) - katalog o'zgarganda None bo'ladi
+        self._catalog: Optional[CatalogSnapshot] = None
+        self._catalog_version = 0
+        self._catalog_checked = 0.0
+
         # Data papkasini yaratish
         if not os.path.exists(config.DATA_DIR):
             os.makedirs(config.DATA_DIR)
             logger.info(f"✅ Data papka yaratildi: {config.DATA_DIR}")
 
-        # Fayllarni initsializatsiya qilish
-        self._init_file(config.PRODUCTS_FILE, [])
-        self._init_file(config.ORDERS_FILE, [])
-        self._init_file(config.USERS_FILE, [])
-        self._init_file(config.CATEGORIES_FILE, [
-            "👕 Kiyimlar",
-            "👟 Poyabzal",
-            "🎒 Sumkalar",
-            "⌚ Aksessuarlar",
-            "📱 Elektronika",
-            "🏠 Uy-ro'zg'or"
-        ])
+        # Boshqa jarayonlar bilan birgalikda ishlash uchun qulf
+        self._process_lock = ProcessLock(config.DB_LOCK_FILE)
+
+        # Ikki jarayon bir vaqtda ishga tushsa, fayllarni faqat bittasi yaratadi
+        self._process_lock.acquire(exclusive=True)
+        try:
+            # Fayllarni initsializatsiya qilish
+            self._init_file(config.PRODUCTS_FILE, [])
+            self._init_file(config.USERS_FILE, [])
+            self._init_file(config.CATEGORIES_FILE, [
+                {'id': i, 'name': name} for i, name in enumerate(config.DEFAULT_CATEGORIES, 1)
+            ])
+            self._init_file(config.SEQUENCES_FILE, {})
+            self._init_file(config.TOMBSTONES_FILE, {'products': {}, 'categories': {}})
+            self._init_file(config.DELETED_PRODUCTS_FILE, [])
+            self._init_categories()
+            self._init_sequences()
+            self._init_orders()
+            self._repair_partitions()
+
+            if self._write_behind:
+                self._start_flusher()
+            # Xotirada to'plangan savdo o'zgarishlari chiqishda yo'qolmasin
+            # (flush dan keyin ro'yxatga olinadi - atexit teskari tartibda chaqiradi)
+            atexit.register(self.flush_sales)
+
+            # O'tgan oylarni arxivga o'tkazish
+            self.archive_orders()
+            self._init_sales()
+        finally:
+            self._process_lock.release()
 
         logger.info("✅ JSON Database initsializatsiya qilindi")
 
@@ -53,55 +220,1068 @@ class JSONDatabase:
             default_data: Default ma'lumotlar
         """
         if not os.path.exists(filepath):
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(default_data, f, ensure_ascii=False, indent=2)
+            self._committer.write(filepath, self._dump_json(default_data))
+            self._process_lock.mark_changed()
             logger.info(f"✅ Fayl yaratildi: {filepath}")
 
+    def _init_categories(self):
+        """
+        Eski formatni ko'chirish: categories.json dagi nomlar ID li
+        yozuvlarga, tovarlardagi kategoriya nomi esa category_id ga aylanadi
+
+        Avval kategoriyalar, keyin tovarlar yoziladi. Jarayon o'rtada
+        uzilsa, keyingi ishga tushishda qolgan tovarlar ko'chiriladi.
+        """
+        categories = self._read_json(config.CATEGORIES_FILE)
+        products = self._read_json(config.PRODUCTS_FILE)
+        legacy = [p for p in products if 'category_id' not in p]
+
+        if not legacy and not any(isinstance(c, str) for c in categories):
+            return
+
+        records = [c for c in categories if isinstance(c, dict)]
+        by_name = {c['name']: c for c in records}
+        known = len(categories)
+
+        def category_id(name: Optional[str]) -> Optional[int]:
+            if name is None:
+                return None
+            record = by_name.get(name)
+            if record is None:
+                record = {'id': max((c['id'] for c in records), default=0) + 1, 'name': name}
+                by_name[name] = record
+                records.append(record)
+            return record['id']
+
+        for name in categories:
+            if isinstance(name, str):
+                category_id(name)
+        for product in legacy:
+            product['category_id'] = category_id(product.pop('category', None))
+
+        if len(records) > known:
+            # Ro'yxatda yo'q kategoriyadagi tovarlar yo'qolmasin
+            logger.warning(f"⚠️ Tovarlardan {len(records) - known} ta kategoriya tiklandi")
+
+        self._committer.write(config.CATEGORIES_FILE, self._dump_json(records))
+        self._committer.write(config.PRODUCTS_FILE, self._dump_json(products))
+        self._process_lock.mark_changed()
+        logger.info(f"✅ Kategoriyalar ID ga ko'chirildi: {len(records)} ta kategoriya, {len(legacy)} ta tovar")
+
+    def _init_sequences(self):
+        """
+        Tovar va kategoriya hisoblagichlarini o'chirilgan yozuvlar ID'lari
+        bilan ham to'ldirish
+
+        Hisoblagich birinchi marta faqat mavjud yozuvlardan boshlansa,
+        o'chirilgan (tombstone) yoki arxivlangan yozuvning ID si qayta
+        berilib, eski buyurtmalar boshqa tovarga bog'lanib qoladi.
+        """
+        sequences = self._read_json(config.SEQUENCES_FILE)
+        if not isinstance(sequences, dict):
+            sequences = {}
+
+        def max_id(*filepaths: str) -> int:
+            return max(
+                (item['id'] for filepath in filepaths for item in self._read_json(filepath)
+                 if isinstance(item, dict) and isinstance(item.get('id'), int)),
+                default=0
+            )
+
+        floors = {
+            'categories': max_id(config.CATEGORIES_FILE),
+            'products': max_id(config.PRODUCTS_FILE, config.DELETED_PRODUCTS_FILE),
+        }
+        raised = {name: floor for name, floor in floors.items() if sequences.get(name, 0) < floor}
+        if not raised:
+            return
+
+        sequences.update(raised)
+        self._committer.write(config.SEQUENCES_FILE, self._dump_json(sequences))
+        self._process_lock.mark_changed()
+
+    def _file_stamp(self, filepath: str) -> Optional[Tuple[int, int]]:
+        """
+        Faylning joriy holati (o'zgarganini aniqlash uchun)
+
+        Args:
+            filepath: Fayl yo'li
+
+        Returns:
+            Optional[Tuple[int, int, int]]: (mtime_ns, size, inode) yoki fayl
+                bo'lmasa None. Atomik yozish faylni yangi inode bilan
+                almashtiradi - bir xil vaqt va hajmdagi yozish ham sezildi.
+        """
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def _load(self, filepath: str) -> Any:
+        """
+        Kolleksiyani xotiradan olish, kerak bo'lsa fayldan yuklash
+
+        Fayl keshlangandan beri o'zgarmagan bo'lsa, qayta o'qilmaydi. Avlod
+        o'zgarmagan bo'lsa (boshqa jarayon hech narsa yozmagan), fayl holati
+        ham config.DB_RECHECK_INTERVAL_MS da bir martadan ko'p tekshirilmaydi.
+
+        Args:
+            filepath: Fayl yo'li
+
+        Returns:
+            Any: Xotiradagi ma'lumotlar (o'zgartirmaslik kerak)
+        """
+        if filepath in self._cache and (self._inflight_writes.get(filepath)
+                                        or filepath in self._dirty_since):
+            # Xotira diskdan oldinda - qayta yuklash o'zgarishlarni yo'qotadi
+            return self._cache[filepath]
+
+        now = time.monotonic()
+        if filepath in self._cache and \
+                now - self._verified.get(filepath, -1e9) < config.DB_RECHECK_INTERVAL_MS / 1000:
+            return self._cache[filepath]
+
+        stamp = self._collection_stamp(filepath)
+
+        if filepath in self._cache and self._cache_stamps.get(filepath) == stamp:
+            self._verified[filepath] = now
+            return self._cache[filepath]
+
+        try:
+            if filepath == config.ORDERS_FILE:
+                data = self._read_orders()
+            else:
+                data = self._read_records(filepath)
+        except DatabaseError:
+            if filepath not in self._cache:
+                raise
+            # Buzilgan faylni eski nusxa ustiga yozib yubormaslik uchun
+            # oxirgi to'g'ri holatni ishlatishda davom etamiz
+            logger.error(f"❌ Keshdagi oxirgi to'g'ri nusxa ishlatilmoqda: {filepath}")
+            return self._cache[filepath]
+
+        self._set_cache(filepath, data, stamp)
+        self._verified[filepath] = now
+
+        if stamp is not None:
+            logger.debug(f"🔄 Kesh yangilandi: {filepath}")
+        return data
+
+    def _collection_stamp(self, filepath: str) -> Any:
+        """
+        Kolleksiya holati - u qaysi fayllardan iborat bo'lsa, barchasining holati
+
+        Args:
+            filepath: Kolleksiya fayli
+
+        Returns:
+            Any: Taqqoslanadigan holat
+        """
+        if filepath == config.ORDERS_FILE:
+            # Papka holati yangi/o'chirilgan partitsiyalarni, fayllar holati
+            # esa ularga qo'shilgan qatorlarni aniqlaydi
+            months = sorted(self._cache.get(filepath) or ())
+            return self._file_stamp(config.ORDERS_DIR), tuple(
+                self._file_stamp(partitions.hot_path(m)) for m in months
+            )
+        return self._file_stamp(filepath)
+
+    def _set_cache(self, filepath: str, data: Any, stamp: Any):
+        """
+        Keshni yangilash va kerak bo'lsa indekslarni qayta qurish
+
+        Indekslar faqat kolleksiya yangi obyekt bilan almashtirilganda
+        qayta quriladi. Joyida o'zgartirilgan ro'yxatlar uchun indekslarni
+        o'zgartirgan metodning o'zi yangilaydi.
+
+        Args:
+            filepath: Fayl yo'li
+            data: Kolleksiya
+            stamp: Fayl holati
+        """
+        replaced = self._cache.get(filepath) is not data
+        self._cache[filepath] = data
+        self._cache_stamps[filepath] = stamp
+
+        if filepath in (config.CATEGORIES_FILE, config.PRODUCTS_FILE, config.TOMBSTONES_FILE):
+            # Keyingi o'qish yangi snapshot quradi
+            self._catalog = None
+
+        if replaced:
+            self._reindex(filepath, data)
+
+    def _reindex(self, filepath: str, data: Any):
+        """
+        Kolleksiya indekslarini noldan qurish
+
+        Args:
+            filepath: Fayl yo'li
+            data: Kolleksiya
+        """
+        if filepath == config.TOMBSTONES_FILE:
+            data = data if isinstance(data, dict) else {}
+            self._deleted_product_ids = {int(i) for i in data.get('products', ())}
+            self._deleted_category_ids = {int(i) for i in data.get('categories', ())}
+            # Boshqa jarayon o'chirgan yozuvlar indekslardan chiqsin
+            for collection in (config.CATEGORIES_FILE, config.PRODUCTS_FILE):
+                if collection in self._cache:
+                    self._reindex(collection, self._cache[collection])
+        elif filepath == config.CATEGORIES_FILE:
+            self._tombstones()
+            self._categories_by_id = {
+                c.id: c for c in data if c.id not in self._deleted_category_ids
+            }
+            self._categories_by_name = {c.name: c for c in self._categories_by_id.values()}
+            # Keshdagi tovarlar eski kategoriya obyektlariga bog'langan
+            # (o'chirilgan tovarlar ham - tarixda kategoriya nomi kerak)
+            all_categories = {c.id: c for c in data}
+            for product in self._cache.get(config.PRODUCTS_FILE) or ():
+                product.bind_category(all_categories.get(product.category_id))
+        elif filepath == config.PRODUCTS_FILE:
+            self._tombstones()
+            all_categories = {c.id: c for c in self._load(config.CATEGORIES_FILE)}
+            self._products_by_id = {}
+            self._deleted_products = {}
+            self._products_by_category = {}
+            self._product_counts = {True: 0, False: 0}
+            for product in data:
+                product.bind_category(all_categories.get(product.category_id))
+                if product.id in self._deleted_product_ids:
+                    self._deleted_products[product.id] = product
+                    continue
+                self._products_by_id[product.id] = product
+                self._index_product(product)
+        elif filepath == config.DELETED_PRODUCTS_FILE:
+            self._archived_products = {p.id: p for p in data} if isinstance(data, list) else {}
+        elif filepath == config.USERS_FILE:
+            self._users_by_id = {u.user_id: u for u in data}
+            self._user_keys = sorted(self._user_key(u) for u in data)
+        elif filepath == config.ORDERS_FILE:
+            # data: oy -> faol partitsiya buyurtmalari
+            self._orders_by_id = {}
+            self._order_status_counts = {}
+            self._order_keys_by_status = {}
+            # Partitsiyalar vaqt tartibida o'qiladi - saralash bir marta o'tishdan iborat
+            for month in sorted(data):
+                for order in data[month]:
+                    self._orders_by_id[order.id] = order
+                    self._count_status(order.status, 1)
+                    self._order_keys_by_status.setdefault(str(order.status), []).append(
+                        self._order_sort_key(order)
+                    )
+
+            for keys in self._order_keys_by_status.values():
+                keys.sort()
+            self._order_keys = sorted(
+                key for keys in self._order_keys_by_status.values() for key in keys
+            )
+
+            # Vaqt indeksi bo'yicha: eng yangi birinchi, bir xil sanada - katta ID
+            self._orders_by_user = {}
+            for _, order_id in reversed(self._order_keys):
+                self._orders_by_user.setdefault(
+                    self._orders_by_id[order_id].user_id, []
+                ).append(order_id)
+
+    def _index_product(self, product: Dict):
+        """
+        Tovarni kategoriya indeksiga qo'shish
+
+        Args:
+            product: Tovar
+        """
+        buckets = self._products_by_category.setdefault(
+            product.category_id, {True: [], False: []}
+        )
+        insort(buckets[bool(product.is_available)], product.id)
+        self._product_counts[bool(product.is_available)] += 1
+
+    def _unindex_product(self, product: Dict):
+        """
+        Tovarni kategoriya indeksidan olib tashlash
+
+        Args:
+            product: Tovar
+        """
+        buckets = self._products_by_category.get(product.category_id)
+        if buckets is None:
+            return
+
+        ids = buckets[bool(product.is_available)]
+        idx = bisect_left(ids, product.id)
+        if idx < len(ids) and ids[idx] == product.id:
+            del ids[idx]
+            self._product_counts[bool(product.is_available)] -= 1
+
+    def _index_order_status(self, order: Order, old_status: Any = None):
+        """
+        Faol buyurtmani kalitlar indeksiga qo'shish yoki statusini ko'chirish
+
+        Args:
+            order: Buyurtma (status allaqachon yangi)
+            old_status: Oldingi status (None - yangi buyurtma)
+        """
+        key = self._order_sort_key(order)
+
+        if old_status is None:
+            insort(self._order_keys, key)
+        else:
+            keys = self._order_keys_by_status.get(str(old_status), [])
+            idx = bisect_left(keys, key)
+            if idx < len(keys) and keys[idx] == key:
+                del keys[idx]
+
+        insort(self._order_keys_by_status.setdefault(str(order.status), []), key)
+
+    def _count_status(self, status: Any, delta: int):
+        """
+        Faol buyurtmalarning status hisoblagichini o'zgartirish
+
+        Args:
+            status: Buyurtma statusi
+            delta: +1 yoki -1
+        """
+        status = str(status)
+        count = self._order_status_counts.get(status, 0) + delta
+        if count:
+            self._order_status_counts[status] = count
+        else:
+            self._order_status_counts.pop(status, None)
+
+    def _next_id(self, sequence: str, records_by_id: Dict[int, Any], floor: int = 0) -> int:
+        """
+        Kolleksiya uchun yangi ID berish (O(1), hech qachon qayta ishlatilmaydi)
+
+        Hisoblagich sequences.json da saqlanadi va yozuv bilan bitta
+        commitda yoziladi. O'chirilgan oxirgi yozuvning ID si ham qayta
+        berilmaydi, shuning uchun ID'larni keshlash va indekslash xavfsiz.
+
+        Args:
+            sequence: Hisoblagich nomi ("products", "orders")
+            records_by_id: Kolleksiyaning ID indeksi
+            floor: Indeksda bo'lmagan (masalan, arxivlangan) eng katta ID
+
+        Returns:
+            int: Yangi ID
+        """
+        sequences = self._load(config.SEQUENCES_FILE)
+
+        if sequence not in sequences:
+            # Birinchi marta: mavjud eng katta ID dan davom etish (bir martalik)
+            sequences[sequence] = max(
+                (i for i in records_by_id if isinstance(i, int)), default=0
+            )
+
+        new_id = max(sequences[sequence], floor) + 1
+        # Fayllar qo'lda o'zgartirilgan bo'lsa ham band ID berilmaydi
+        while new_id in records_by_id:
+            new_id += 1
+
+        sequences[sequence] = new_id
+        self._write_json(config.SEQUENCES_FILE, sequences)
+        return new_id
+
+    def _read_records(self, filepath: str) -> Any:
+        """
+        Kolleksiyani o'qish: tovarlar va foydalanuvchilar yozuv obyektlariga aylantiriladi
+
+        Args:
+            filepath: Fayl yo'li
+
+        Returns:
+            Any: Yozuvlar ro'yxati yoki o'qilgan ma'lumotlar
+        """
+        data = self._read_json(filepath)
+        record_type = {
+            config.CATEGORIES_FILE: Category,
+            config.PRODUCTS_FILE: Product,
+            config.DELETED_PRODUCTS_FILE: Product,
+            config.USERS_FILE: User,
+        }.get(filepath)
+
+        if record_type is not None and isinstance(data, list):
+            return [record_type.from_dict(item) for item in data]
+        return data
+
+    @staticmethod
+    def _order_sort_key(order: Order) -> Tuple[int, int]:
+        """
+        Buyurtmalarni saralash kaliti: sana, bir xil sanada - ID
+        """
+        return partitions.time_key(order)
+
+    @staticmethod
+    def _user_key(user: User) -> Tuple[int, int]:
+        """
+        Foydalanuvchilar vaqt indeksi kaliti: ro'yxatdan o'tgan vaqt, user_id
+        """
+        return user.created_ts or 0, user.user_id or 0
+
+    @staticmethod
+    def _time_range(keys: List[Tuple[int, int]], since: Optional[str],
+                    until: Optional[str]) -> Tuple[int, int]:
+        """
+        Saralangan (epoch, ID) kalitlarida vaqt oralig'i chegaralari (binary search)
+
+        Args:
+            keys: Saralangan kalitlar
+            since: Boshlanish vaqti (shu jumladan)
+            until: Tugash vaqti (shu jumladan)
+
+        Returns:
+            Tuple[int, int]: keys[lo:hi] - oraliqdagi kalitlar
+        """
+        since_ts = to_epoch(since) if since else None
+        until_ts = to_epoch(until) if until else None
+        lo = bisect_left(keys, (since_ts,)) if since_ts is not None else 0
+        hi = bisect_left(keys, (until_ts + 1,)) if until_ts is not None else len(keys)
+        return lo, max(lo, hi)
+
     def _read_json(self, filepath: str) -> Any:
         """
-        JSON fayldan o'qish
+        Ma'lumotlar faylidan o'qish (JSON yoki msgpack - avtomatik aniqlanadi)
 
         Args:
             filepath: Fayl yo'li
 
         Returns:
             Any: O'qilgan ma'lumotlar
+
+        Raises:
+            DatabaseError: Fayl buzilgan bo'lsa. Bo'sh ro'yxat qaytarib
+                bo'lmaydi - keyingi yozish butun kolleksiyani o'chirib yuboradi.
         """
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
+            with open(filepath, 'rb') as f:
+                return serializers.loads(f.read())
+        except FileNotFoundError as e:
             logger.error(f"❌ Faylni o'qishda xatolik ({filepath}): {e}")
-            # Default qiymat qaytarish
-            if filepath == config.CATEGORIES_FILE:
-                return []
             return []
+        except ValueError as e:
+            logger.error(f"❌ Fayl buzilgan ({filepath}): {e}")
+            raise DatabaseError(f"Fayl buzilgan: {filepath}") from e
+
+    def _dump_json(self, data: Any) -> bytes:
+        """
+        Ma'lumotlarni faylga yoziladigan ko'rinishga keltirish (config.DB_FORMAT)
+
+        Args:
+            data: Ma'lumotlar
+
+        Returns:
+            bytes: Fayl mazmuni
+        """
+        return self._dumper(data)
 
     def _write_json(self, filepath: str, data: Any):
         """
-        JSON faylga yozish
+        JSON faylga atomik yozish
+
+        Fayl vaqtinchalik faylga yozilib, fsync qilinadi va rename orqali
+        almashtiriladi. Bir vaqtda kelgan yozishlar bitta commitga birlashadi.
+        Yozish tranzaksiya oxirida, qulf bo'shagandan keyin kutiladi.
 
         Args:
             filepath: Fayl yo'li
             data: Yoziladigan ma'lumotlar
         """
+        # Write-through: kesh darhol yangi ma'lumotga teng
+        self._set_cache(filepath, data, self._cache_stamps.get(filepath))
+        # Serializatsiya navbatga qo'yishda (write-behind da - flush da) bajariladi
+        self._submit(filepath, None)
+
+    def _acquire_process_lock(self, exclusive: bool):
+        """
+        Jarayonlararo qulfni olish (self._lock ostida chaqiriladi)
+
+        Boshqa jarayon ma'lumotlarni o'zgartirgan bo'lsa, keshning barcha
+        kolleksiyalari fayllar bilan qayta solishtiriladi.
+
+        Args:
+            exclusive: True - o'zgartirish uchun
+        """
+        if self._process_lock.acquire(exclusive):
+            self._verified.clear()
+            logger.debug("🔄 Boshqa jarayon ma'lumotlarni o'zgartirgan - kesh tekshiriladi")
+
+    @contextmanager
+    def _reading(self):
+        """
+        O'qish: oqimlar qulfi va umumiy (shared) fayl qulfi ostida
+        """
+        with self._lock:
+            self._acquire_process_lock(exclusive=False)
+            try:
+                yield
+            finally:
+                self._process_lock.release()
+
+    @contextmanager
+    def _transaction(self):
+        """
+        O'zgartirish tranzaksiyasi
+
+        Ichida qulf ushlab turiladi va yozishlar navbatga qo'yiladi.
+        Eng tashqi tranzaksiya tugagach, qulf bo'shatiladi va navbatdagi
+        yozishlar diskka tushishi kutiladi. Eksklyuziv fayl qulfi esa
+        yozishlar tugaguncha ushlanadi - boshqa jarayonlar yarim yozilgan
+        holatni ko'rmaydi va eskirgan kesh ustiga o'zgartirish qilmaydi.
+        """
+        depth = getattr(self._local, 'depth', 0)
+        if depth == 0:
+            self._local.pending = []
+
+        self._local.depth = depth + 1
+        locked = False
+        try:
+            with self._lock:
+                if depth == 0:
+                    self._acquire_process_lock(exclusive=True)
+                    locked = True
+                yield
+        finally:
+            self._local.depth = depth
+            if depth == 0:
+                pending, self._local.pending = self._local.pending, []
+                try:
+                    self._finish_writes(pending)
+                finally:
+                    if locked:
+                        self._process_lock.release()
+
+    @staticmethod
+    def _collection_of(filepath: str) -> str:
+        """
+        Fayl qaysi kolleksiyaga tegishli (partitsiyalar - buyurtmalarga)
+        """
+        return config.ORDERS_FILE if partitions.is_partition_file(filepath) else filepath
+
+    def _submit(self, filepath: str, payload: Optional[bytes], append: bool = False):
+        """
+        Yozishni group commit navbatiga qo'yish (tranzaksiya ichida)
+
+        Write-behind rejimida yozish navbatga qo'yilmaydi, balki keyingi
+        flush() gacha kechiktiriladi.
+
+        Args:
+            filepath: Fayl yo'li
+            payload: Faylning to'liq mazmuni yoki qo'shiladigan qism
+                (None - keshdagi kolleksiya yoziladi)
+            append: True bo'lsa fayl oxiriga qo'shiladi
+        """
+        if self._write_behind:
+            self._defer(filepath, payload, append)
+            return
+
+        if payload is None:
+            payload = self._dump_json(self._cache[filepath])
+        self._enqueue(filepath, payload, append)
+
+    def _enqueue(self, filepath: str, payload: bytes, append: bool = False):
+        """
+        Yozishni darhol group commit navbatiga qo'yish
+
+        Args:
+            filepath: Fayl yo'li
+            payload: Faylning to'liq mazmuni yoki qo'shiladigan qism
+            append: True bo'lsa fayl oxiriga qo'shiladi
+        """
+        collection = self._collection_of(filepath)
+        ticket = self._committer.submit(filepath, payload, append=append)
+        self._process_lock.mark_changed()
+        self._inflight_writes[collection] = self._inflight_writes.get(collection, 0) + 1
+        self._local.pending.append((ticket, collection))
+
+    def _finish_writes(self, pending: List[Tuple[Any, str]]):
+        """
+        Navbatga qo'yilgan yozishlar diskka tushishini kutish (qulfsiz)
+
+        Args:
+            pending: (chipta, kolleksiya) juftliklari
+        """
+        for ticket, collection in pending:
+            ok = self._committer.wait(ticket)
+
+            with self._lock:
+                self._inflight_writes[collection] -= 1
+                if not ok:
+                    self._failed_writes.add(collection)
+
+                if self._inflight_writes[collection]:
+                    continue
+
+                if collection in self._failed_writes and self._write_behind:
+                    # Write-behind da kesh yagona to'liq nusxa - uni tashlamasdan
+                    # keyingi flush da kolleksiyani to'liq qayta yozamiz
+                    self._failed_writes.discard(collection)
+                    self._defer_snapshot(collection)
+                elif collection in self._failed_writes:
+                    # Keshni tashlab yuborish - keyingi o'qish fayldan bo'ladi
+                    self._failed_writes.discard(collection)
+                    self._cache.pop(collection, None)
+                    self._cache_stamps.pop(collection, None)
+                    if collection == config.ORDERS_FILE:
+                        self._cold_orders.clear()
+                else:
+                    # Disk xotiraga yetib oldi
+                    self._cache_stamps[collection] = self._collection_stamp(collection)
+
+    # ==================== WRITE-BEHIND ====================
+
+    def _defer(self, filepath: str, payload: Optional[bytes], append: bool = False):
+        """
+        Yozishni keyingi flush() gacha kechiktirish va kolleksiyani dirty qilish
+
+        Bitta faylga kelgan almashtirishlardan faqat oxirgisi saqlanadi,
+        jurnal qatorlari esa to'planib, bitta qo'shish bilan yoziladi.
+
+        Args:
+            filepath: Fayl yo'li
+            payload: Faylning to'liq mazmuni, qo'shiladigan qism yoki None
+            append: True bo'lsa fayl oxiriga qo'shiladi
+        """
+        changes = self._deferred.pop(filepath, None) or {'appends': []}
+        if append:
+            changes['appends'].append(payload)
+        else:
+            changes['base'] = payload
+            changes['appends'] = []
+        # Oxirga ko'chirish - flush da fayllar o'zgarish tartibida yoziladi
+        self._deferred[filepath] = changes
+
+        now = time.monotonic()
+        self._dirty_since.setdefault(self._collection_of(filepath), now)
+        self._last_dirty = now
+
+    def _defer_snapshot(self, collection: str):
+        """
+        Kolleksiyani keyingi flush da keshdan to'liq qayta yozishga belgilash
+
+        Args:
+            collection: Kolleksiya fayli
+        """
+        if collection not in self._cache:
+            return
+
+        logger.warning(f"⚠️ Kolleksiya keyingi flush da qayta yoziladi: {collection}")
+        if collection == config.ORDERS_FILE:
+            # Har bir faol partitsiyani siqilgan holda qayta yozish
+            for month, month_orders in self._cache[collection].items():
+                self._defer(partitions.hot_path(month), partitions.dump_partition(month_orders))
+            self._partition_entries.clear()
+        else:
+            self._defer(collection, None)
+
+    @_transactional
+    def flush(self):
+        """
+        Kechiktirilgan barcha o'zgarishlarni diskka yozish
+
+        Write-through rejimida hech narsa qilmaydi. Bot to'xtaganda
+        chaqiriladi (main.on_shutdown).
+        """
+        if not self._deferred:
+            return
+
+        deferred, self._deferred = self._deferred, {}
+        self._dirty_since.clear()
+
+        for filepath, changes in deferred.items():
+            collection = self._collection_of(filepath)
+            if 'base' in changes:
+                base = changes['base']
+                if base is None:
+                    base = self._dump_json(self._cache[collection])
+                self._enqueue(filepath, base + b"".join(changes['appends']))
+            elif changes['appends']:
+                self._enqueue(filepath, b"".join(changes['appends']), append=True)
+
+        logger.debug(f"💾 Flush: {len(deferred)} ta fayl")
+
+    def _flush_due(self) -> bool:
+        """
+        Flush vaqti kelganmi: kolleksiya tinchlangan yoki eskirish chegarasiga yetgan
+        """
+        if not self._dirty_since:
+            return False
+
+        now = time.monotonic()
+        oldest = min(self._dirty_since.values())
+        return (now - self._last_dirty >= config.DB_FLUSH_INTERVAL_MS / 1000
+                or now - oldest >= config.DB_MAX_STALENESS_MS / 1000)
+
+    def _start_flusher(self):
+        """
+        Write-behind fon oqimini ishga tushirish
+        """
+        def run():
+            tick = min(config.DB_FLUSH_INTERVAL_MS, config.DB_MAX_STALENESS_MS) / 4000
+            while not self._flusher_stop.wait(tick):
+                with self._lock:
+                    due = self._flush_due()
+                if not due:
+                    continue
+                try:
+                    self.flush()
+                except Exception as e:
+                    logger.error(f"❌ Fon flush da xatolik: {e}")
+
+        self._flusher = threading.Thread(target=run, name="db-flusher", daemon=True)
+        self._flusher.start()
+        # Oddiy chiqishda ham yozilmagan o'zgarishlar yo'qolmasin
+        atexit.register(self.flush)
+        logger.info("✅ Write-behind rejimi yoqildi")
+
+    # ==================== ORDER PARTITIONS ====================
+
+    def _init_orders(self):
+        """
+        Buyurtmalar papkasini yaratish va eski orders.json ni partitsiyalarga ko'chirish
+
+        Manifest ko'chirish tugagandan keyin yoziladi, shuning uchun jarayon
+        o'rtada uzilsa, keyingi ishga tushishda ko'chirish qaytadan bajariladi.
+        """
+        os.makedirs(config.ORDERS_DIR, exist_ok=True)
+
+        if os.path.exists(config.ORDERS_MANIFEST_FILE):
+            return
+
+        if os.path.exists(config.ORDERS_FILE):
+            orders = [Order.from_dict(o) for o in self._read_json(config.ORDERS_FILE)]
+            by_id = {o.id: o for o in orders}
+            try:
+                partitions.read_entries(config.ORDERS_JOURNAL_FILE, orders, by_id)
+            except FileNotFoundError:
+                pass
+
+            by_month: Dict[str, List[Dict]] = {}
+            for order in orders:
+                by_month.setdefault(partitions.month_of(order), []).append(order)
+
+            for month, month_orders in by_month.items():
+                self._committer.write(partitions.hot_path(month), partitions.dump_partition(month_orders))
+            self._process_lock.mark_changed()
+
+            logger.info(f"✅ {len(orders)} ta buyurtma {len(by_month)} ta oylik partitsiyaga ko'chirildi")
+
+        self._init_file(config.ORDERS_MANIFEST_FILE, {'archived': {}})
+
+        # Eski fayllar zaxira sifatida qoldiriladi
+        for legacy in (config.ORDERS_FILE, config.ORDERS_JOURNAL_FILE):
+            if os.path.exists(legacy):
+                os.replace(legacy, legacy + ".migrated")
+
+    def _repair_partitions(self):
+        """
+        Uzilgan yozishlar qoldiqlarini tuzatish (faqat eksklyuziv qulf ostida)
+
+        O'qish yo'li fayllarni o'zgartirmaydi - u umumiy qulf ostida
+        ishlaydi va boshqa jarayon yozayotgan qatorni kesib yuborishi mumkin.
+        Shuning uchun tuzatishlar ishga tushishda shu yerda bajariladi:
+        arxivlangan oyning qolib ketgan .jsonl fayli o'chiriladi, faol
+        partitsiyalarning uzilgan oxirgi qatori kesiladi.
+        """
+        archived = self._read_json(config.ORDERS_MANIFEST_FILE)['archived']
+        hot_months, _ = partitions.scan()
+        repaired = False
+
+        for month in hot_months:
+            path = partitions.hot_path(month)
+            try:
+                if month in archived and os.path.exists(partitions.cold_path(month)):
+                    os.remove(path)
+                    logger.warning(f"⚠️ Arxivlangan partitsiyaning qoldig'i o'chirildi: {path}")
+                    repaired = True
+                elif partitions.repair_tail(path):
+                    repaired = True
+            except FileNotFoundError:
+                continue
+
+        if repaired:
+            self._process_lock.mark_changed()
+
+    def _orders_manifest(self) -> Dict:
+        """
+        Arxiv manifesti: {'archived': {oy: partitions.summarize() natijasi}}
+        """
+        return self._load(config.ORDERS_MANIFEST_FILE)
+
+    def _read_orders(self) -> Dict[str, List[Dict]]:
+        """
+        Faol partitsiyalarni yuklash
+
+        Returns:
+            Dict[str, List[Dict]]: oy -> buyurtmalar
+        """
+        archived = self._orders_manifest()['archived']
+        hot_months, _ = partitions.scan()
+        hot: Dict[str, List[Dict]] = {}
+        self._partition_entries = {}
+
+        for month in hot_months:
+            path = partitions.hot_path(month)
+            if month in archived:
+                # Arxivlash tugagan, lekin eski fayl o'chirilmay qolgan -
+                # uni _repair_partitions (eksklyuziv qulf ostida) o'chiradi
+                continue
+
+            try:
+                hot[month], self._partition_entries[month] = partitions.read_partition(path)
+            except FileNotFoundError:
+                continue
+
+        return hot
+
+    def _hot_orders(self) -> Dict[str, List[Dict]]:
+        """
+        Faol partitsiyalar (xotiradan, kerak bo'lsa fayldan yuklab)
+        """
+        return self._load(config.ORDERS_FILE)
+
+    def _cold_partition(self, month: str) -> Tuple[List[Dict], Dict[int, Dict]]:
+        """
+        Arxivlangan partitsiyani o'qish (oxirgi o'qilganlari xotirada qoladi)
+
+        Args:
+            month: "YYYY-MM"
+
+        Returns:
+            Tuple[List[Dict], Dict[int, Dict]]: (buyurtmalar, ID -> buyurtma)
+        """
+        path = partitions.cold_path(month)
+        stamp = self._file_stamp(path)
+        cached = self._cold_orders.get(month)
+
+        if cached is not None and (cached[0] == stamp or self._inflight_writes.get(config.ORDERS_FILE)
+                                   or config.ORDERS_FILE in self._dirty_since):
+            self._cold_orders.move_to_end(month)
+            return cached[1], cached[2]
+
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logger.error(f"❌ Faylga yozishda xatolik ({filepath}): {e}")
+            orders, _ = partitions.read_partition(path)
+        except FileNotFoundError:
+            orders = []
+        except (OSError, EOFError) as e:
+            logger.error(f"❌ Arxiv o'qilmadi ({path}): {e}")
+            raise DatabaseError(f"Arxiv o'qilmadi: {path}") from e
+
+        by_id = {o.get('id'): o for o in orders}
+        self._cold_orders[month] = (stamp, orders, by_id)
+        while len(self._cold_orders) > config.ORDERS_COLD_CACHE:
+            self._cold_orders.popitem(last=False)
+
+        logger.debug(f"📦 Arxiv partitsiya o'qildi: {month} ({len(orders)} ta)")
+        return orders, by_id
+
+    def _find_cold_order(self, order_id: int) -> Optional[Dict]:
+        """
+        Arxivdan buyurtmani topish - faqat ID oralig'i mos partitsiyalar o'qiladi
+
+        Args:
+            order_id: Buyurtma ID
+
+        Returns:
+            Optional[Dict]: Buyurtma yoki None
+        """
+        if not isinstance(order_id, int):
+            return None
+
+        for month, info in sorted(self._orders_manifest()['archived'].items(), reverse=True):
+            if info['min_id'] <= order_id <= info['max_id']:
+                order = self._cold_partition(month)[1].get(order_id)
+                if order is not None:
+                    return order
+        return None
+
+    def _append_order_entry(self, month: str, entry: Dict):
+        """
+        Faol partitsiyaga bitta yozuv qo'shish (butun faylni qayta yozmasdan)
+
+        Args:
+            month: Partitsiya oyi
+            entry: Jurnal yozuvi
+        """
+        line = serializers.dump_line(entry)
+
+        if month not in self._partition_entries:
+            # Yangi oy: fayl yaratiladi (atomik yozish papkani ham fsync qiladi)
+            self._partition_entries[month] = 0
+            self._submit(partitions.hot_path(month), line)
+        else:
+            self._submit(partitions.hot_path(month), line, append=True)
+
+        if entry.get('op') == 'status':
+            self._partition_entries[month] += 1
+            if sum(self._partition_entries.values()) >= config.ORDERS_COMPACT_EVERY:
+                self.compact_orders()
+
+    def _append_cold_status(self, month: str, order: Dict):
+        """
+        Arxivlangan buyurtma statusini yozish: arxiv oxiriga gzip a'zosi
+        qo'shiladi va manifestdagi status hisoblari yangilanadi
+
+        Args:
+            month: Partitsiya oyi
+            order: Status o'zgartirilgan buyurtma (status allaqachon yangi)
+        """
+        line = serializers.dump_line({'op': 'status', 'id': order['id'], 'status': order['status']})
+        self._submit(partitions.cold_path(month), partitions.gzip_member(line), append=True)
+
+        manifest = self._orders_manifest()
+        manifest['archived'][month] = partitions.summarize(self._cold_partition(month)[0])
+        self._write_json(config.ORDERS_MANIFEST_FILE, manifest)
+
+    @_transactional
+    def compact_orders(self):
+        """
+        Faol partitsiyalarni siqish: status yozuvlari bor fayllar faqat
+        insert qatorlari bilan qayta yoziladi
+
+        Siqish atomik yozish orqali bajariladi - qayta o'ynash idempotent.
+        """
+        hot = self._hot_orders()
+        months = [m for m, n in self._partition_entries.items() if n and m in hot]
+
+        if not months:
+            return
+
+        entries = sum(self._partition_entries[m] for m in months)
+        for month in months:
+            self._submit(partitions.hot_path(month), partitions.dump_partition(hot[month]))
+            self._partition_entries[month] = 0
+
+        logger.info(f"✅ Buyurtmalar siqildi: {len(months)} ta partitsiya, {entries} ta yozuv")
+
+    def archive_orders(self) -> List[str]:
+        """
+        config.ORDERS_HOT_MONTHS dan eski partitsiyalarni gzip arxivga o'tkazish
+
+        Tartib: arxiv -> manifest -> eski faylni o'chirish. Jarayon
+        istalgan joyda uzilsa ham buyurtmalar yo'qolmaydi: manifestda
+        bo'lgan oyning qolib ketgan .jsonl fayli ishga tushishda o'chiriladi.
+
+        Returns:
+            List[str]: Arxivlangan oylar
+        """
+        oldest_hot = partitions.shift_month(
+            datetime.now().strftime('%Y-%m'), -(config.ORDERS_HOT_MONTHS - 1)
+        )
+
+        with self._transaction():
+            hot = self._hot_orders()
+            months = sorted(m for m in hot if m < oldest_hot)
+            if not months:
+                return []
+
+            manifest = self._orders_manifest()
+            for month in months:
+                month_orders = hot.pop(month)
+                self._submit(
+                    partitions.cold_path(month),
+                    partitions.gzip_member(partitions.dump_partition(month_orders))
+                )
+                manifest['archived'][month] = partitions.summarize(month_orders)
+                self._partition_entries.pop(month, None)
+                self._cold_orders.pop(month, None)
+
+            self._write_json(config.ORDERS_MANIFEST_FILE, manifest)
+            self._reindex(config.ORDERS_FILE, hot)
+
+        # Write-behind rejimida arxiv diskka tushmaguncha eski fayl o'chirilmaydi
+        self.flush()
+
+        with self._transaction():
+            self._process_lock.mark_changed()
+            archived = self._orders_manifest()['archived']
+            for month in months:
+                path = partitions.hot_path(month)
+                if month in archived and os.path.exists(partitions.cold_path(month)) \
+                        and os.path.exists(path):
+                    os.remove(path)
+
+        logger.info(f"✅ Buyurtmalar arxivlandi: {', '.join(months)}")
+        return months
 
     # ==================== CATEGORIES ====================
 
+    def _tombstones(self) -> Dict[str, Dict[str, int]]:
+        """
+        O'chirilgan yozuvlar: {'products': {ID: vaqt}, 'categories': {ID: vaqt}}
+        (ID - matn, vaqt - epoch)
+        """
+        tombstones = self._load(config.TOMBSTONES_FILE)
+        if not isinstance(tombstones, dict):
+            # Fayl yo'qolgan - bo'sh ro'yxatdan davom etiladi
+            tombstones = {'products': {}, 'categories': {}}
+            self._set_cache(config.TOMBSTONES_FILE, tombstones,
+                            self._cache_stamps.get(config.TOMBSTONES_FILE))
+        return tombstones
+
+    def _categories(self) -> List[Category]:
+        """
+        Kategoriyalar (xotiradan, kerak bo'lsa fayldan yuklab)
+
+        Ro'yxatda o'chirilgan kategoriyalar ham bor - ochiq metodlar
+        self._categories_by_id (faqat mavjudlari) dan foydalanadi.
+        """
+        self._tombstones()
+        return self._load(config.CATEGORIES_FILE)
+
+    def _bury(self, collection: str, ids: List[int]):
+        """
+        Yozuvlarni o'chirilgan deb belgilash - faqat tombstones.json yoziladi
+
+        Args:
+            collection: 'products' yoki 'categories'
+            ids: Yozuvlar ID'lari
+        """
+        tombstones = self._tombstones()
+        deleted = self._deleted_product_ids if collection == 'products' else self._deleted_category_ids
+        now = int(time.time())
+
+        for record_id in ids:
+            tombstones.setdefault(collection, {})[str(record_id)] = now
+            deleted.add(record_id)
+
+        self._write_json(config.TOMBSTONES_FILE, tombstones)
+
+    @_synchronized
     def get_categories(self) -> List[str]:
         """
         Barcha kategoriyalarni olish
 
         Returns:
-            List[str]: Kategoriyalar ro'yxati
+            List[str]: Kategoriyalar nomlari (qo'shilgan tartibda)
         """
-        return self._read_json(config.CATEGORIES_FILE)
+        self._categories()
+        return [category.name for category in self._categories_by_id.values()]
 
+    def _category_id(self, name: str) -> Optional[int]:
+        """
+        Kategoriya nomidan ID (tranzaksiya ichida)
+
+        Ro'yxatda yo'q kategoriya yaratiladi - tovar ko'rinmas kategoriyada
+        qolib ketmasin (masalan, kategoriya o'chirilayotganda tovar qo'shilsa).
+
+        Args:
+            name: Kategoriya nomi
+
+        Returns:
+            Optional[int]: Kategoriya ID (name None bo'lsa None)
+        """
+        if name is None:
+            return None
+
+        self._categories()
+        category = self._categories_by_name.get(name)
+        if category is None:
+            logger.warning(f"⚠️ Kategoriya topilmadi, yaratiladi: {name}")
+            self.add_category(name)
+            category = self._categories_by_name[name]
+        return category.id
+
+    @_transactional
     def add_category(self, category: str) -> bool:
         """
         Yangi kategoriya qo'shish
@@ -112,50 +1292,74 @@ class JSONDatabase:
         Returns:
             bool: Muvaffaqiyatli bo'lsa True
         """
-        categories = self.get_categories()
+        categories = self._categories()
 
         # Dublikatni tekshirish
-        if category in categories:
+        if category in self._categories_by_name:
             logger.warning(f"⚠️ Kategoriya allaqachon mavjud: {category}")
             return False
 
-        categories.append(category)
+        # O'chirilgan, hali siqilmagan kategoriyalar ID si ham band
+        record = Category.from_dict({
+            'id': self._next_id('categories', self._categories_by_id,
+                                floor=max(self._deleted_category_ids, default=0)),
+            'name': category
+        })
+        categories.append(record)
+        self._categories_by_id[record.id] = record
+        self._categories_by_name[record.name] = record
         self._write_json(config.CATEGORIES_FILE, categories)
         logger.info(f"✅ Kategoriya qo'shildi: {category}")
         return True
 
+    @_transactional
     def delete_category(self, category: str) -> bool:
         """
         Kategoriyani o'chirish (va unga tegishli barcha tovarlarni)
 
+        Kategoriya va uning tovarlari (kategoriya indeksi orqali topiladi)
+        o'chirilgan deb belgilanadi - faqat tombstones.json yoziladi.
+        Fayllardan compact_catalog() olib tashlaydi.
+
         Args:
             category: Kategoriya nomi
 
         Returns:
             bool: Muvaffaqiyatli bo'lsa True
         """
-        categories = self.get_categories()
+        self._products()
+        record = self._categories_by_name.pop(category, None)
 
-        if category not in categories:
+        if record is None:
             logger.warning(f"⚠️ Kategoriya topilmadi: {category}")
             return False
 
-        # Kategoriyani o'chirish
-        categories.remove(category)
-        self._write_json(config.CATEGORIES_FILE, categories)
+        del self._categories_by_id[record.id]
 
-        # Bu kategoriyaga tegishli tovarlarni ham o'chirish
-        products = self.get_all_products()
-        products = [p for p in products if p['category'] != category]
-        self._write_json(config.PRODUCTS_FILE, products)
+        # Bu kategoriyaga tegishli tovarlarni ham o'chirish (indeks orqali)
+        buckets = self._products_by_category.pop(record.id, None) or {True: [], False: []}
+        product_ids = buckets[True] + buckets[False]
+        for is_available, ids in buckets.items():
+            self._product_counts[is_available] -= len(ids)
+        for product_id in product_ids:
+            self._deleted_products[product_id] = self._products_by_id.pop(product_id)
 
-        logger.info(f"✅ Kategoriya o'chirildi: {category}")
+        self._deleted_category_ids.add(record.id)
+        self._bury('products', product_ids)
+        self._bury('categories', [record.id])
+
+        logger.info(f"✅ Kategoriya o'chirildi: {category} ({len(product_ids)} ta tovar bilan)")
         return True
 
+    @_transactional
     def update_category(self, old_name: str, new_name: str) -> bool:
         """
         Kategoriya nomini o'zgartirish
 
+        Faqat kategoriya yozuvi o'zgaradi: tovarlar unga ID orqali
+        bog'langan va yangi nomni darhol ko'radi, products.json qayta
+        yozilmaydi.
+
         Args:
             old_name: Eski nom
             new_name: Yangi nom
@@ -163,29 +1367,63 @@ class JSONDatabase:
         Returns:
             bool: Muvaffaqiyatli bo'lsa True
         """
-        categories = self.get_categories()
+        categories = self._categories()
+        record = self._categories_by_name.get(old_name)
 
-        if old_name not in categories:
+        if record is None:
             logger.warning(f"⚠️ Kategoriya topilmadi: {old_name}")
             return False
 
-        # Kategoriya nomini o'zgartirish
-        idx = categories.index(old_name)
-        categories[idx] = new_name
-        self._write_json(config.CATEGORIES_FILE, categories)
+        if new_name != old_name and new_name in self._categories_by_name:
+            logger.warning(f"⚠️ Kategoriya allaqachon mavjud: {new_name}")
+            return False
 
-        # Tovarlarni ham yangilash
-        products = self.get_all_products()
-        for product in products:
-            if product['category'] == old_name:
-                product['category'] = new_name
-        self._write_json(config.PRODUCTS_FILE, products)
+        del self._categories_by_name[old_name]
+        record['name'] = new_name
+        self._categories_by_name[record.name] = record
+        self._write_json(config.CATEGORIES_FILE, categories)
 
         logger.info(f"✅ Kategoriya o'zgartirildi: {old_name} -> {new_name}")
         return True
 
     # ==================== PRODUCTS ====================
 
+    def _products(self) -> List[Product]:
+        """
+        Tovarlar (xotiradan, kerak bo'lsa fayldan yuklab)
+
+        Kategoriyalar ham tekshiriladi: boshqa jarayon kategoriya nomini
+        o'zgartirgan bo'lsa, tovarlar yangi nomni ko'rsatadi. Ro'yxatda
+        o'chirilgan tovarlar ham bor - ochiq metodlar self._products_by_id
+        (faqat mavjudlari) dan foydalanadi.
+        """
+        self._categories()
+        return self._load(config.PRODUCTS_FILE)
+
+    def _find_product(self, product_id: int, include_deleted: bool = False) -> Optional[Product]:
+        """
+        Tovarni ID bo'yicha topish
+
+        Args:
+            product_id: Tovar ID
+            include_deleted: O'chirilgan tovarlarni ham qidirish (avval
+                siqilmaganlar, keyin arxiv)
+
+        Returns:
+            Optional[Product]: Tovar yoki None
+        """
+        self._products()
+        product = self._products_by_id.get(product_id)
+
+        if product is None and include_deleted:
+            product = self._deleted_products.get(product_id)
+            if product is None:
+                self._load(config.DELETED_PRODUCTS_FILE)
+                product = self._archived_products.get(product_id)
+
+        return product
+
+    @_transactional
     def add_product(self, category: str, name: str, description: str,
                     price: float, size: str = None, photo_id: str = None) -> Dict:
         """
@@ -202,14 +1440,19 @@ class JSONDatabase:
         Returns:
             Dict: Yaratilgan tovar
         """
-        products = self._read_json(config.PRODUCTS_FILE)
+        products = self._products()
+        category_id = self._category_id(category)
 
-        # Yangi ID yaratish
-        new_id = max([p.get('id', 0) for p in products], default=0) + 1
+        # Yangi ID yaratish (o'chirilgan va arxivlangan tovarlar ID si ham band)
+        self._load(config.DELETED_PRODUCTS_FILE)
+        new_id = self._next_id('products', self._products_by_id, floor=max(
+            max(self._deleted_products, default=0),
+            max(self._archived_products, default=0)
+        ))
 
-        product = {
+        product = Product.from_dict({
             'id': new_id,
-            'category': category,
+            'category_id': category_id,
             'name': name,
             'description': description,
             'price': float(price),
@@ -217,30 +1460,33 @@ class JSONDatabase:
             'photo_id': photo_id,
             'is_available': True,
             'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        }
+        })
 
+        product.bind_category(self._categories_by_id.get(category_id))
         products.append(product)
+        self._products_by_id[new_id] = product
+        self._index_product(product)
         self._write_json(config.PRODUCTS_FILE, products)
 
         logger.info(f"✅ Tovar qo'shildi: {name} (ID: {new_id})")
         return product
 
-    def get_product(self, product_id: int) -> Optional[Dict]:
+    @_synchronized
+    def get_product(self, product_id: int, include_deleted: bool = False) -> Optional[Dict]:
         """
         Tovarni ID bo'yicha olish
 
         Args:
             product_id: Tovar ID
+            include_deleted: O'chirilgan tovarni ham qaytarish (buyurtmalar
+                tarixi uchun)
 
         Returns:
             Optional[Dict]: Tovar yoki None
         """
-        products = self._read_json(config.PRODUCTS_FILE)
-        for product in products:
-            if product.get('id') == product_id:
-                return product
-        return None
+        return self._find_product(product_id, include_deleted)
 
+    @_synchronized
     def get_products_by_category(self, category: str) -> List[Dict]:
         """
         Kategoriya bo'yicha mavjud tovarlarni olish
@@ -251,12 +1497,16 @@ class JSONDatabase:
         Returns:
             List[Dict]: Tovarlar ro'yxati
         """
-        products = self._read_json(config.PRODUCTS_FILE)
-        return [
-            p for p in products
-            if p.get('category') == category and p.get('is_available', True)
-        ]
+        self._products()
+        record = self._categories_by_name.get(category)
+        buckets = self._products_by_category.get(record.id) if record is not None else None
+
+        if buckets is None:
+            return []
 
+        return [self._products_by_id[product_id] for product_id in buckets[True]]
+
+    @_synchronized
     def get_all_products(self) -> List[Dict]:
         """
         Barcha tovarlarni olish (mavjud va mavjud bo'lmaganlarni)
@@ -264,8 +1514,26 @@ class JSONDatabase:
         Returns:
             List[Dict]: Tovarlar ro'yxati
         """
-        return self._read_json(config.PRODUCTS_FILE)
+        self._products()
+        return list(self._products_by_id.values())
+
+    @_synchronized
+    def get_deleted_products(self) -> List[Dict]:
+        """
+        O'chirilgan tovarlar - hali siqilmaganlar ham, arxivdagilar ham
+        (eksport/migratsiya uchun; buyurtmalar tarixi ular bilan bog'liq)
 
+        Returns:
+            List[Dict]: Tovarlar ('deleted_at' bilan, ID bo'yicha)
+        """
+        self._products()
+        self._load(config.DELETED_PRODUCTS_FILE)
+        products = dict(self._archived_products)
+        for product_id, product in self._deleted_products.items():
+            products.setdefault(product_id, self._archive_entry(product))
+        return [products[product_id] for product_id in sorted(products)]
+
+    @_synchronized
     def get_available_products(self) -> List[Dict]:
         """
         Faqat mavjud tovarlarni olish
@@ -273,9 +1541,10 @@ class JSONDatabase:
         Returns:
             List[Dict]: Mavjud tovarlar ro'yxati
         """
-        products = self._read_json(config.PRODUCTS_FILE)
-        return [p for p in products if p.get('is_available', True)]
+        self._products()
+        return [p for p in self._products_by_id.values() if p.is_available]
 
+    @_synchronized
     def get_random_products(self, count: int = 3) -> List[Dict]:
         """
         Random tovarlarni olish (avtomatik post uchun)
@@ -297,52 +1566,64 @@ class JSONDatabase:
 
         return random.sample(products, count)
 
+    @_transactional
     def update_product(self, product_id: int, **kwargs) -> bool:
         """
         Tovarni yangilash
 
         Args:
             product_id: Tovar ID
-            **kwargs: Yangilanadigan maydonlar
+            **kwargs: Yangilanadigan maydonlar (category - kategoriya nomi)
 
         Returns:
             bool: Muvaffaqiyatli bo'lsa True
         """
-        products = self._read_json(config.PRODUCTS_FILE)
+        products = self._products()
+        product = self._products_by_id.get(product_id)
+
+        if product is None:
+            logger.warning(f"⚠️ Tovar topilmadi: ID {product_id}")
+            return False
 
-        for product in products:
-            if product.get('id') == product_id:
-                product.update(kwargs)
-                self._write_json(config.PRODUCTS_FILE, products)
-                logger.info(f"✅ Tovar yangilandi: ID {product_id}")
-                return True
+        if 'category' in kwargs:
+            kwargs['category_id'] = self._category_id(kwargs.pop('category'))
 
-        logger.warning(f"⚠️ Tovar topilmadi: ID {product_id}")
-        return False
+        self._unindex_product(product)
+        product.update(kwargs)
+        product.bind_category(self._categories_by_id.get(product.category_id))
+        self._index_product(product)
+        self._write_json(config.PRODUCTS_FILE, products)
+        logger.info(f"✅ Tovar yangilandi: ID {product_id}")
+        return True
 
+    @_transactional
     def delete_product(self, product_id: int) -> bool:
         """
         Tovarni o'chirish
 
+        Tovar o'chirilgan deb belgilanadi (faqat tombstones.json yoziladi),
+        products.json dan compact_catalog() olib tashlaydi.
+
         Args:
             product_id: Tovar ID
 
         Returns:
             bool: Muvaffaqiyatli bo'lsa True
         """
-        products = self._read_json(config.PRODUCTS_FILE)
-        original_length = len(products)
-
-        products = [p for p in products if p.get('id') != product_id]
+        self._products()
+        product = self._products_by_id.pop(product_id, None)
 
-        if len(products) < original_length:
-            self._write_json(config.PRODUCTS_FILE, products)
-            logger.info(f"✅ Tovar o'chirildi: ID {product_id}")
-            return True
+        if product is None:
+            logger.warning(f"⚠️ Tovar topilmadi: ID {product_id}")
+            return False
 
-        logger.warning(f"⚠️ Tovar topilmadi: ID {product_id}")
-        return False
+        self._unindex_product(product)
+        self._deleted_products[product_id] = product
+        self._bury('products', [product_id])
+        logger.info(f"✅ Tovar o'chirildi: ID {product_id}")
+        return True
 
+    @_transactional
     def toggle_product_availability(self, product_id: int) -> bool:
         """
         Tovar mavjudligini o'zgartirish
@@ -353,24 +1634,146 @@ class JSONDatabase:
         Returns:
             bool: Muvaffaqiyatli bo'lsa True
         """
-        products = self._read_json(config.PRODUCTS_FILE)
+        products = self._products()
+        product = self._products_by_id.get(product_id)
+
+        if product is None:
+            logger.warning(f"⚠️ Tovar topilmadi: ID {product_id}")
+            return False
+
+        self._unindex_product(product)
+        product['is_available'] = not product.get('is_available', True)
+        self._index_product(product)
+        self._write_json(config.PRODUCTS_FILE, products)
+        status = "Mavjud" if product['is_available'] else "Mavjud emas"
+        logger.info(f"✅ Tovar mavjudligi o'zgartirildi: ID {product_id} -> {status}")
+        return True
+
+    def _archive_entry(self, product: Product) -> Product:
+        """
+        O'chirilgan tovarning arxiv yozuvi: kategoriya nomi va o'chirilgan
+        vaqti bilan (kategoriya ham o'chirilsa ham nomi saqlanib qoladi)
+        """
+        deleted_at = self._tombstones().get('products', {}).get(str(product.id))
+        entry = Product.from_dict(product.to_dict())
+        entry['category'] = product['category']
+        entry['deleted_at'] = format_epoch(deleted_at)
+        return entry
+
+    @_transactional
+    def compact_catalog(self) -> int:
+        """
+        O'chirilgan tovar va kategoriyalarni fayllardan olib tashlash
+
+        Tovarlar products.deleted.json arxiviga (kategoriya nomi va
+        o'chirilgan vaqti bilan) ko'chiriladi - eski buyurtmalar tarixida
+        ko'rinishda davom etadi. Scheduler kuniga bir marta chaqiradi.
+
+        Tartib: arxiv -> tovarlar -> kategoriyalar -> tombstones.json.
+        Jarayon uzilsa, keyingi siqish qolgan ishni tugatadi.
+
+        Returns:
+            int: Arxivga ko'chirilgan tovarlar soni
+        """
+        products = self._products()
+        categories = self._categories()
+        tombstones = self._tombstones()
+
+        if not tombstones.get('products') and not tombstones.get('categories'):
+            return 0
+
+        archive = self._load(config.DELETED_PRODUCTS_FILE)
+        if not isinstance(archive, list):
+            archive = []
+
+        moved = 0
+        for product in self._deleted_products.values():
+            if product.id in self._archived_products:
+                continue
+            entry = self._archive_entry(product)
+            archive.append(entry)
+            self._archived_products[entry.id] = entry
+            moved += 1
+
+        # Olib tashlanadigan ID'lar hisoblagichdan past qolsin - qayta berilmaydi
+        sequences = self._load(config.SEQUENCES_FILE)
+        for sequence, removed in (('products', self._deleted_products),
+                                  ('categories', self._deleted_category_ids)):
+            sequences[sequence] = max(sequences.get(sequence, 0), max(removed, default=0))
+        self._write_json(config.SEQUENCES_FILE, sequences)
+
+        self._write_json(config.DELETED_PRODUCTS_FILE, archive)
+        self._write_json(config.PRODUCTS_FILE, list(self._products_by_id.values()))
+        self._write_json(
+            config.CATEGORIES_FILE,
+            [c for c in categories if c.id not in self._deleted_category_ids]
+        )
+        self._write_json(config.TOMBSTONES_FILE, {'products': {}, 'categories': {}})
+
+        logger.info(
+            f"✅ Katalog siqildi: {moved} ta tovar arxivga ko'chirildi "
+            f"({len(products) - len(self._products_by_id)} ta yozuv olib tashlandi)"
+        )
+        return moved
+
+    # ==================== CATALOG ====================
+
+    def current_catalog(self) -> Optional[CatalogSnapshot]:
+        """
+        Tayyor katalog snapshoti - qulfsiz, fayllarga murojaat qilmasdan
+
+        Snapshot oxirgi config.DB_RECHECK_INTERVAL_MS ichida tekshirilgan
+        bo'lsa qaytariladi. Shu jarayondagi o'zgarish snapshotni darhol
+        bekor qiladi; boshqa jarayonning o'zgarishi esa shu oraliqdan
+        kechiktirmay ko'rinadi.
+
+        Returns:
+            Optional[CatalogSnapshot]: Snapshot yoki None (catalog() kerak)
+        """
+        snapshot = self._catalog
+        if snapshot is not None and \
+                time.monotonic() - self._catalog_checked < config.DB_RECHECK_INTERVAL_MS / 1000:
+            return snapshot
+        return None
+
+    def catalog(self) -> CatalogSnapshot:
+        """
+        Katalogning o'zgarmas snapshoti (foydalanuvchi katalogi uchun)
 
-        for product in products:
-            if product.get('id') == product_id:
-                product['is_available'] = not product.get('is_available', True)
-                self._write_json(config.PRODUCTS_FILE, products)
-                status = "Mavjud" if product['is_available'] else "Mavjud emas"
-                logger.info(f"✅ Tovar mavjudligi o'zgartirildi: ID {product_id} -> {status}")
-                return True
+        Odatda qulfsiz qaytadi (current_catalog). Snapshot bekor qilingan
+        yoki tekshirish vaqti kelgan bo'lsa, fayllar qulf ostida tekshirilib,
+        kerak bo'lsa yangi snapshot quriladi.
 
-        logger.warning(f"⚠️ Tovar topilmadi: ID {product_id}")
-        return False
+        Returns:
+            CatalogSnapshot: Snapshot
+        """
+        return self.current_catalog() or self._refresh_catalog()
+
+    @_synchronized
+    def _refresh_catalog(self) -> CatalogSnapshot:
+        now = time.monotonic()
+        # Boshqa jarayon o'zgartirgan fayllar qayta o'qiladi va snapshotni bekor qiladi
+        self._products()
+
+        snapshot = self._catalog
+        if snapshot is None:
+            self._catalog_version += 1
+            snapshot = CatalogSnapshot(
+                self._catalog_version,
+                (category.name for category in self._categories_by_id.values()),
+                self._products_by_id.values()
+            )
+            self._catalog = snapshot
+
+        self._catalog_checked = now
+        return snapshot
 
     # ==================== ORDERS ====================
 
+    @_transactional
     def create_order(self, user_id: int, username: str, product_id: int,
                      customer_name: str, phone: str, address: str,
-                     quantity: int = 1) -> Dict:
+                     quantity: int = 1, price: float = None, source: str = None) -> Dict:
         """
         Yangi buyurtma yaratish
 
@@ -382,19 +1785,29 @@ class JSONDatabase:
             phone: Telefon
             address: Manzil
             quantity: Miqdor
+            price: Bitta tovar narxi (default: tovarning joriy narxi)
+            source: Buyurtma manbai ('post' - kanal postidagi deep link)
 
         Returns:
             Dict: Yaratilgan buyurtma
         """
-        orders = self._read_json(config.ORDERS_FILE)
+        hot = self._hot_orders()
+        self._products()
+        product = self._products_by_id.get(product_id)
+
+        if price is None and product is not None:
+            price = product.price
 
         # Yangi ID yaratish
-        new_id = max([o.get('id', 0) for o in orders], default=0) + 1
+        archived_max = max(
+            (info['max_id'] for info in self._orders_manifest()['archived'].values()), default=0
+        )
+        new_id = self._next_id('orders', self._orders_by_id, floor=archived_max)
 
         # Buyurtma raqamini generatsiya qilish
         order_number = f"ORD-{datetime.now().strftime('%Y%m%d%H%M%S')}-{user_id}"
 
-        order = {
+        order = Order.from_dict({
             'id': new_id,
             'order_number': order_number,
             'user_id': user_id,
@@ -404,16 +1817,38 @@ class JSONDatabase:
             'phone': phone,
             'address': address,
             'quantity': quantity,
+            'price': price,
             'status': 'yangi',
+            'source': source,
             'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        }
-
-        orders.append(order)
-        self._write_json(config.ORDERS_FILE, orders)
+        })
+
+        month = partitions.month_of(order)
+        month_orders = hot.setdefault(month, [])
+        month_orders.append(order)
+        if len(month_orders) > 1 and \
+                self._order_sort_key(month_orders[-2]) > self._order_sort_key(order):
+            # Soat orqaga surilgan - ro'yxat vaqt tartibida qolishi kerak
+            month_orders.sort(key=self._order_sort_key)
+        self._orders_by_id[new_id] = order
+        # Yangi buyurtma - foydalanuvchi tarixining boshiga (vaqti keyinroq
+        # buyurtmalar bo'lsa - ulardan keyin, tarix vaqt tartibida qolsin)
+        user_orders = self._orders_by_user.setdefault(user_id, [])
+        key = self._order_sort_key(order)
+        position = 0
+        while position < len(user_orders) and \
+                self._order_sort_key(self._orders_by_id[user_orders[position]]) > key:
+            position += 1
+        user_orders.insert(position, new_id)
+        self._count_status(order.status, 1)
+        self._index_order_status(order)
+        self._append_order_entry(month, {'op': 'insert', 'order': order})
+        self._update_sales(order, product, 1)
 
         logger.info(f"✅ Buyurtma yaratildi: {order_number}")
         return order
 
+    @_synchronized
     def get_order(self, order_id: int) -> Optional[Dict]:
         """
         Buyurtmani ID bo'yicha olish
@@ -424,48 +1859,446 @@ class JSONDatabase:
         Returns:
             Optional[Dict]: Buyurtma yoki None
         """
-        orders = self._read_json(config.ORDERS_FILE)
-        for order in orders:
-            if order.get('id') == order_id:
-                return order
-        return None
+        self._hot_orders()
+        order = self._orders_by_id.get(order_id)
+        if order is None:
+            order = self._find_cold_order(order_id)
+        return order
 
+    @_synchronized
     def get_user_orders(self, user_id: int) -> List[Dict]:
         """
         Foydalanuvchi buyurtmalarini olish
 
+        Arxivdan faqat manifestga ko'ra shu foydalanuvchi buyurtmasi bor
+        partitsiyalar o'qiladi.
+
         Args:
             user_id: Telegram user ID
 
         Returns:
-            List[Dict]: Buyurtmalar ro'yxati
+            List[Dict]: Buyurtmalar ro'yxati (eng yangisi birinchi)
         """
-        orders = self._read_json(config.ORDERS_FILE)
-        user_orders = [o for o in orders if o.get('user_id') == user_id]
+        self._hot_orders()
 
-        # Sana bo'yicha saralash (eng yangi birinchi)
-        return sorted(
-            user_orders,
-            key=lambda x: x.get('created_at', ''),
-            reverse=True
-        )
+        # Indeks allaqachon sana bo'yicha saralangan (eng yangi birinchi)
+        orders = [
+            self._orders_by_id[order_id]
+            for order_id in self._orders_by_user.get(user_id, [])
+        ]
+
+        for month, info in sorted(self._orders_manifest()['archived'].items(), reverse=True):
+            users = info['users']
+            idx = bisect_left(users, user_id)
+            if idx < len(users) and users[idx] == user_id:
+                # Partitsiya vaqt tartibida - teskari o'qish yetarli
+                orders.extend(
+                    o for o in reversed(self._cold_partition(month)[0]) if o.user_id == user_id
+                )
 
+        return orders
+
+    @_synchronized
+    def count_user_orders(self, user_id: int) -> int:
+        """
+        Foydalanuvchi buyurtmalari soni
+
+        Faol oylar foydalanuvchi indeksidan, arxiv oylari manifestdagi
+        hisoblagichlardan olinadi - buyurtmalar o'qilmaydi. Hisoblagichlari
+        yo'q eski manifest yozuvi uchungina partitsiya o'qiladi.
+
+        Args:
+            user_id: Telegram user ID
+
+        Returns:
+            int: Buyurtmalar soni
+        """
+        self._hot_orders()
+        count = len(self._orders_by_user.get(user_id, []))
+
+        for month, info in self._orders_manifest()['archived'].items():
+            users = info['users']
+            idx = bisect_left(users, user_id)
+            if idx == len(users) or users[idx] != user_id:
+                continue
+            if 'user_counts' in info:
+                count += info['user_counts'][idx]
+            else:
+                count += sum(1 for o in self._cold_partition(month)[0] if o.user_id == user_id)
+
+        return count
+
+    @_synchronized
     def get_all_orders(self) -> List[Dict]:
         """
-        Barcha buyurtmalarni olish
+        Barcha buyurtmalarni olish (arxiv ham o'qiladi - sekin, faqat
+        eksport/migratsiya uchun; ro'yxatlar uchun get_orders() ni ishlating)
 
         Returns:
-            List[Dict]: Buyurtmalar ro'yxati
+            List[Dict]: Buyurtmalar ro'yxati (eng yangisi birinchi)
         """
-        orders = self._read_json(config.ORDERS_FILE)
+        return self.get_orders()
 
-        # Sana bo'yicha saralash
-        return sorted(
-            orders,
-            key=lambda x: x.get('created_at', ''),
-            reverse=True
-        )
+    @_synchronized
+    def get_orders(self, since: str = None, until: str = None,
+                   limit: int = None) -> List[Dict]:
+        """
+        Vaqt oralig'idagi buyurtmalar - faqat oralig'iga tushgan partitsiyalar o'qiladi
+
+        Faol oylar vaqt indeksidan binary search bilan olinadi. Arxiv
+        partitsiyalari (faol oylardan eskiroq) eng yangisidan boshlab
+        ko'riladi va limit to'lishi bilan to'xtatiladi, shuning uchun
+        "oxirgi 20 ta" so'rovi tarix qancha uzun bo'lishidan qat'i nazar
+        arxivni o'qimaydi.
+
+        Args:
+            since: Boshlanish vaqti 'YYYY-MM-DD HH:MM:SS' (shu jumladan)
+            until: Tugash vaqti 'YYYY-MM-DD HH:MM:SS' (shu jumladan)
+            limit: Maksimal soni
+
+        Returns:
+            List[Dict]: Buyurtmalar ro'yxati (eng yangisi birinchi)
+        """
+        self._hot_orders()
+        archived = self._orders_manifest()['archived']
+        first = since[:7] if since else None
+        last = until[:7] if until else None
+        since_ts = to_epoch(since) if since else None
+        until_ts = to_epoch(until) if until else None
+
+        lo, hi = self._time_range(self._order_keys, since, until)
+        if limit is not None:
+            lo = max(lo, hi - limit)
+        result: List[Dict] = [
+            self._orders_by_id[order_id] for _, order_id in reversed(self._order_keys[lo:hi])
+        ]
+
+        for month in sorted(archived, reverse=True):
+            if limit is not None and len(result) >= limit:
+                break
+            if (first and month < first) or (last and month > last):
+                continue
+
+            # Partitsiya vaqt tartibida - teskari o'qish yetarli
+            result.extend(
+                o for o in reversed(self._cold_partition(month)[0])
+                if (since_ts is None or (o.created_ts or 0) >= since_ts)
+                and (until_ts is None or (o.created_ts or 0) <= until_ts)
+            )
+
+        return result if limit is None else result[:limit]
+
+    @_synchronized
+    def count_orders(self, since: str = None, until: str = None) -> int:
+        """
+        Vaqt oralig'idagi buyurtmalar soni (masalan, bugungi buyurtmalar)
+
+        Faol oylar uchun vaqt indeksida binary search; oralig'iga to'liq
+        tushgan arxiv oylari manifestdan, faqat chegaradagilari o'qiladi.
+
+        Args:
+            since: Boshlanish vaqti 'YYYY-MM-DD HH:MM:SS' (shu jumladan)
+            until: Tugash vaqti 'YYYY-MM-DD HH:MM:SS' (shu jumladan)
+
+        Returns:
+            int: Buyurtmalar soni
+        """
+        self._hot_orders()
+        lo, hi = self._time_range(self._order_keys, since, until)
+        count = hi - lo
+
+        first = since[:7] if since else None
+        last = until[:7] if until else None
+        for month, info in self._orders_manifest()['archived'].items():
+            if (first and month < first) or (last and month > last):
+                continue
+            if month in (first, last) or month == partitions.UNDATED:
+                keys = [self._order_sort_key(o) for o in self._cold_partition(month)[0]]
+                lo, hi = self._time_range(keys, since, until)
+                count += hi - lo
+            else:
+                count += info['count']
+
+        return count
+
+    @staticmethod
+    def _encode_cursor(direction: str, key: Tuple[int, int]) -> str:
+        """
+        Sahifa kursori: 'n' - shu kalitdan eskilari, 'p' - yangilari
+        (Telegram callback_data ga sig'adigan qisqa satr)
+        """
+        return f"{direction}{key[0]}_{key[1]}"
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[str, Tuple[int, int]]:
+        """
+        Raises:
+            ValueError: Kursor noto'g'ri bo'lsa
+        """
+        try:
+            direction, (created_ts, order_id) = cursor[0], cursor[1:].split('_')
+            if direction not in 'np':
+                raise ValueError(direction)
+            return direction, (int(created_ts), int(order_id))
+        except (IndexError, ValueError) as e:
+            raise ValueError(f"Noto'g'ri kursor: {cursor!r}") from e
+
+    def _order_key_sources(self, status: Optional[str], user_id: Optional[int],
+                           first_month: Optional[str], last_month: Optional[str],
+                           newest_first: bool) -> Iterator[Tuple[List[Tuple[int, int]], Dict[int, Dict]]]:
+        """
+        query_orders uchun manbalar: (o'sish tartibidagi kalitlar, ID -> buyurtma)
+
+        Avval faol oylar (bitta indeks), keyin arxiv oylari birma-bir;
+        newest_first=False da teskari tartibda. Manifestga ko'ra kerakli
+        status yoki foydalanuvchi bo'lmagan arxiv oylari o'qilmaydi.
+        """
+        def hot_source():
+            if user_id is not None:
+                orders = (self._orders_by_id[i] for i in self._orders_by_user.get(user_id, []))
+                keys = sorted(self._order_sort_key(o) for o in orders
+                              if status is None or str(o.status) == status)
+            elif status is not None:
+                keys = self._order_keys_by_status.get(status, [])
+            else:
+                keys = self._order_keys
+            return keys, self._orders_by_id
+
+        def cold_source(month):
+            orders, by_id = self._cold_partition(month)
+            return [
+                self._order_sort_key(o) for o in orders
+                if (status is None or str(o.status) == status)
+                and (user_id is None or o.user_id == user_id)
+            ], by_id
+
+        archived = self._orders_manifest()['archived']
+        months = []
+        for month, info in sorted(archived.items(), reverse=True):
+            if (first_month and month < first_month) or (last_month and month > last_month):
+                continue
+            if status is not None and not info['statuses'].get(status):
+                continue
+            if user_id is not None:
+                users = info['users']
+                idx = bisect_left(users, user_id)
+                if idx == len(users) or users[idx] != user_id:
+                    continue
+            months.append(month)
+
+        if newest_first:
+            yield hot_source()
+            for month in months:
+                yield cold_source(month)
+        else:
+            for month in reversed(months):
+                yield cold_source(month)
+            yield hot_source()
+
+    @_synchronized
+    def query_orders(self, status: str = None, user_id: int = None,
+                     since: str = None, until: str = None,
+                     limit: int = 20, cursor: str = None) -> Dict[str, Any]:
+        """
+        Buyurtmalarni sahifalab olish (eng yangisi birinchi)
+
+        Faol oylar uchun javob (created_ts, id) indeksidan bisect bilan
+        olinadi - vaqt sahifa hajmiga proporsional, butun ro'yxat
+        saralanmaydi. Arxivga yetganda faqat filtrga mos oylar o'qiladi.
+
+        Args:
+            status: Faqat shu statusdagilar
+            user_id: Faqat shu foydalanuvchiniki
+            since: Boshlanish vaqti 'YYYY-MM-DD HH:MM:SS' (shu jumladan)
+            until: Tugash vaqti 'YYYY-MM-DD HH:MM:SS' (shu jumladan)
+            limit: Sahifa hajmi
+            cursor: Oldingi javobdagi 'next' yoki 'prev' (None - birinchi sahifa)
+
+        Returns:
+            Dict[str, Any]: {'orders': [...], 'next': eskiroq sahifa kursori yoki None,
+                'prev': yangiroq sahifa kursori yoki None}
+
+        Raises:
+            ValueError: Kursor noto'g'ri bo'lsa
+        """
+        self._hot_orders()
+        status = str(status) if status is not None else None
+        direction, start = self._decode_cursor(cursor) if cursor else ('n', None)
+        newest_first = direction == 'n'
+
+        # Oraliq chegaralari kalitlar ko'rinishida
+        low = (to_epoch(since) or 0, -1) if since else None
+        high = (to_epoch(until) or 0, float('inf')) if until else None
+        if start is not None:
+            if newest_first:
+                high = min(high, start) if high else start
+            else:
+                low = max(low, start) if low else start
+
+        # Kursordan keyingi oylargina o'qiladi
+        first_month = since[:7] if since else None
+        last_month = until[:7] if until else None
+        if start is not None:
+            start_month = datetime.fromtimestamp(start[0]).strftime('%Y-%m') if start[0] else partitions.UNDATED
+            if newest_first:
+                last_month = min(last_month, start_month) if last_month else start_month
+            else:
+                first_month = max(first_month, start_month) if first_month else start_month
+
+        found: List[Dict] = []
+        sources = self._order_key_sources(status, user_id, first_month, last_month, newest_first)
+        for keys, by_id in sources:
+            # [lo, hi) - chegaralar ichidagi kalitlar (kursor kalitining o'zi kirmaydi)
+            lo = bisect_left(keys, low) if low else 0
+            if low and start is not None and not newest_first:
+                lo = bisect_right(keys, low)
+            hi = bisect_right(keys, high) if high else len(keys)
+            if high and start is not None and newest_first:
+                hi = bisect_left(keys, high)
+
+            positions = range(hi - 1, lo - 1, -1) if newest_first else range(lo, hi)
+            for idx in positions:
+                found.append(by_id[keys[idx][1]])
+                if len(found) > limit:
+                    break
+            if len(found) > limit:
+                break
+
+        more = len(found) > limit
+        page = found[:limit]
+        if not newest_first:
+            page.reverse()
+        if not page:
+            return {'orders': [], 'next': None, 'prev': None}
+
+        first_key, last_key = self._order_sort_key(page[0]), self._order_sort_key(page[-1])
+        has_older = more if newest_first else True
+        has_newer = (start is not None) if newest_first else more
+        return {
+            'orders': page,
+            'next': self._encode_cursor('n', last_key) if has_older else None,
+            'prev': self._encode_cursor('p', first_key) if has_newer else None,
+        }
+
+    @_synchronized
+    def next_order(self, status: str = OrderStatus.NEW, skip: int = None) -> Optional[Dict]:
+        """
+        Navbatdagi buyurtma: shu statusdagi eng eski buyurtma
+
+        Status indeksidan olinadi (buyurtmalar aylanib chiqilmaydi). Arxiv
+        oylari faqat manifestda shu statusdagi buyurtma bo'lsa o'qiladi.
+
+        Args:
+            status: Navbat statusi (default: yangi)
+            skip: Shu buyurtmadan tashqari (ko'rilayotgan, lekin statusi
+                o'zgartirilmagan buyurtma) - undan eskilari ham o'tkazib
+                yuborilmaydi
+
+        Returns:
+            Optional[Dict]: Buyurtma yoki None (navbat bo'sh)
+        """
+        self._hot_orders()
+
+        for keys, by_id in self._order_key_sources(str(status), None, None, None,
+                                                   newest_first=False):
+            for _, order_id in keys[:2]:
+                if order_id != skip:
+                    return by_id[order_id]
+
+        return None
+
+    def iter_orders(self, since: str = None, until: str = None,
+                    batch_size: int = 1000) -> Iterator[List[Dict]]:
+        """
+        Buyurtmalarni partitsiyama-partitsiya qismlab berish (eksport uchun)
+
+        Xotirada bir vaqtda faqat bitta oy bo'ladi: arxiv partitsiyalar
+        navbat bilan o'qiladi, get_all_orders() kabi butun tarix bitta
+        ro'yxatga yig'ilmaydi. Qulf faqat har bir oyni olish paytida
+        ushlanadi - qismlar orasida boshqa so'rovlar bajarilaveradi.
+
+        Args:
+            since: Boshlanish vaqti 'YYYY-MM-DD HH:MM:SS' (shu jumladan)
+            until: Tugash vaqti 'YYYY-MM-DD HH:MM:SS' (shu jumladan)
+            batch_size: Bitta qismdagi buyurtmalar soni
+
+        Yields:
+            List[Dict]: Buyurtmalar (eng eskisi birinchi)
+        """
+        first = since[:7] if since else None
+        last = until[:7] if until else None
+        since_ts = to_epoch(since) if since else None
+        until_ts = to_epoch(until) if until else None
+
+        with self._reading():
+            months = sorted(set(self._hot_orders()) | set(self._orders_manifest()['archived']))
+
+        for month in months:
+            if (first and month < first) or (last and month > last):
+                continue
+
+            with self._reading():
+                hot = self._hot_orders()
+                month_orders = hot[month] if month in hot else self._cold_partition(month)[0]
+                month_orders = [
+                    o for o in month_orders
+                    if (since_ts is None or (o.created_ts or 0) >= since_ts)
+                    and (until_ts is None or (o.created_ts or 0) <= until_ts)
+                ]
+
+            for start in range(0, len(month_orders), batch_size):
+                yield month_orders[start:start + batch_size]
+
+    @_synchronized
+    def get_order_status_counts(self) -> Dict[str, int]:
+        """
+        Statuslar bo'yicha buyurtmalar soni
+
+        Buyurtmalar aylanib chiqilmaydi: faol oylar uchun hisoblagichlar
+        har bir o'zgarishda yangilanadi, arxivlangan oylar hisobi esa
+        manifestda saqlanadi.
+
+        Returns:
+            Dict[str, int]: status -> soni
+        """
+        self._hot_orders()
+        counts = dict(self._order_status_counts)
+
+        for info in self._orders_manifest()['archived'].values():
+            for status, count in info['statuses'].items():
+                counts[status] = counts.get(status, 0) + count
+
+        return counts
 
+    @_synchronized
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Admin panel statistikasi (tovarlar, kategoriyalar, buyurtmalar, foydalanuvchilar)
+
+        Hamma qiymatlar tayyor hisoblagichlardan olinadi - kolleksiyalar
+        aylanib chiqilmaydi va nusxalanmaydi. Fayllardan faqat keshning
+        holati tekshiriladi (os.stat), o'qish faqat fayl tashqaridan
+        o'zgartirilgan bo'lsa bo'ladi.
+
+        Returns:
+            Dict[str, Any]: {'products', 'available_products',
+                'unavailable_products', 'categories', 'orders',
+                'order_statuses': {status: soni}, 'users'}
+        """
+        self._products()
+        order_statuses = self.get_order_status_counts()
+
+        return {
+            'products': self._product_counts[True] + self._product_counts[False],
+            'available_products': self._product_counts[True],
+            'unavailable_products': self._product_counts[False],
+            'categories': len(self._categories_by_id),
+            'orders': sum(order_statuses.values()),
+            'order_statuses': order_statuses,
+            'users': len(self._load(config.USERS_FILE)),
+        }
+
+    @_transactional
     def update_order_status(self, order_id: int, status: str) -> bool:
         """
         Buyurtma statusini yangilash
@@ -477,25 +2310,232 @@ class JSONDatabase:
         Returns:
             bool: Muvaffaqiyatli bo'lsa True
         """
-        orders = self._read_json(config.ORDERS_FILE)
+        self._hot_orders()
+        order = self._orders_by_id.get(order_id)
+        cold = order is None
+
+        if cold:
+            order = self._find_cold_order(order_id)
+
+        if order is None:
+            logger.warning(f"⚠️ Buyurtma topilmadi: ID {order_id}")
+            return False
+
+        # O'chirilgan tovar ham - eski buyurtmalarda narx tovardan olinadi
+        product = self._find_product(order.product_id, include_deleted=True)
+        self._update_sales(order, product, -1)
+
+        old_status = order.status
+        if not cold:
+            self._count_status(old_status, -1)
+        order['status'] = status
+        if cold:
+            self._append_cold_status(partitions.month_of(order), order)
+        else:
+            self._count_status(order.status, 1)
+            self._index_order_status(order, str(old_status))
+            self._append_order_entry(
+                partitions.month_of(order), {'op': 'status', 'id': order_id, 'status': status}
+            )
+
+        self._update_sales(order, product, 1)
+        logger.info(f"✅ Buyurtma statusi o'zgartirildi: {order.get('order_number')} -> {status}")
+        return True
+
+    # ==================== SALES ====================
+
+    def _init_sales(self):
+        """
+        Savdo ko'rinishini tekshirish, kerak bo'lsa barcha buyurtmalardan qurish
+
+        Ko'rinish faylga vaqti-vaqti bilan yoziladi (flush_sales), shuning
+        uchun jarayon kutilmaganda to'xtasa, oxirgi buyurtmalar unga
+        tushmay qolishi mumkin. Buni aniqlash arzon: ko'rinishdagi
+        buyurtmalar soni status hisoblagichlari (faol oylar indeksi va
+        arxiv manifesti) bilan solishtiriladi. Mos kelmasa yoki fayl
+        bo'lmasa, ko'rinish buyurtmalardan qayta quriladi (post hodisalari
+        saqlanib qoladi) va yangi epoch oladi - boshqa jarayonlarning shu
+        paytgacha yig'ilgan deltasi endi ko'rinish ichida, ular tashlanadi.
+        """
+        with self._lock:
+            view = self._read_json(config.SALES_FILE) if os.path.exists(config.SALES_FILE) else None
+
+            if isinstance(view, dict) and sales.order_counts(view) == self._order_counts():
+                self._sales_epoch = view.get('epoch')
+                return
+
+            self._products()
+            rebuilt = sales.empty()
+            count = 0
+            for batch in self.iter_orders():
+                for order in batch:
+                    product = self._find_product(order.product_id, include_deleted=True)
+                    sales.apply_order(rebuilt, order, product, 1)
+                count += len(batch)
+
+            if isinstance(view, dict):
+                for day, stats in view.get('days', {}).items():
+                    for event in sales.POST_EVENTS:
+                        if stats.get(event):
+                            sales.apply_post_event(rebuilt, event, day, stats[event])
+
+            rebuilt['epoch'] = f"{time.time_ns():x}"
+            self._sales_epoch = rebuilt['epoch']
+            self._sales_pending = sales.empty()
+            self._committer.write(config.SALES_FILE, self._dump_json(rebuilt))
+            self._process_lock.mark_changed()
+
+        logger.info(f"✅ Savdo hisoboti qurildi: {count} ta buyurtma")
+
+    def _order_counts(self) -> Tuple[int, int]:
+        """
+        Buyurtmalar soni status hisoblagichlaridan (buyurtmalar o'qilmaydi)
+
+        Returns:
+            Tuple[int, int]: (bekor qilinmaganlar, bekor qilinganlar)
+        """
+        self._hot_orders()
+        counts = dict(self._order_status_counts)
+        for info in self._orders_manifest()['archived'].values():
+            for status, count in info['statuses'].items():
+                counts[status] = counts.get(status, 0) + count
+
+        cancelled = counts.get(OrderStatus.CANCELLED.value, 0)
+        return sum(counts.values()) - cancelled, cancelled
+
+    def _sales_view(self) -> Dict:
+        """
+        Savdo ko'rinishi (xotiradan, kerak bo'lsa fayldan yuklab)
+
+        Ko'rinish boshqa jarayonda qayta qurilgan bo'lsa (epoch o'zgargan),
+        shu jarayonning yozilmagan deltasi tashlanadi - u yangi ko'rinishda
+        allaqachon hisoblangan.
+        """
+        view = self._load(config.SALES_FILE)
+        if not isinstance(view, dict):
+            # Fayl yo'qolgan - bo'sh ko'rinishdan davom etiladi
+            view = sales.empty()
+            self._set_cache(config.SALES_FILE, view, self._cache_stamps.get(config.SALES_FILE))
+
+        if view.get('epoch') != self._sales_epoch:
+            self._sales_epoch = view.get('epoch')
+            self._sales_pending = sales.empty()
+        return view
+
+    def _update_sales(self, order: Order, product: Optional[Product], sign: int):
+        """
+        Buyurtmani savdo deltasiga qo'shish yoki olib tashlash (fayl yozilmaydi)
+
+        Args:
+            order: Buyurtma
+            product: Buyurtma tovari
+            sign: 1 yoki -1
+        """
+        self._sales_view()
+        sales.apply_order(self._sales_pending, order, product, sign)
+
+    def _drain_post_events(self, view: Dict) -> int:
+        """
+        To'plangan post hodisalarini ko'rinishga o'tkazish
+
+        Args:
+            view: Savdo ko'rinishi
+
+        Returns:
+            int: O'tkazilgan hodisalar soni
+        """
+        with self._post_events_lock:
+            pending, self._post_events = self._post_events, {}
+
+        for (day, event), count in pending.items():
+            sales.apply_post_event(view, event, day, count)
+        return sum(pending.values())
+
+    def record_post_event(self, event: str):
+        """
+        Avtomatik post hodisasini hisoblash (konversiya uchun)
+
+        Baza qulfini olmaydi va diskka yozmaydi: hisoblagich xotirada
+        oshiriladi, faylga flush_sales (rejalashtiruvchi, bot to'xtashi)
+        bilan tushadi.
+
+        Args:
+            event: "posted" - kanalga tovar post qilindi,
+                "opened" - postdagi deep link orqali bot ochildi
+
+        Raises:
+            ValueError: Noma'lum hodisa
+        """
+        if event not in sales.POST_EVENTS:
+            raise ValueError(f"Noma'lum post hodisasi: {event}")
+
+        key = (datetime.now().strftime('%Y-%m-%d'), event)
+        with self._post_events_lock:
+            self._post_events[key] = self._post_events.get(key, 0) + 1
+
+    @_transactional
+    def flush_sales(self) -> bool:
+        """
+        Xotirada to'plangan savdo o'zgarishlari va post hodisalarini
+        sales.json ga yozish (scheduler har daqiqada, bot to'xtaganda)
+
+        Returns:
+            bool: Fayl yozilgan bo'lsa True (o'zgarish bo'lmasa yozilmaydi)
+        """
+        if sales.is_empty(self._sales_pending) and not self._post_events:
+            return False
+
+        view = self._sales_view()
+        if sales.is_empty(self._sales_pending) and not self._post_events:
+            # Ko'rinish qayta qurilgan va delta unda allaqachon hisoblangan
+            return False
+
+        sales.merge(view, self._sales_pending)
+        self._sales_pending = sales.empty()
+        self._drain_post_events(view)
+        self._write_json(config.SALES_FILE, view)
+        return True
+
+    @_synchronized
+    def get_sales_report(self, days: int = 30) -> Dict[str, Any]:
+        """
+        Savdo hisoboti: kunlik buyurtmalar va tushum, tovarlar va
+        kategoriyalar bo'yicha jami, postlar konversiyasi
+
+        Buyurtmalar o'qilmaydi - hammasi tayyor hisoblagichlardan.
+
+        Args:
+            days: Kunlik hisob necha kun uchun
+
+        Returns:
+            Dict[str, Any]: database.sales.report() natijasi
+        """
+        self._products()
+        view = self._sales_view()
 
-        for order in orders:
-            if order.get('id') == order_id:
-                order['status'] = status
-                self._write_json(config.ORDERS_FILE, orders)
-                logger.info(f"✅ Buyurtma statusi o'zgartirildi: {order.get('order_number')} -> {status}")
-                return True
+        with self._post_events_lock:
+            pending = dict(self._post_events)
+        if pending or not sales.is_empty(self._sales_pending):
+            # Hali yozilmagan o'zgarishlar ham ko'rinsin - keshdagi
+            # ko'rinish o'zgartirilmaydi, nusxasiga qo'shiladi
+            view = sales.copy(view)
+            sales.merge(view, self._sales_pending)
+            for (day, event), count in pending.items():
+                sales.apply_post_event(view, event, day, count)
 
-        logger.warning(f"⚠️ Buyurtma topilmadi: ID {order_id}")
-        return False
+        return sales.report(view, self._products_by_id, days)
 
     # ==================== USERS ====================
 
+    @_transactional
     def add_user(self, user_id: int, username: str = None,
                  first_name: str = None, last_name: str = None) -> Dict:
         """
         Foydalanuvchi qo'shish yoki yangilash
 
+        Har bir /start da chaqiriladi. Qaytgan foydalanuvchi indeksdan
+        topiladi; profili o'zgarmagan bo'lsa, faylga hech narsa yozilmaydi.
+
         Args:
             user_id: Telegram user ID
             username: Username (ixtiyoriy)
@@ -505,34 +2545,40 @@ class JSONDatabase:
         Returns:
             Dict: Foydalanuvchi ma'lumotlari
         """
-        users = self._read_json(config.USERS_FILE)
+        users = self._load(config.USERS_FILE)
 
         # Foydalanuvchi mavjudligini tekshirish
-        for user in users:
-            if user.get('user_id') == user_id:
-                # Yangilash
-                user['username'] = username
-                user['first_name'] = first_name
-                user['last_name'] = last_name
-                self._write_json(config.USERS_FILE, users)
+        user = self._users_by_id.get(user_id)
+        if user is not None:
+            if (user.username, user.first_name, user.last_name) == (username, first_name, last_name):
                 return user
 
+            # Yangilash
+            user['username'] = username
+            user['first_name'] = first_name
+            user['last_name'] = last_name
+            self._write_json(config.USERS_FILE, users)
+            return user
+
         # Yangi foydalanuvchi qo'shish
-        user = {
+        user = User.from_dict({
             'user_id': user_id,
             'username': username,
             'first_name': first_name,
             'last_name': last_name,
             'is_blocked': False,
             'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        }
+        })
 
         users.append(user)
+        self._users_by_id[user_id] = user
+        insort(self._user_keys, self._user_key(user))
         self._write_json(config.USERS_FILE, users)
 
         logger.info(f"✅ Yangi foydalanuvchi: {user_id} (@{username})")
         return user
 
+    @_synchronized
     def get_all_users(self) -> List[Dict]:
         """
         Barcha foydalanuvchilarni olish
@@ -540,8 +2586,77 @@ class JSONDatabase:
         Returns:
             List[Dict]: Foydalanuvchilar ro'yxati
         """
-        return self._read_json(config.USERS_FILE)
+        return list(self._load(config.USERS_FILE))
+
+    @_synchronized
+    def get_users(self, since: str = None, until: str = None, limit: int = None) -> List[Dict]:
+        """
+        Vaqt oralig'ida ro'yxatdan o'tgan foydalanuvchilar (masalan, shu hafta)
+
+        Ro'yxatdan o'tish vaqti indeksida binary search - ro'yxat aylanib
+        chiqilmaydi.
+
+        Args:
+            since: Boshlanish vaqti 'YYYY-MM-DD HH:MM:SS' (shu jumladan)
+            until: Tugash vaqti 'YYYY-MM-DD HH:MM:SS' (shu jumladan)
+            limit: Maksimal soni
+
+        Returns:
+            List[Dict]: Foydalanuvchilar (eng yangisi birinchi)
+        """
+        self._load(config.USERS_FILE)
+        lo, hi = self._time_range(self._user_keys, since, until)
+        if limit is not None:
+            lo = max(lo, hi - limit)
+        return [self._users_by_id[user_id] for _, user_id in reversed(self._user_keys[lo:hi])]
+
+    @_synchronized
+    def count_users(self, since: str = None, until: str = None) -> int:
+        """
+        Vaqt oralig'ida ro'yxatdan o'tgan foydalanuvchilar soni
+
+        Args:
+            since: Boshlanish vaqti 'YYYY-MM-DD HH:MM:SS' (shu jumladan)
+            until: Tugash vaqti 'YYYY-MM-DD HH:MM:SS' (shu jumladan)
+
+        Returns:
+            int: Foydalanuvchilar soni
+        """
+        self._load(config.USERS_FILE)
+        lo, hi = self._time_range(self._user_keys, since, until)
+        return hi - lo
+
+    def iter_users(self, batch_size: int = 1000) -> Iterator[List[Dict]]:
+        """
+        Foydalanuvchilarni qismlab berish (xabar yuborish, eksport uchun)
+
+        get_all_users() dan farqli ravishda butun ro'yxat nusxalanmaydi va
+        qulf faqat har bir qismni olish paytida ushlanadi: 1M foydalanuvchiga
+        xabar yuborilayotganda ham /start va buyurtmalar kutib qolmaydi.
+        Iteratsiya paytida qo'shilgan foydalanuvchilar ham oxirida beriladi.
 
+        Xotira tejalmaydi: qismlar keshdagi to'liq ro'yxatdan kesib olinadi,
+        kesh esa users.json ning barcha yozuvlarini saqlaydi (add_user va
+        get_users ham unga tayanadi) - xotira O(foydalanuvchilar) bo'lib
+        qoladi. JSON backend faqat qismlab berish va qisqa qulflarni
+        beradi; xotirani cheklash kerak bo'lsa - SQLite backend.
+
+        Args:
+            batch_size: Bitta qismdagi foydalanuvchilar soni
+
+        Yields:
+            List[Dict]: Foydalanuvchilar (ro'yxatdan o'tish tartibida)
+        """
+        position = 0
+        while True:
+            with self._reading():
+                batch = self._load(config.USERS_FILE)[position:position + batch_size]
+            if not batch:
+                return
+            position += len(batch)
+            yield batch
+
+    @_synchronized
     def get_users_count(self) -> int:
         """
         Foydalanuvchilar sonini olish
@@ -549,9 +2664,13 @@ class JSONDatabase:
         Returns:
             int: Foydalanuvchilar soni
         """
-        users = self._read_json(config.USERS_FILE)
+        users = self._load(config.USERS_FILE)
         return len(users)
 
 
-# Global database obyekti
-db = JSONDatabase()
\ No newline at end of file
+# Global database obyekti (config.DB_BACKEND bo'yicha)
+if config.DB_BACKEND == "sqlite":
+    from database.sqlite_db import SQLiteDatabase
+    db = SQLiteDatabase(config.SQLITE_FILE)
+else:
+    db = JSONDatabase()
\ No newline at end of file
@@ -0,0 +1,58 @@
+"""
+JSON fayllardan SQLite bazaga bir martalik ko'chirish
+
+Foydalanish:
+    python -m database.migrate           # data/*.json -> config.SQLITE_FILE
+    python -m database.migrate --force   # SQLite bazada ma'lumot bo'lsa ham almashtirish
+
+Keyin config.py da (yoki .env da) DB_BACKEND = "sqlite" qilib qo'ying.
+"""
+
+import argparse
+import logging
+import sys
+
+import config
+from database.json_db import JSONDatabase
+from database.sqlite_db import SQLiteDatabase
+
+logger = logging.getLogger(__name__)
+
+
+def migrate(sqlite_file: str = None, force: bool = False) -> bool:
+    """
+    data/*.json dagi barcha ma'lumotlarni SQLite ga ko'chirish
+
+    Args:
+        sqlite_file: SQLite fayl yo'li (default: config.SQLITE_FILE)
+        force: Bazada ma'lumot bo'lsa ham almashtirish
+
+    Returns:
+        bool: Ko'chirilgan bo'lsa True
+    """
+    source = JSONDatabase()
+    target = SQLiteDatabase(sqlite_file or config.SQLITE_FILE)
+
+    if not force and (target.get_all_products() or target.get_all_orders() or target.get_users_count()):
+        logger.error("❌ SQLite bazada allaqachon ma'lumot bor. Almashtirish uchun: --force")
+        return False
+
+    target.import_records(
+        categories=source.get_categories(),
+        # O'chirilgan tovarlar ham ko'chiriladi - eski buyurtmalar ularga bog'liq
+        products=source.get_all_products() + source.get_deleted_products(),
+        orders=list(reversed(source.get_all_orders())),
+        users=source.get_all_users()
+    )
+    return True
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="data/*.json -> SQLite migratsiyasi")
+    parser.add_argument("--db", default=config.SQLITE_FILE, help="SQLite fayl yo'li")
+    parser.add_argument("--force", action="store_true", help="Mavjud ma'lumotlarni almashtirish")
+    args = parser.parse_args()
+
+    sys.exit(0 if migrate(args.db, args.force) else 1)
@@ -0,0 +1,324 @@
+"""
+Yozuv turlari: Category, Product, Order, User
+
+Keshdagi har bir yozuv oddiy dict emas, __slots__ li obyekt: kalit nomlari
+har bir yozuvda takrorlanmaydi, created_at butun son (epoch) sifatida,
+kategoriya nomlari esa intern qilingan holda saqlanadi. Yozuvlar dict kabi
+ishlaydi (record['name'], record.get('price'), record['status'] = ...),
+shuning uchun handlerlar o'zgarmaydi. Faylga yozishda to_dict() ishlatiladi.
+"""
+
+import sys
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# created_at ning matn ko'rinishi (fayllarda va handlerlarda)
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+class OrderStatus(str, Enum):
+    """
+    Buyurtma statuslari
+
+    str dan meros olgan: OrderStatus.NEW == 'yangi', va matn kalitli
+    lug'atlarda ({'yangi': '🆕'}.get(status)) odatiy satr kabi ishlaydi.
+    """
+
+    NEW = 'yangi'
+    CONFIRMED = 'tasdiqlandi'
+    DELIVERING = 'yetkazilmoqda'
+    DELIVERED = 'yetkazildi'
+    CANCELLED = 'bekor'
+
+    # f-string va str() da 'OrderStatus.NEW' emas, 'yangi' chiqishi uchun
+    __str__ = str.__str__
+    __format__ = str.__format__
+
+
+def to_epoch(value: Any) -> Optional[int]:
+    """
+    created_at ni epoch soniyaga aylantirish
+
+    Args:
+        value: 'YYYY-MM-DD HH:MM:SS' (mahalliy vaqt), epoch son yoki None
+
+    Returns:
+        Optional[int]: Epoch soniya (o'qib bo'lmasa None)
+    """
+    if value is None or isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value)
+    try:
+        return int(datetime.fromisoformat(value).timestamp())
+    except (TypeError, ValueError):
+        return None
+
+
+def format_epoch(value: Optional[int]) -> Optional[str]:
+    """
+    Epoch soniyani 'YYYY-MM-DD HH:MM:SS' ko'rinishiga keltirish
+
+    Args:
+        value: Epoch soniya yoki None
+
+    Returns:
+        Optional[str]: Mahalliy vaqt matni
+    """
+    if value is None:
+        return None
+    return datetime.fromtimestamp(value).strftime(TIME_FORMAT)
+
+
+def to_status(value: Any) -> Any:
+    """
+    Statusni OrderStatus ga aylantirish (noma'lum status o'zgarishsiz qoladi)
+    """
+    try:
+        return OrderStatus(value)
+    except ValueError:
+        return value
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+
+class Record:
+    """
+    __slots__ li yozuvlar uchun asos - dict bilan mos interfeys
+
+    Quyi klasslar KEYS (fayldagi kalitlar tartibi bilan), DEFAULTS va
+    COERCE (kalit -> qiymatni saqlanadigan ko'rinishga keltiruvchi
+    funksiya) ni belgilaydi. created_at kaliti created_ts slotida epoch
+    sifatida saqlanadi. Noma'lum kalitlar _extra lug'atiga tushadi va
+    yo'qolmaydi. Faylda bo'lmagan maydon None (yoki DEFAULTS dagi qiymat)
+    bo'ladi, get() esa None uchun default ni qaytaradi. Bunday maydonlar
+    _missing da eslab qolinadi va qiymat berilmaguncha to_dict() ga
+    kirmaydi - yozuv faylga o'qilgan ko'rinishida qaytadi.
+    """
+
+    __slots__ = ('_extra', '_missing')
+
+    KEYS: Tuple[str, ...] = ()
+    # created_at dan boshqa (slot nomi kalit bilan bir xil) kalitlar
+    _KEY_SET: frozenset = frozenset()
+    _ALL_KEYS: frozenset = frozenset()
+    _PLAN: Tuple = ()
+    # Faylda bo'lmagan kalitlar to'plamlari (qarang: from_dict)
+    _MISSING: Dict[frozenset, frozenset] = {}
+    DEFAULTS: Dict[str, Any] = {}
+    COERCE: Dict[str, Any] = {}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Record":
+        """
+        Fayldagi lug'atdan yozuv yaratish
+
+        Args:
+            data: Yozuv lug'ati
+
+        Returns:
+            Record: Yangi yozuv
+        """
+        record = cls.__new__(cls)
+        record._extra = None
+        record._missing = None
+        for key, slot, coerce, default in cls._PLAN:
+            value = data.get(key, default)
+            if coerce is None:
+                setattr(record, slot, value)
+            else:
+                record[key] = value
+        for key in data.keys() - cls._ALL_KEYS:
+            record[key] = data[key]
+        missing = cls._ALL_KEYS.difference(data)
+        if missing:
+            # Bir xil to'plam barcha yozuvlarda bitta obyekt bo'lib qoladi
+            record._missing = cls._MISSING.setdefault(missing, missing)
+        return record
+
+    def to_dict(self) -> Dict:
+        """
+        Faylga yoziladigan lug'at (faylda bo'lmagan va keyin berilmagan
+        maydonlarsiz)
+
+        Returns:
+            Dict: Yozuv lug'ati
+        """
+        data = {key: self[key] for key in self}
+        if isinstance(data.get('status'), OrderStatus):
+            data['status'] = data['status'].value
+        return data
+
+    # ---------- dict interfeysi ----------
+
+    def __getitem__(self, key: str) -> Any:
+        if key == 'created_at' and 'created_at' in self._ALL_KEYS:
+            if self.created_ts is None and self._extra and 'created_at' in self._extra:
+                return self._extra['created_at']
+            return format_epoch(self.created_ts)
+        if key in self._KEY_SET:
+            return getattr(self, key)
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any):
+        raw = value
+        if self._missing is not None and key in self._missing:
+            self._missing = self._missing - {key} or None
+        coerce = self.COERCE.get(key)
+        if coerce is not None:
+            value = coerce(value)
+
+        if key == 'created_at':
+            self.created_ts = value
+            if value is None and raw is not None:
+                # O'qib bo'lmagan vaqt yo'qolmasin - o'zgarishsiz saqlanadi
+                self._set_extra(key, raw)
+        elif key in self._KEY_SET:
+            setattr(self, key, value)
+        else:
+            self._set_extra(key, value)
+
+    def _set_extra(self, key: str, value: Any):
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = value
+
+    def __contains__(self, key: str) -> bool:
+        if key in self._ALL_KEYS:
+            return self._missing is None or key not in self._missing
+        return self._extra is not None and key in self._extra
+
+    def __iter__(self) -> Iterator[str]:
+        if self._missing is None:
+            yield from self.KEYS
+        else:
+            yield from (key for key in self.KEYS if key not in self._missing)
+        if self._extra:
+            yield from (key for key in self._extra if key not in self._ALL_KEYS)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Record):
+            other = other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            value = self[key]
+        except KeyError:
+            return default
+        return default if value is None else value
+
+    def keys(self):
+        return list(self)
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
+    def values(self):
+        return [self[key] for key in self]
+
+    def update(self, other: Any = (), **kwargs):
+        if isinstance(other, Record):
+            other = other.to_dict()
+        for key, value in dict(other, **kwargs).items():
+            self[key] = value
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._KEY_SET = frozenset(k for k in cls.KEYS if k != 'created_at')
+        cls._ALL_KEYS = frozenset(cls.KEYS)
+        cls._MISSING = {}
+        # from_dict uchun: (kalit, slot, o'zgartiruvchi, default)
+        cls._PLAN = tuple(
+            (key, 'created_ts' if key == 'created_at' else key, cls.COERCE.get(key), cls.DEFAULTS.get(key))
+            for key in cls.KEYS
+        )
+
+
+class Category(Record):
+    """Kategoriya"""
+
+    __slots__ = ('id', 'name')
+
+    KEYS = ('id', 'name')
+    COERCE = {'name': _intern}
+
+
+class Product(Record):
+    """
+    Tovar
+
+    Faylda kategoriya nomi emas, uning ID si (category_id) saqlanadi.
+    product['category'] - bog'langan kategoriya yozuvining joriy nomi,
+    shuning uchun kategoriya nomi o'zgarganda tovarlar qayta yozilmaydi.
+    Bog'lashni baza bajaradi (bind_category); 'category' faylga yozilmaydi.
+    """
+
+    __slots__ = ('id', 'category_id', 'name', 'description', 'price', 'size',
+                 'photo_id', 'is_available', 'created_ts', '_category')
+
+    KEYS = ('id', 'category_id', 'name', 'description', 'price', 'size',
+            'photo_id', 'is_available', 'created_at')
+    DEFAULTS = {'is_available': True}
+    COERCE = {'created_at': to_epoch}
+
+    def bind_category(self, category: Optional[Category]):
+        """
+        Tovarni kategoriya yozuviga bog'lash
+
+        Args:
+            category: Kategoriya (topilmasa None)
+        """
+        self._category = category
+
+    def __getitem__(self, key: str) -> Any:
+        if key == 'category':
+            category = getattr(self, '_category', None)
+            if category is not None:
+                return category.name
+            # O'chirilgan tovarlar arxivida nom yozuvning o'zida saqlanadi
+            return self._extra.get('category') if self._extra else None
+        return super().__getitem__(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key == 'category' or super().__contains__(key)
+
+
+class Order(Record):
+    """Buyurtma"""
+
+    __slots__ = ('id', 'order_number', 'user_id', 'username', 'product_id',
+                 'customer_name', 'phone', 'address', 'quantity', 'price', 'status',
+                 'source', 'created_ts')
+
+    # price - buyurtma paytidagi narx, source - 'post' (kanal postidagi deep link)
+    KEYS = ('id', 'order_number', 'user_id', 'username', 'product_id',
+            'customer_name', 'phone', 'address', 'quantity', 'price', 'status',
+            'source', 'created_at')
+    DEFAULTS = {'quantity': 1, 'status': OrderStatus.NEW}
+    COERCE = {'status': to_status, 'created_at': to_epoch}
+
+
+class User(Record):
+    """Foydalanuvchi"""
+
+    __slots__ = ('user_id', 'username', 'first_name', 'last_name', 'is_blocked', 'created_ts')
+
+    KEYS = ('user_id', 'username', 'first_name', 'last_name', 'is_blocked', 'created_at')
+    DEFAULTS = {'is_blocked': False}
+    COERCE = {'created_at': to_epoch}
@@ -0,0 +1,324 @@
+"""
+Buyurtmalarni oylar bo'yicha bo'lib saqlash (partitsiyalar)
+
+Har bir oy alohida JSON Lines fayl: data/orders/2026-10.jsonl.
+Fayl jurnal ko'rinishida - har bir qator bitta yozuv:
+    {"op": "insert", "order": {...}}    yangi buyurtma
+    {"op": "status", "id": 5, "status": "yetkazildi"}
+Siqishda (compaction) fayl faqat insert qatorlari bilan qayta yoziladi.
+Eski oylar gzip bilan arxivlanadi: data/orders/2025-06.jsonl.gz
+
+O'qilgan partitsiya vaqt tartibida (time_key) beriladi: yangi buyurtmalar
+oxiriga qo'shiladi, shuning uchun "eng yangisi birinchi" - teskari
+iteratsiya, saralash emas.
+"""
+
+import gzip
+import logging
+import os
+import re
+from typing import Dict, List, Tuple
+
+import config
+from database import serializers
+from database.models import Order
+
+logger = logging.getLogger(__name__)
+
+_PARTITION_RE = re.compile(r'^(\d{4}-\d{2})\.jsonl(\.gz)?$')
+_MONTH_RE = re.compile(r'^\d{4}-\d{2}$')
+
+# created_at i yo'q yoki noto'g'ri buyurtmalar uchun partitsiya
+UNDATED = "0000-00"
+
+
+def month_of(order: Dict) -> str:
+    """
+    Buyurtma qaysi oy partitsiyasiga tegishli
+
+    Args:
+        order: Buyurtma
+
+    Returns:
+        str: "YYYY-MM"
+    """
+    month = str(order.get('created_at') or '')[:7]
+    return month if _MONTH_RE.match(month) else UNDATED
+
+
+def time_key(order: Order) -> Tuple[int, int]:
+    """
+    Buyurtmaning vaqt bo'yicha tartib kaliti: (created_at epoch, ID)
+
+    Vaqti yo'q buyurtmalar eng boshida (0) turadi.
+
+    Args:
+        order: Buyurtma
+
+    Returns:
+        Tuple[int, int]: Kalit
+    """
+    return order.created_ts or 0, order.id or 0
+
+
+def shift_month(month: str, delta: int) -> str:
+    """
+    Oyni delta oyga surish
+
+    Args:
+        month: "YYYY-MM"
+        delta: Oylar soni (manfiy - orqaga)
+
+    Returns:
+        str: "YYYY-MM"
+    """
+    year, mon = map(int, month.split('-'))
+    index = year * 12 + (mon - 1) + delta
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def hot_path(month: str) -> str:
+    """Faol (xotiradagi) partitsiya fayli"""
+    return f"{config.ORDERS_DIR}/{month}.jsonl"
+
+
+def cold_path(month: str) -> str:
+    """Arxivlangan partitsiya fayli"""
+    return f"{config.ORDERS_DIR}/{month}.jsonl.gz"
+
+
+def is_partition_file(filepath: str) -> bool:
+    """
+    Fayl buyurtmalar partitsiyasimi (faol yoki arxiv)
+
+    Args:
+        filepath: Fayl yo'li
+    """
+    return (os.path.dirname(filepath) == config.ORDERS_DIR
+            and _PARTITION_RE.match(os.path.basename(filepath)) is not None)
+
+
+def scan() -> Tuple[List[str], List[str]]:
+    """
+    Papkadagi partitsiyalarni topish
+
+    Returns:
+        Tuple[List[str], List[str]]: (faol oylar, arxivlangan oylar) - o'sish tartibida
+    """
+    hot, cold = [], []
+
+    try:
+        names = os.listdir(config.ORDERS_DIR)
+    except FileNotFoundError:
+        return hot, cold
+
+    for name in names:
+        match = _PARTITION_RE.match(name)
+        if match:
+            (cold if match.group(2) else hot).append(match.group(1))
+
+    return sorted(hot), sorted(cold)
+
+
+def apply_entry(orders: List[Dict], by_id: Dict[int, Dict], entry: Dict) -> bool:
+    """
+    Bitta jurnal yozuvini buyurtmalar ro'yxatiga qo'llash (idempotent)
+
+    Args:
+        orders: Buyurtmalar ro'yxati
+        by_id: ID -> buyurtma
+        entry: Jurnal yozuvi
+
+    Returns:
+        bool: Status yozuvi bo'lsa True (siqish hisobi uchun)
+    """
+    op = entry.get('op')
+
+    if op == 'insert':
+        order = entry['order']
+        existing = by_id.get(order.get('id'))
+        if existing is None:
+            order = Order.from_dict(order)
+            orders.append(order)
+            by_id[order.id] = order
+        else:
+            existing.update(order)
+    elif op == 'status':
+        order = by_id.get(entry.get('id'))
+        if order is not None:
+            order['status'] = entry['status']
+        return True
+    else:
+        logger.warning(f"⚠️ Noma'lum jurnal yozuvi: {entry}")
+
+    return False
+
+
+def read_entries(filepath: str, orders: List[Dict], by_id: Dict[int, Dict]) -> int:
+    """
+    Jurnal faylini o'qib, yozuvlarni ro'yxatga qo'llash
+
+    Fayl faqat o'qiladi: oxirgi to'liq bo'lmagan qator (uzilgan yoki
+    boshqa jarayon hali yozayotgan) o'tkazib yuboriladi. Uzilgan qatorni
+    kesish - repair_tail() ning ishi, u eksklyuziv qulf ostida chaqiriladi.
+    gzip arxivlar butunligicha (har bir qo'shimcha alohida gzip a'zosi) yoziladi.
+
+    Args:
+        filepath: .jsonl yoki .jsonl.gz fayl
+        orders: To'ldiriladigan ro'yxat
+        by_id: ID -> buyurtma
+
+    Returns:
+        int: Status yozuvlari soni
+
+    Raises:
+        FileNotFoundError: Fayl bo'lmasa
+    """
+    status_entries = 0
+
+    if filepath.endswith('.gz'):
+        with gzip.open(filepath, 'rb') as f:
+            lines = f.read().splitlines(keepends=True)
+        for line_no, line in enumerate(lines, 1):
+            status_entries += _apply_line(filepath, line_no, line, orders, by_id)
+        return status_entries
+
+    with open(filepath, 'rb') as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.endswith(b"\n"):
+                logger.warning(f"⚠️ Jurnalning to'liq bo'lmagan oxiri o'tkazib yuborildi ({filepath}:{line_no})")
+                break
+
+            status_entries += _apply_line(filepath, line_no, line, orders, by_id)
+
+    return status_entries
+
+
+def repair_tail(filepath: str) -> bool:
+    """
+    Yozish paytida uzilgan oxirgi qatorni kesib tashlash
+
+    Aks holda keyingi yozuv unga yopishib qoladi. Faqat eksklyuziv qulf
+    ostida chaqiriladi - boshqa jarayon shu paytda faylga yozmaydi.
+
+    Args:
+        filepath: .jsonl fayl
+
+    Returns:
+        bool: Fayl kesilgan bo'lsa True
+
+    Raises:
+        FileNotFoundError: Fayl bo'lmasa
+    """
+    with open(filepath, 'rb+') as f:
+        end = f.seek(0, os.SEEK_END)
+        if end == 0:
+            return False
+        f.seek(end - 1)
+        if f.read(1) == b"\n":
+            return False
+
+        # Oxirgi to'liq qator tugagan joyni orqadan qidirish
+        keep = 0
+        position = end
+        while position > 0:
+            step = min(position, 64 * 1024)
+            position -= step
+            f.seek(position)
+            idx = f.read(step).rfind(b"\n")
+            if idx != -1:
+                keep = position + idx + 1
+                break
+
+        f.truncate(keep)
+
+    logger.warning(f"⚠️ Jurnalning uzilgan oxiri kesildi ({filepath}: {end - keep} bayt)")
+    return True
+
+
+def _apply_line(filepath: str, line_no: int, line: bytes,
+                orders: List[Dict], by_id: Dict[int, Dict]) -> int:
+    if not line.strip():
+        return 0
+
+    try:
+        entry = serializers.load_line(line)
+    except ValueError:
+        logger.warning(f"⚠️ Jurnal qatori o'qilmadi ({filepath}:{line_no})")
+        return 0
+
+    return int(apply_entry(orders, by_id, entry))
+
+
+def read_partition(filepath: str) -> Tuple[List[Dict], int]:
+    """
+    Partitsiyani o'qish
+
+    Args:
+        filepath: Partitsiya fayli
+
+    Returns:
+        Tuple[List[Dict], int]: (vaqt tartibidagi buyurtmalar, status yozuvlari soni)
+    """
+    orders: List[Dict] = []
+    status_entries = read_entries(filepath, orders, {})
+    # Odatda fayl allaqachon tartibda - timsort bir marta o'tadi
+    orders.sort(key=time_key)
+    return orders, status_entries
+
+
+def dump_partition(orders: List[Dict]) -> bytes:
+    """
+    Partitsiyaning siqilgan ko'rinishi - har bir buyurtma bitta insert qatori
+
+    Args:
+        orders: Buyurtmalar
+
+    Returns:
+        bytes: Fayl mazmuni
+    """
+    return b"".join(serializers.dump_line({'op': 'insert', 'order': o}) for o in orders)
+
+
+def gzip_member(payload: bytes) -> bytes:
+    """
+    Arxiv oxiriga qo'shiladigan alohida gzip a'zosi
+
+    Args:
+        payload: JSON qatorlar
+
+    Returns:
+        bytes: gzip baytlari
+    """
+    return gzip.compress(payload, mtime=0)
+
+
+def summarize(orders: List[Dict]) -> Dict:
+    """
+    Arxivlangan partitsiya haqida manifest yozuvi
+
+    Args:
+        orders: Partitsiya buyurtmalari
+
+    Returns:
+        Dict: ID oralig'i, soni, statuslar, foydalanuvchilar (saralangan)
+            va ularning buyurtmalari soni (user_counts - users bilan bir tartibda)
+    """
+    ids = [o.id for o in orders if isinstance(o.id, int)]
+    statuses: Dict[str, int] = {}
+    per_user: Dict[int, int] = {}
+    for order in orders:
+        status = str(order.status)
+        statuses[status] = statuses.get(status, 0) + 1
+        if isinstance(order.user_id, int):
+            per_user[order.user_id] = per_user.get(order.user_id, 0) + 1
+    users = sorted(per_user)
+
+    return {
+        'min_id': min(ids, default=0),
+        'max_id': max(ids, default=0),
+        'count': len(orders),
+        'statuses': statuses,
+        'users': users,
+        'user_counts': [per_user[user_id] for user_id in users]
+    }
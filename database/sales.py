@@ -0,0 +1,231 @@
+"""
+Savdo hisoboti uchun tayyor (materialized) ko'rinish
+
+Har bir buyurtma yaratilganda va statusi o'zgarganda hisoblagichlar
+yangilanadi, shuning uchun hisobot buyurtmalarni aylanib chiqmaydi va
+har biri uchun tovarni qidirmaydi. Buyurtma yozilishida fayl qayta
+yozilmaydi: o'zgarishlar xotiradagi delta ko'rinishga (xuddi shu
+tuzilishda) yig'iladi va data/sales.json ga vaqti-vaqti bilan merge()
+orqali qo'shiladi:
+    {
+        "days": {"2026-10-18": {"orders": 5, "quantity": 7, "revenue": 1250000.0,
+                                "cancelled": 1, "posted": 3, "opened": 40, "post_orders": 2}},
+        "products": {"12": {"orders": 3, "quantity": 4, "revenue": 800000.0}}
+    }
+Bekor qilingan buyurtmalar faqat "cancelled" da hisoblanadi - tushum va
+sonlarga kirmaydi. Kategoriyalar bo'yicha hisob tovarlar hisobidan
+tovarning joriy kategoriyasi bo'yicha yig'iladi (nomini o'zgartirish
+yoki tovarni boshqa kategoriyaga o'tkazish hisobotni buzmaydi).
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from database.models import OrderStatus
+
+# Scheduler postlari va ulardagi deep link bosilishi
+POST_EVENTS = ('posted', 'opened')
+# Buyurtma deep link orqali kelgan bo'lsa Order.source qiymati
+POST_SOURCE = 'post'
+
+DELETED_CATEGORY = "🗑 O'chirilgan tovarlar"
+
+_DAY_FIELDS = ('orders', 'quantity', 'revenue', 'cancelled', 'posted', 'opened', 'post_orders')
+_TOTAL_FIELDS = ('orders', 'quantity', 'revenue')
+
+
+def empty() -> Dict:
+    """Bo'sh ko'rinish"""
+    return {'days': {}, 'products': {}}
+
+
+def is_empty(view: Dict) -> bool:
+    """Ko'rinishda (yoki deltada) hech narsa yo'qmi"""
+    return not view['days'] and not view['products']
+
+
+def copy(view: Dict) -> Dict:
+    """
+    Ko'rinish nusxasi (hisoblagich lug'atlari ham nusxalanadi)
+
+    Args:
+        view: Ko'rinish
+
+    Returns:
+        Dict: Yangi ko'rinish
+    """
+    return dict(
+        view,
+        days={day: dict(stats) for day, stats in view['days'].items()},
+        products={key: dict(stats) for key, stats in view['products'].items()}
+    )
+
+
+def merge(view: Dict, delta: Dict):
+    """
+    Deltani ko'rinishga qo'shish
+
+    Args:
+        view: Ko'rinish (o'zgartiriladi)
+        delta: apply_order() bilan to'ldirilgan delta ko'rinish
+    """
+    for day, stats in delta['days'].items():
+        target = _day(view, day)
+        for field, value in stats.items():
+            target[field] += value
+
+    for key, stats in delta['products'].items():
+        totals = view['products'].setdefault(key, dict.fromkeys(_TOTAL_FIELDS, 0))
+        for field in _TOTAL_FIELDS:
+            totals[field] += stats[field]
+        if not totals['orders'] and not totals['quantity']:
+            del view['products'][key]
+
+
+def order_counts(view: Dict) -> Tuple[int, int]:
+    """
+    Ko'rinishdagi buyurtmalar soni (tekshirish uchun)
+
+    Args:
+        view: Ko'rinish
+
+    Returns:
+        Tuple[int, int]: (bekor qilinmaganlar, bekor qilinganlar)
+    """
+    days = view['days'].values()
+    return sum(d['orders'] for d in days), sum(d['cancelled'] for d in days)
+
+
+def _day(view: Dict, day: str) -> Dict:
+    stats = view['days'].get(day)
+    if stats is None:
+        stats = view['days'][day] = dict.fromkeys(_DAY_FIELDS, 0)
+    return stats
+
+
+def order_revenue(order: Dict, product: Optional[Dict]) -> float:
+    """
+    Buyurtma summasi: buyurtma paytidagi narx x miqdor
+
+    Narx saqlanmagan eski buyurtmalar uchun tovarning joriy narxi olinadi.
+
+    Args:
+        order: Buyurtma
+        product: Buyurtma tovari (o'chirilgan bo'lsa None)
+
+    Returns:
+        float: Summa
+    """
+    price = order.get('price')
+    if price is None:
+        price = product.get('price', 0) if product else 0
+    return float(price) * (order.get('quantity') or 1)
+
+
+def apply_order(view: Dict, order: Dict, product: Optional[Dict], sign: int):
+    """
+    Buyurtmani ko'rinishga qo'shish (sign=1) yoki olib tashlash (sign=-1)
+
+    Status o'zgarganda eski holat -1 bilan, yangisi +1 bilan qo'llanadi.
+
+    Args:
+        view: Ko'rinish
+        order: Buyurtma
+        product: Buyurtma tovari (o'chirilgan bo'lsa None)
+        sign: 1 yoki -1
+    """
+    day = _day(view, str(order.get('created_at') or '')[:10] or '—')
+
+    if order.get('status') == OrderStatus.CANCELLED:
+        day['cancelled'] += sign
+        return
+
+    quantity = (order.get('quantity') or 1) * sign
+    revenue = order_revenue(order, product) * sign
+
+    day['orders'] += sign
+    day['quantity'] += quantity
+    day['revenue'] += revenue
+    if order.get('source') == POST_SOURCE:
+        day['post_orders'] += sign
+
+    key = str(order.get('product_id'))
+    totals = view['products'].setdefault(key, dict.fromkeys(_TOTAL_FIELDS, 0))
+    totals['orders'] += sign
+    totals['quantity'] += quantity
+    totals['revenue'] += revenue
+    if not totals['orders'] and not totals['quantity']:
+        del view['products'][key]
+
+
+def apply_post_event(view: Dict, event: str, day: str = None, count: int = 1):
+    """
+    Post hodisasini hisoblash
+
+    Args:
+        view: Ko'rinish
+        event: "posted" (kanalga post) yoki "opened" (deep link bosildi)
+        day: 'YYYY-MM-DD' (default: bugun)
+        count: Hodisalar soni (to'plab yozilganda)
+
+    Raises:
+        ValueError: Noma'lum hodisa
+    """
+    if event not in POST_EVENTS:
+        raise ValueError(f"Noma'lum post hodisasi: {event}")
+    _day(view, day or datetime.now().strftime('%Y-%m-%d'))[event] += count
+
+
+def report(view: Dict, products_by_id: Dict[int, Dict], days: int = 30) -> Dict[str, Any]:
+    """
+    Ko'rinishdan hisobot tayyorlash
+
+    Args:
+        view: Ko'rinish
+        products_by_id: ID -> tovar (nomi va joriy kategoriyasi uchun)
+        days: Kunlik hisob necha kun uchun
+
+    Returns:
+        Dict[str, Any]: {
+            'days': [{'day', 'orders', 'quantity', 'revenue', ...}] - eng yangisi birinchi,
+            'totals': shu kunlar yig'indisi,
+            'products': [{'product_id', 'name', 'category', 'orders', 'quantity', 'revenue'}],
+            'categories': [{'category', 'orders', 'quantity', 'revenue'}]
+        } - tovar va kategoriyalar butun davr uchun, tushum bo'yicha kamayish tartibida
+    """
+    first_day = (datetime.now() - timedelta(days=days - 1)).strftime('%Y-%m-%d')
+    daily = [
+        dict(stats, day=day)
+        for day, stats in sorted(view['days'].items(), reverse=True)
+        if day >= first_day
+    ]
+    totals = {field: sum(d[field] for d in daily) for field in _DAY_FIELDS}
+
+    products = []
+    categories: Dict[str, Dict] = {}
+    for key, stats in view['products'].items():
+        product_id = int(key) if key.lstrip('-').isdigit() else None
+        product = products_by_id.get(product_id)
+        category = product['category'] if product else DELETED_CATEGORY
+        products.append(dict(
+            stats,
+            product_id=product_id,
+            name=product['name'] if product else None,
+            category=category
+        ))
+
+        totals_by_category = categories.setdefault(category, dict.fromkeys(_TOTAL_FIELDS, 0))
+        for field in _TOTAL_FIELDS:
+            totals_by_category[field] += stats[field]
+
+    by_revenue = lambda item: item['revenue']
+    return {
+        'days': daily,
+        'totals': totals,
+        'products': sorted(products, key=by_revenue, reverse=True),
+        'categories': sorted(
+            (dict(stats, category=category) for category, stats in categories.items()),
+            key=by_revenue,
+            reverse=True
+        ),
+    }
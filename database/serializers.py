@@ -0,0 +1,149 @@
+"""
+Ma'lumotlar fayllarini serializatsiya qilish
+JSON (chiroyli yoki ixcham, orjson bo'lsa u orqali) va msgpack formatlari
+"""
+
+import json
+import logging
+from typing import Any, Callable, Dict
+
+from database.storage import DatabaseError
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - ixtiyoriy kutubxona
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - ixtiyoriy kutubxona
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+# JSON fayl boshlanishi mumkin bo'lgan baytlar (BOM va bo'shliqlardan keyin).
+# msgpack massiv/lug'atlari 0x80-0x9f, 0xdc-0xdf baytlari bilan boshlanadi,
+# shuning uchun ikki format birinchi baytdan ajratiladi.
+_JSON_START = frozenset(b'[{"-0123456789tfn')
+_UTF8_BOM = b"\xef\xbb\xbf"
+
+
+def _default(obj: Any) -> Any:
+    # Yozuv obyektlari (database/models.py) lug'at sifatida yoziladi
+    to_dict = getattr(obj, 'to_dict', None)
+    if to_dict is None:
+        raise TypeError(f"{type(obj).__name__} serializatsiya qilinmaydi")
+    return to_dict()
+
+
+def _dump_pretty(data: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, default=_default, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, ensure_ascii=False, indent=2, default=_default).encode('utf-8')
+
+
+def _dump_compact(data: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, default=_default)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=_default).encode('utf-8')
+
+
+def _dump_msgpack(data: Any) -> bytes:
+    if msgpack is None:
+        raise DatabaseError("msgpack formati uchun 'msgpack' kutubxonasi o'rnatilmagan")
+    return msgpack.packb(data, use_bin_type=True, default=_default)
+
+
+# Format nomi -> serializatsiya funksiyasi
+DUMPERS: Dict[str, Callable[[Any], bytes]] = {
+    "pretty": _dump_pretty,
+    "json": _dump_compact,
+    "msgpack": _dump_msgpack,
+}
+
+
+def get_dumper(name: str) -> Callable[[Any], bytes]:
+    """
+    Format nomi bo'yicha serializatsiya funksiyasini olish
+
+    Args:
+        name: "pretty", "json" yoki "msgpack"
+
+    Returns:
+        Callable[[Any], bytes]: Ma'lumotlarni baytlarga aylantiruvchi funksiya
+    """
+    try:
+        dumper = DUMPERS[name]
+    except KeyError:
+        raise ValueError(f"Noma'lum fayl formati: {name} (mavjud: {', '.join(DUMPERS)})")
+
+    if name == "msgpack" and msgpack is None:
+        logger.warning("⚠️ msgpack o'rnatilmagan, ixcham JSON ishlatiladi")
+        return _dump_compact
+    return dumper
+
+
+def loads(payload: bytes) -> Any:
+    """
+    Fayl mazmunini o'qish - format avtomatik aniqlanadi
+
+    Fayllar qaysi formatda yozilganidan qat'i nazar o'qiladi, shuning
+    uchun config.DB_FORMAT ni o'zgartirish uchun migratsiya kerak emas:
+    har bir fayl keyingi yozishda yangi formatga o'tadi.
+
+    Args:
+        payload: Fayl mazmuni
+
+    Returns:
+        Any: O'qilgan ma'lumotlar
+
+    Raises:
+        ValueError: Fayl buzilgan bo'lsa
+        DatabaseError: Fayl msgpack formatida, lekin kutubxona o'rnatilmagan
+    """
+    if payload.startswith(_UTF8_BOM):
+        payload = payload[len(_UTF8_BOM):]
+
+    head = payload.lstrip()[:1]
+    if not head or head[0] in _JSON_START:
+        if orjson is not None:
+            return orjson.loads(payload)
+        return json.loads(payload.decode('utf-8'))
+
+    if msgpack is None:
+        raise DatabaseError("Fayl msgpack formatida, lekin 'msgpack' kutubxonasi o'rnatilmagan")
+    try:
+        return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+    except Exception as e:
+        raise ValueError(f"msgpack o'qilmadi: {e}") from e
+
+
+def dump_line(entry: Any) -> bytes:
+    """
+    Jurnal uchun bitta JSON qator (oxirida yangi qator belgisi bilan)
+
+    Args:
+        entry: Jurnal yozuvi
+
+    Returns:
+        bytes: UTF-8 JSON qator
+    """
+    return _dump_compact(entry) + b"\n"
+
+
+def load_line(line: bytes) -> Any:
+    """
+    Jurnalning bitta qatorini o'qish
+
+    Args:
+        line: JSON qator
+
+    Returns:
+        Any: Jurnal yozuvi
+
+    Raises:
+        ValueError: Qator buzilgan bo'lsa
+    """
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
@@ -0,0 +1,1266 @@
+"""
+SQLite bilan ishlash moduli
+JSONDatabase bilan bir xil public interfeys - config.DB_BACKEND = "sqlite" orqali yoqiladi
+"""
+
+import sqlite3
+import threading
+import time
+import logging
+from datetime import datetime, timedelta
+from typing import List, Optional, Dict, Iterator
+
+import config
+from database import sales
+from database.catalog import CatalogSnapshot
+from database.models import OrderStatus
+
+logger = logging.getLogger(__name__)
+
+
+CATEGORIES_TABLE = """
+CREATE TABLE IF NOT EXISTS {table} (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    deleted_at TEXT
+);
+"""
+
+# Tovar kategoriyaga ID orqali bog'langan - nomi categories jadvalidan olinadi
+PRODUCTS_TABLE = """
+CREATE TABLE IF NOT EXISTS {table} (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    category_id INTEGER NOT NULL REFERENCES categories (id),
+    name TEXT NOT NULL,
+    description TEXT,
+    price REAL NOT NULL,
+    size TEXT,
+    photo_id TEXT,
+    is_available INTEGER NOT NULL DEFAULT 1,
+    created_at TEXT NOT NULL,
+    deleted_at TEXT
+);
+"""
+
+SCHEMA = CATEGORIES_TABLE.format(table='categories') + """
+-- O'chirilgan kategoriya nomi qayta ishlatilishi mumkin
+CREATE UNIQUE INDEX IF NOT EXISTS idx_categories_name ON categories (name) WHERE deleted_at IS NULL;
+""" + PRODUCTS_TABLE.format(table='products') + """
+CREATE INDEX IF NOT EXISTS idx_products_category ON products (category_id, is_available);
+CREATE INDEX IF NOT EXISTS idx_products_created ON products (created_at);
+
+-- Tovar + kategoriya nomi ('category' kaliti) - barcha tovar o'qishlari shu orqali
+CREATE VIEW IF NOT EXISTS product_rows AS
+    SELECT p.*, c.name AS category FROM products p JOIN categories c ON c.id = p.category_id;
+
+CREATE TABLE IF NOT EXISTS orders (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    order_number TEXT NOT NULL,
+    user_id INTEGER NOT NULL,
+    username TEXT,
+    product_id INTEGER NOT NULL,
+    customer_name TEXT,
+    phone TEXT,
+    address TEXT,
+    quantity INTEGER NOT NULL DEFAULT 1,
+    price REAL,
+    status TEXT NOT NULL DEFAULT 'yangi',
+    source TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_orders_user ON orders (user_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_orders_status ON orders (status, created_at);
+CREATE INDEX IF NOT EXISTS idx_orders_created ON orders (created_at);
+
+CREATE TABLE IF NOT EXISTS users (
+    user_id INTEGER NOT NULL UNIQUE,
+    username TEXT,
+    first_name TEXT,
+    last_name TEXT,
+    is_blocked INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_users_created ON users (created_at);
+
+CREATE TABLE IF NOT EXISTS post_events (
+    day TEXT NOT NULL,
+    event TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, event)
+);
+
+-- Katalog (kategoriyalar va tovarlar) har o'zgarganda oshadi - snapshot versiyasi
+CREATE TABLE IF NOT EXISTS catalog_version (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO catalog_version (id, version) VALUES (1, 0);
+""" + "".join(
+    f"CREATE TRIGGER IF NOT EXISTS catalog_{table}_{event.lower()} AFTER {event} ON {table} "
+    f"BEGIN UPDATE catalog_version SET version = version + 1; END;\n"
+    for table in ('categories', 'products')
+    for event in ('INSERT', 'UPDATE', 'DELETE')
+)
+
+# Eski bazalarga qo'shiladigan ustunlar: jadval -> (ustun, turi)
+ADDED_COLUMNS = {
+    'orders': (('price', 'REAL'), ('source', 'TEXT')),
+    'products': (('deleted_at', 'TEXT'),),
+}
+
+# O'chirilgan tovarlar qatori saqlanadi (buyurtmalar tarixi uchun)
+LIVE = "deleted_at IS NULL"
+
+PRODUCT_FIELDS = ('category_id', 'name', 'description', 'price', 'size', 'photo_id', 'is_available')
+
+
+def _product_row(row: sqlite3.Row) -> Dict:
+    """SQLite qatorini JSON versiyadagi tovar ko'rinishiga keltirish"""
+    product = dict(row)
+    product['is_available'] = bool(product['is_available'])
+    if product.get('deleted_at') is None:
+        product.pop('deleted_at', None)
+    return product
+
+
+def _user_row(row: sqlite3.Row) -> Dict:
+    """SQLite qatorini JSON versiyadagi foydalanuvchi ko'rinishiga keltirish"""
+    user = dict(row)
+    user['is_blocked'] = bool(user['is_blocked'])
+    return user
+
+
+class SQLiteDatabase:
+    """
+    SQLite bilan ishlash klassi
+
+    JSONDatabase ning barcha public metodlarini xuddi shu nom, argument va
+    natija ko'rinishida amalga oshiradi, shuning uchun handlerlar qaysi
+    backend ishlatilayotganini bilmaydi. id, user_id, category_id, status va
+    created_at ustunlari indekslangan; WAL rejimi o'qishlarni yozishlar
+    bilan parallel bajarishga imkon beradi.
+    """
+
+    def __init__(self, filepath: str):
+        """
+        Initsializatsiya - baza faylini ochish va jadvallarni yaratish
+
+        Args:
+            filepath: SQLite fayl yo'li
+        """
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(filepath, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._upgrade_schema()
+        self._conn.executescript(SCHEMA)
+
+        # Katalog snapshoti va u tekshirilgandagi holat (qarang: catalog())
+        self._catalog: Optional[CatalogSnapshot] = None
+        self._catalog_changes = -1
+        self._catalog_checked = 0.0
+
+        with self._lock, self._conn:
+            if self._conn.execute("SELECT COUNT(*) FROM categories").fetchone()[0] == 0 \
+                    and self._conn.execute("SELECT COUNT(*) FROM products").fetchone()[0] == 0:
+                self._conn.executemany(
+                    "INSERT INTO categories (name) VALUES (?)",
+                    [(name,) for name in config.DEFAULT_CATEGORIES]
+                )
+
+        logger.info(f"✅ SQLite Database initsializatsiya qilindi: {filepath}")
+
+    def _upgrade_schema(self):
+        """
+        Oldingi versiyada yaratilgan jadvallarga yangi ustunlarni qo'shish
+
+        SCHEMA dan oldin chaqiriladi - uning indekslari yangi ustunlarga
+        tayanadi. Yangi baza uchun hech narsa qilmaydi.
+        """
+        with self._lock, self._conn:
+            for table, columns in ADDED_COLUMNS.items():
+                existing = {row['name'] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+                if not existing:
+                    continue
+                for name, column_type in columns:
+                    if name not in existing:
+                        self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
+                        logger.info(f"✅ Ustun qo'shildi: {table}.{name}")
+
+            existing = {row['name'] for row in self._conn.execute("PRAGMA table_info(products)")}
+            if existing and 'category_id' not in existing:
+                self._migrate_category_ids()
+
+    def _migrate_category_ids(self):
+        """
+        products.category (kategoriya nomi) -> products.category_id
+
+        SQLite ustunni o'zgartira olmaydi, shuning uchun ikkala jadval
+        qayta yaratiladi (ID'lar va AUTOINCREMENT hisoblagichi saqlanadi).
+        Eski versiya kategoriyani butunlay o'chirgan - o'chirilgan
+        tovarlarning bunday kategoriyalari o'chirilgan deb qayta yaratiladi.
+        Tranzaksiya ichida chaqiriladi (qarang: _upgrade_schema).
+        """
+        # sqlite3 DDL uchun tranzaksiya ochmaydi - yarim ko'chirilgan jadvallar qolmasin
+        if not self._conn.in_transaction:
+            self._conn.execute("BEGIN")
+
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        sequences = dict(self._conn.execute(
+            "SELECT name, seq FROM sqlite_sequence WHERE name IN ('categories', 'products')"
+        ).fetchall())
+
+        self._conn.execute(CATEGORIES_TABLE.format(table='categories_new'))
+        self._conn.execute("INSERT INTO categories_new (id, name) SELECT id, name FROM categories ORDER BY id")
+        self._conn.execute(
+            "INSERT INTO categories_new (name, deleted_at) SELECT DISTINCT category, ? FROM products "
+            "WHERE category NOT IN (SELECT name FROM categories)",
+            (now,)
+        )
+
+        self._conn.execute(PRODUCTS_TABLE.format(table='products_new'))
+        self._conn.execute(
+            "INSERT INTO products_new (id, category_id, name, description, price, size, photo_id, "
+            "is_available, created_at, deleted_at) "
+            "SELECT p.id, c.id, p.name, p.description, p.price, p.size, p.photo_id, "
+            "p.is_available, p.created_at, p.deleted_at "
+            "FROM products p JOIN categories_new c ON c.name = p.category ORDER BY p.id"
+        )
+
+        for table in ('products', 'categories'):
+            self._conn.execute(f"DROP TABLE {table}")
+            self._conn.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+            if table in sequences:
+                self._conn.execute(
+                    "UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?",
+                    (sequences[table], table)
+                )
+
+        logger.info("✅ products.category -> products.category_id ko'chirildi")
+
+    def _query(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        """
+        SELECT so'rovini bajarish
+
+        Args:
+            sql: SQL so'rov
+            params: Parametrlar
+
+        Returns:
+            List[sqlite3.Row]: Natija qatorlari
+        """
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    # ==================== MAINTENANCE ====================
+
+    def compact_orders(self):
+        """
+        JSONDatabase bilan moslik uchun: WAL faylini asosiy bazaga ko'chirish
+        """
+        with self._lock:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def archive_orders(self) -> List[str]:
+        """
+        JSONDatabase bilan moslik uchun: SQLite da buyurtmalar created_at
+        indeksi orqali so'raladi, alohida arxiv kerak emas
+
+        Returns:
+            List[str]: Bo'sh ro'yxat
+        """
+        return []
+
+    def flush(self):
+        """
+        JSONDatabase bilan moslik uchun: har bir o'zgarish darhol commit
+        qilinadi, kechiktirilgan yozishlar yo'q
+        """
+
+    def flush_sales(self) -> bool:
+        """
+        JSONDatabase bilan moslik uchun: hisobot so'rov bilan hisoblanadi,
+        post hodisalari darhol post_events jadvaliga yoziladi - to'plangan
+        o'zgarishlar yo'q
+
+        Returns:
+            bool: False
+        """
+        return False
+
+    def compact_catalog(self) -> int:
+        """
+        JSONDatabase bilan moslik uchun: o'chirilgan tovarlar deleted_at
+        ustuni bilan belgilanadi va jadvalda qoladi, qayta yoziladigan fayl yo'q
+
+        Returns:
+            int: 0
+        """
+        return 0
+
+    def import_records(self, categories: List[str], products: List[Dict],
+                       orders: List[Dict], users: List[Dict]):
+        """
+        Tayyor yozuvlarni ID'lari bilan birga import qilish (migratsiya uchun)
+        Mavjud barcha ma'lumotlar o'chiriladi.
+
+        Args:
+            categories: Kategoriyalar
+            products: Tovarlar ('deleted_at' bo'lsa o'chirilgan deb import qilinadi)
+            orders: Buyurtmalar
+            users: Foydalanuvchilar
+        """
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        with self._lock, self._conn:
+            for table in ('categories', 'products', 'orders', 'users'):
+                self._conn.execute(f"DELETE FROM {table}")
+
+            self._conn.executemany(
+                "INSERT INTO categories (name) VALUES (?)",
+                [(name,) for name in dict.fromkeys(categories)]
+            )
+            category_ids = {row['name']: row['id'] for row in self._conn.execute("SELECT id, name FROM categories")}
+
+            # O'chirilgan tovarlarning kategoriyasi ro'yxatda bo'lmasligi mumkin
+            for name in dict.fromkeys(p.get('category') for p in products):
+                if name not in category_ids:
+                    category_ids[name] = self._conn.execute(
+                        "INSERT INTO categories (name, deleted_at) VALUES (?, ?)", (name, now)
+                    ).lastrowid
+
+            self._conn.executemany(
+                "INSERT INTO products (id, category_id, name, description, price, size, "
+                "photo_id, is_available, created_at, deleted_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (p['id'], category_ids[p.get('category')], p.get('name'), p.get('description'),
+                     float(p.get('price', 0)), p.get('size'), p.get('photo_id'),
+                     int(p.get('is_available', True)), p.get('created_at', now),
+                     p.get('deleted_at'))
+                    for p in products
+                ]
+            )
+            self._conn.executemany(
+                "INSERT INTO orders (id, order_number, user_id, username, product_id, "
+                "customer_name, phone, address, quantity, price, status, source, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (o['id'], o.get('order_number'), o.get('user_id'), o.get('username'),
+                     o.get('product_id'), o.get('customer_name'), o.get('phone'),
+                     o.get('address'), o.get('quantity', 1), o.get('price'),
+                     o.get('status', 'yangi'), o.get('source'), o.get('created_at', now))
+                    for o in orders
+                ]
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO users (user_id, username, first_name, last_name, "
+                "is_blocked, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (u['user_id'], u.get('username'), u.get('first_name'), u.get('last_name'),
+                     int(u.get('is_blocked', False)), u.get('created_at', now))
+                    for u in users
+                ]
+            )
+
+        logger.info(
+            f"✅ Import qilindi: {len(categories)} kategoriya, {len(products)} tovar, "
+            f"{len(orders)} buyurtma, {len(users)} foydalanuvchi"
+        )
+
+    # ==================== CATEGORIES ====================
+
+    def get_categories(self) -> List[str]:
+        """
+        Barcha kategoriyalarni olish
+
+        Returns:
+            List[str]: Kategoriyalar ro'yxati
+        """
+        return [row['name'] for row in self._query(f"SELECT name FROM categories WHERE {LIVE} ORDER BY id")]
+
+    def _category_id(self, name: str) -> int:
+        """
+        Kategoriya nomidan ID (tranzaksiya ichida, JSONDatabase._category_id
+        bilan bir xil: ro'yxatda yo'q kategoriya yaratiladi)
+
+        Args:
+            name: Kategoriya nomi
+
+        Returns:
+            int: Kategoriya ID
+        """
+        row = self._conn.execute(
+            f"SELECT id FROM categories WHERE name = ? AND {LIVE}", (name,)
+        ).fetchone()
+        if row is not None:
+            return row['id']
+
+        logger.warning(f"⚠️ Kategoriya topilmadi, yaratiladi: {name}")
+        return self._conn.execute("INSERT INTO categories (name) VALUES (?)", (name,)).lastrowid
+
+    def add_category(self, category: str) -> bool:
+        """
+        Yangi kategoriya qo'shish
+
+        Args:
+            category: Kategoriya nomi
+
+        Returns:
+            bool: Muvaffaqiyatli bo'lsa True
+        """
+        try:
+            with self._lock, self._conn:
+                self._conn.execute("INSERT INTO categories (name) VALUES (?)", (category,))
+        except sqlite3.IntegrityError:
+            logger.warning(f"⚠️ Kategoriya allaqachon mavjud: {category}")
+            return False
+
+        logger.info(f"✅ Kategoriya qo'shildi: {category}")
+        return True
+
+    def delete_category(self, category: str) -> bool:
+        """
+        Kategoriyani o'chirish (va unga tegishli barcha tovarlarni)
+
+        Kategoriya ham, tovarlar ham o'chirilgan deb belgilanadi (qarang:
+        delete_product) - o'chirilgan tovarlar kategoriya nomini ko'rsataveradi.
+
+        Args:
+            category: Kategoriya nomi
+
+        Returns:
+            bool: Muvaffaqiyatli bo'lsa True
+        """
+        deleted_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                f"SELECT id FROM categories WHERE name = ? AND {LIVE}", (category,)
+            ).fetchone()
+            if row is None:
+                logger.warning(f"⚠️ Kategoriya topilmadi: {category}")
+                return False
+
+            self._conn.execute("UPDATE categories SET deleted_at = ? WHERE id = ?", (deleted_at, row['id']))
+            self._conn.execute(
+                f"UPDATE products SET deleted_at = ? WHERE category_id = ? AND {LIVE}",
+                (deleted_at, row['id'])
+            )
+
+        logger.info(f"✅ Kategoriya o'chirildi: {category}")
+        return True
+
+    def update_category(self, old_name: str, new_name: str) -> bool:
+        """
+        Kategoriya nomini o'zgartirish
+
+        Faqat categories qatori o'zgaradi: tovarlar unga category_id orqali
+        bog'langan va yangi nomni darhol ko'radi.
+
+        Args:
+            old_name: Eski nom
+            new_name: Yangi nom
+
+        Returns:
+            bool: Muvaffaqiyatli bo'lsa True
+        """
+        try:
+            with self._lock, self._conn:
+                cursor = self._conn.execute(
+                    f"UPDATE categories SET name = ? WHERE name = ? AND {LIVE}", (new_name, old_name)
+                )
+        except sqlite3.IntegrityError:
+            logger.warning(f"⚠️ Kategoriya allaqachon mavjud: {new_name}")
+            return False
+
+        if cursor.rowcount == 0:
+            logger.warning(f"⚠️ Kategoriya topilmadi: {old_name}")
+            return False
+
+        logger.info(f"✅ Kategoriya o'zgartirildi: {old_name} -> {new_name}")
+        return True
+
+    # ==================== PRODUCTS ====================
+
+    def add_product(self, category: str, name: str, description: str,
+                    price: float, size: str = None, photo_id: str = None) -> Dict:
+        """
+        Yangi tovar qo'shish
+
+        Args:
+            category: Kategoriya
+            name: Tovar nomi
+            description: Tavsifi
+            price: Narxi
+            size: O'lchami/rangi (ixtiyoriy)
+            photo_id: Telegram photo file_id (ixtiyoriy)
+
+        Returns:
+            Dict: Yaratilgan tovar
+        """
+        created_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        with self._lock, self._conn:
+            category_id = self._category_id(category)
+            cursor = self._conn.execute(
+                "INSERT INTO products (category_id, name, description, price, size, photo_id, "
+                "is_available, created_at) VALUES (?, ?, ?, ?, ?, ?, 1, ?)",
+                (category_id, name, description, float(price), size, photo_id, created_at)
+            )
+            new_id = cursor.lastrowid
+
+        logger.info(f"✅ Tovar qo'shildi: {name} (ID: {new_id})")
+        return {
+            'id': new_id,
+            'category_id': category_id,
+            'category': category,
+            'name': name,
+            'description': description,
+            'price': float(price),
+            'size': size,
+            'photo_id': photo_id,
+            'is_available': True,
+            'created_at': created_at
+        }
+
+    def get_product(self, product_id: int, include_deleted: bool = False) -> Optional[Dict]:
+        """
+        Tovarni ID bo'yicha olish
+
+        Args:
+            product_id: Tovar ID
+            include_deleted: O'chirilgan tovarni ham qaytarish (buyurtmalar
+                tarixi uchun)
+
+        Returns:
+            Optional[Dict]: Tovar yoki None
+        """
+        live = "" if include_deleted else f" AND {LIVE}"
+        rows = self._query(f"SELECT * FROM product_rows WHERE id = ?{live}", (product_id,))
+        return _product_row(rows[0]) if rows else None
+
+    def get_products_by_category(self, category: str) -> List[Dict]:
+        """
+        Kategoriya bo'yicha mavjud tovarlarni olish
+
+        Args:
+            category: Kategoriya nomi
+
+        Returns:
+            List[Dict]: Tovarlar ro'yxati
+        """
+        rows = self._query(
+            f"SELECT * FROM product_rows WHERE category_id = "
+            f"(SELECT id FROM categories WHERE name = ? AND {LIVE}) "
+            f"AND is_available = 1 AND {LIVE} ORDER BY id",
+            (category,)
+        )
+        return [_product_row(row) for row in rows]
+
+    def get_all_products(self) -> List[Dict]:
+        """
+        Barcha tovarlarni olish (mavjud va mavjud bo'lmaganlarni)
+
+        Returns:
+            List[Dict]: Tovarlar ro'yxati
+        """
+        rows = self._query(f"SELECT * FROM product_rows WHERE {LIVE} ORDER BY id")
+        return [_product_row(row) for row in rows]
+
+    def get_deleted_products(self) -> List[Dict]:
+        """
+        O'chirilgan tovarlar (eksport/migratsiya uchun)
+
+        Returns:
+            List[Dict]: Tovarlar ('deleted_at' bilan, ID bo'yicha)
+        """
+        rows = self._query(f"SELECT * FROM product_rows WHERE NOT {LIVE} ORDER BY id")
+        return [_product_row(row) for row in rows]
+
+    def get_available_products(self) -> List[Dict]:
+        """
+        Faqat mavjud tovarlarni olish
+
+        Returns:
+            List[Dict]: Mavjud tovarlar ro'yxati
+        """
+        rows = self._query(f"SELECT * FROM product_rows WHERE is_available = 1 AND {LIVE} ORDER BY id")
+        return [_product_row(row) for row in rows]
+
+    def get_random_products(self, count: int = 3) -> List[Dict]:
+        """
+        Random tovarlarni olish (avtomatik post uchun)
+
+        Args:
+            count: Tovarlar soni
+
+        Returns:
+            List[Dict]: Random tovarlar
+        """
+        rows = self._query(
+            f"SELECT * FROM product_rows WHERE is_available = 1 AND {LIVE} ORDER BY RANDOM() LIMIT ?",
+            (count,)
+        )
+
+        if not rows:
+            logger.warning("⚠️ Mavjud tovarlar yo'q")
+
+        return [_product_row(row) for row in rows]
+
+    def update_product(self, product_id: int, **kwargs) -> bool:
+        """
+        Tovarni yangilash
+
+        Args:
+            product_id: Tovar ID
+            **kwargs: Yangilanadigan maydonlar (category - kategoriya nomi)
+
+        Returns:
+            bool: Muvaffaqiyatli bo'lsa True
+        """
+        category = kwargs.pop('category', None)
+        fields = {k: v for k, v in kwargs.items() if k in PRODUCT_FIELDS}
+        unknown = set(kwargs) - set(fields)
+        if unknown:
+            logger.warning(f"⚠️ Noma'lum maydonlar e'tiborsiz qoldirildi: {', '.join(sorted(unknown))}")
+
+        if not fields and category is None:
+            return self.get_product(product_id) is not None
+
+        with self._lock, self._conn:
+            if category is not None:
+                fields['category_id'] = self._category_id(category)
+            assignments = ", ".join(f"{field} = ?" for field in fields)
+            cursor = self._conn.execute(
+                f"UPDATE products SET {assignments} WHERE id = ? AND {LIVE}",
+                (*fields.values(), product_id)
+            )
+
+        if cursor.rowcount == 0:
+            logger.warning(f"⚠️ Tovar topilmadi: ID {product_id}")
+            return False
+
+        logger.info(f"✅ Tovar yangilandi: ID {product_id}")
+        return True
+
+    def delete_product(self, product_id: int) -> bool:
+        """
+        Tovarni o'chirish
+
+        Qator o'chirilmaydi, deleted_at belgilanadi - barcha o'qishlar
+        uni o'tkazib yuboradi, buyurtmalar tarixi esa tovarni ko'rsatadi.
+
+        Args:
+            product_id: Tovar ID
+
+        Returns:
+            bool: Muvaffaqiyatli bo'lsa True
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                f"UPDATE products SET deleted_at = ? WHERE id = ? AND {LIVE}",
+                (datetime.now().strftime('%Y-%m-%d %H:%M:%S'), product_id)
+            )
+
+        if cursor.rowcount == 0:
+            logger.warning(f"⚠️ Tovar topilmadi: ID {product_id}")
+            return False
+
+        logger.info(f"✅ Tovar o'chirildi: ID {product_id}")
+        return True
+
+    def toggle_product_availability(self, product_id: int) -> bool:
+        """
+        Tovar mavjudligini o'zgartirish
+
+        Args:
+            product_id: Tovar ID
+
+        Returns:
+            bool: Muvaffaqiyatli bo'lsa True
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                f"UPDATE products SET is_available = 1 - is_available WHERE id = ? AND {LIVE}",
+                (product_id,)
+            )
+            if cursor.rowcount == 0:
+                logger.warning(f"⚠️ Tovar topilmadi: ID {product_id}")
+                return False
+
+            row = self._conn.execute(
+                "SELECT is_available FROM products WHERE id = ?", (product_id,)
+            ).fetchone()
+
+        status = "Mavjud" if row['is_available'] else "Mavjud emas"
+        logger.info(f"✅ Tovar mavjudligi o'zgartirildi: ID {product_id} -> {status}")
+        return True
+
+    # ==================== CATALOG ====================
+
+    def current_catalog(self) -> Optional[CatalogSnapshot]:
+        """
+        Tayyor katalog snapshoti - qulfsiz, so'rovsiz
+
+        Shu ulanish orqali hech narsa yozilmagan va snapshot oxirgi
+        config.DB_RECHECK_INTERVAL_MS ichida tekshirilgan bo'lsa qaytariladi.
+
+        Returns:
+            Optional[CatalogSnapshot]: Snapshot yoki None (catalog() kerak)
+        """
+        snapshot = self._catalog
+        if snapshot is not None and self._conn.total_changes == self._catalog_changes and \
+                time.monotonic() - self._catalog_checked < config.DB_RECHECK_INTERVAL_MS / 1000:
+            return snapshot
+        return None
+
+    def catalog(self) -> CatalogSnapshot:
+        """
+        Katalogning o'zgarmas snapshoti (JSONDatabase.catalog bilan bir xil)
+
+        Snapshot versiyasi - catalog_version jadvali (triggerlar oshiradi),
+        shuning uchun boshqa jarayonning o'zgarishi ham ko'rinadi. Versiya
+        o'zgarmagan bo'lsa, tovarlar qayta o'qilmaydi.
+
+        Returns:
+            CatalogSnapshot: Snapshot
+        """
+        snapshot = self.current_catalog()
+        if snapshot is not None:
+            return snapshot
+
+        with self._lock:
+            now = time.monotonic()
+            changes = self._conn.total_changes
+            version = self._conn.execute("SELECT version FROM catalog_version").fetchone()[0]
+
+            snapshot = self._catalog
+            if snapshot is None or snapshot.version != version:
+                snapshot = CatalogSnapshot(
+                    version,
+                    self.get_categories(),
+                    (_product_row(row) for row in self._conn.execute(
+                        f"SELECT * FROM product_rows WHERE {LIVE} ORDER BY id"
+                    ))
+                )
+                self._catalog = snapshot
+
+            self._catalog_changes = changes
+            self._catalog_checked = now
+
+        return snapshot
+
+    # ==================== ORDERS ====================
+
+    def create_order(self, user_id: int, username: str, product_id: int,
+                     customer_name: str, phone: str, address: str,
+                     quantity: int = 1, price: float = None, source: str = None) -> Dict:
+        """
+        Yangi buyurtma yaratish
+
+        Args:
+            user_id: Telegram user ID
+            username: Telegram username
+            product_id: Tovar ID
+            customer_name: Mijoz ismi
+            phone: Telefon
+            address: Manzil
+            quantity: Miqdor
+            price: Bitta tovar narxi (default: tovarning joriy narxi)
+            source: Buyurtma manbai ('post' - kanal postidagi deep link)
+
+        Returns:
+            Dict: Yaratilgan buyurtma
+        """
+        now = datetime.now()
+        order_number = f"ORD-{now.strftime('%Y%m%d%H%M%S')}-{user_id}"
+        created_at = now.strftime('%Y-%m-%d %H:%M:%S')
+
+        with self._lock, self._conn:
+            if price is None:
+                row = self._conn.execute("SELECT price FROM products WHERE id = ?", (product_id,)).fetchone()
+                price = row[0] if row else None
+
+            cursor = self._conn.execute(
+                "INSERT INTO orders (order_number, user_id, username, product_id, customer_name, "
+                "phone, address, quantity, price, status, source, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 'yangi', ?, ?)",
+                (order_number, user_id, username, product_id, customer_name,
+                 phone, address, quantity, price, source, created_at)
+            )
+
+        logger.info(f"✅ Buyurtma yaratildi: {order_number}")
+        return {
+            'id': cursor.lastrowid,
+            'order_number': order_number,
+            'user_id': user_id,
+            'username': username,
+            'product_id': product_id,
+            'customer_name': customer_name,
+            'phone': phone,
+            'address': address,
+            'quantity': quantity,
+            'price': price,
+            'status': 'yangi',
+            'source': source,
+            'created_at': created_at
+        }
+
+    def get_order(self, order_id: int) -> Optional[Dict]:
+        """
+        Buyurtmani ID bo'yicha olish
+
+        Args:
+            order_id: Buyurtma ID
+
+        Returns:
+            Optional[Dict]: Buyurtma yoki None
+        """
+        rows = self._query("SELECT * FROM orders WHERE id = ?", (order_id,))
+        return dict(rows[0]) if rows else None
+
+    def get_user_orders(self, user_id: int) -> List[Dict]:
+        """
+        Foydalanuvchi buyurtmalarini olish (eng yangi birinchi)
+
+        Args:
+            user_id: Telegram user ID
+
+        Returns:
+            List[Dict]: Buyurtmalar ro'yxati
+        """
+        rows = self._query(
+            "SELECT * FROM orders WHERE user_id = ? ORDER BY created_at DESC, id DESC",
+            (user_id,)
+        )
+        return [dict(row) for row in rows]
+
+    def count_user_orders(self, user_id: int) -> int:
+        """
+        Foydalanuvchi buyurtmalari soni (user_id indeksi bo'yicha)
+
+        Args:
+            user_id: Telegram user ID
+
+        Returns:
+            int: Buyurtmalar soni
+        """
+        rows = self._query("SELECT COUNT(*) FROM orders WHERE user_id = ?", (user_id,))
+        return rows[0][0]
+
+    def get_all_orders(self) -> List[Dict]:
+        """
+        Barcha buyurtmalarni olish (eng yangi birinchi)
+
+        Returns:
+            List[Dict]: Buyurtmalar ro'yxati
+        """
+        rows = self._query("SELECT * FROM orders ORDER BY created_at DESC, id DESC")
+        return [dict(row) for row in rows]
+
+    def get_orders(self, since: str = None, until: str = None,
+                   limit: int = None) -> List[Dict]:
+        """
+        Vaqt oralig'idagi buyurtmalar (eng yangi birinchi)
+
+        Args:
+            since: Boshlanish vaqti 'YYYY-MM-DD HH:MM:SS' (shu jumladan)
+            until: Tugash vaqti 'YYYY-MM-DD HH:MM:SS' (shu jumladan)
+            limit: Maksimal soni
+
+        Returns:
+            List[Dict]: Buyurtmalar ro'yxati
+        """
+        sql = "SELECT * FROM orders WHERE created_at >= ? AND created_at <= ? " \
+              "ORDER BY created_at DESC, id DESC LIMIT ?"
+        rows = self._query(sql, (since or '', until or '\uffff', -1 if limit is None else limit))
+        return [dict(row) for row in rows]
+
+    def count_orders(self, since: str = None, until: str = None) -> int:
+        """
+        Vaqt oralig'idagi buyurtmalar soni (created_at indeksi bo'yicha)
+
+        Args:
+            since: Boshlanish vaqti 'YYYY-MM-DD HH:MM:SS' (shu jumladan)
+            until: Tugash vaqti 'YYYY-MM-DD HH:MM:SS' (shu jumladan)
+
+        Returns:
+            int: Buyurtmalar soni
+        """
+        rows = self._query(
+            "SELECT COUNT(*) FROM orders WHERE created_at >= ? AND created_at <= ?",
+            (since or '', until or '\uffff')
+        )
+        return rows[0][0]
+
+    def query_orders(self, status: str = None, user_id: int = None,
+                     since: str = None, until: str = None,
+                     limit: int = 20, cursor: str = None) -> Dict:
+        """
+        Buyurtmalarni sahifalab olish (JSONDatabase.query_orders bilan bir xil)
+
+        (created_at, id) bo'yicha keyset sahifalash - OFFSET ishlatilmaydi,
+        status va user_id filtrlari mavjud indekslardan foydalanadi.
+
+        Args:
+            status: Faqat shu statusdagilar
+            user_id: Faqat shu foydalanuvchiniki
+            since: Boshlanish vaqti 'YYYY-MM-DD HH:MM:SS' (shu jumladan)
+            until: Tugash vaqti 'YYYY-MM-DD HH:MM:SS' (shu jumladan)
+            limit: Sahifa hajmi
+            cursor: Oldingi javobdagi 'next' yoki 'prev' (None - birinchi sahifa)
+
+        Returns:
+            Dict: {'orders': [...], 'next': kursor yoki None, 'prev': kursor yoki None}
+
+        Raises:
+            ValueError: Kursor noto'g'ri bo'lsa
+        """
+        conditions, params = ["created_at >= ?", "created_at <= ?"], [since or '', until or '\uffff']
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(str(status))
+        if user_id is not None:
+            conditions.append("user_id = ?")
+            params.append(user_id)
+
+        direction, start = 'n', None
+        if cursor:
+            try:
+                direction, (created_at, order_id) = cursor[0], cursor[1:].rsplit('|', 1)
+                start = (created_at, int(order_id))
+            except ValueError as e:
+                raise ValueError(f"Noto'g'ri kursor: {cursor!r}") from e
+            if direction not in 'np':
+                raise ValueError(f"Noto'g'ri kursor: {cursor!r}")
+            conditions.append("(created_at, id) < (?, ?)" if direction == 'n' else "(created_at, id) > (?, ?)")
+            params.extend(start)
+
+        order = "DESC" if direction == 'n' else "ASC"
+        rows = self._query(
+            f"SELECT * FROM orders WHERE {' AND '.join(conditions)} "
+            f"ORDER BY created_at {order}, id {order} LIMIT ?",
+            (*params, limit + 1)
+        )
+
+        more = len(rows) > limit
+        page = [dict(row) for row in rows[:limit]]
+        if direction == 'p':
+            page.reverse()
+        if not page:
+            return {'orders': [], 'next': None, 'prev': None}
+
+        has_older = more if direction == 'n' else True
+        has_newer = (start is not None) if direction == 'n' else more
+        return {
+            'orders': page,
+            'next': f"n{page[-1]['created_at']}|{page[-1]['id']}" if has_older else None,
+            'prev': f"p{page[0]['created_at']}|{page[0]['id']}" if has_newer else None,
+        }
+
+    def next_order(self, status: str = OrderStatus.NEW, skip: int = None) -> Optional[Dict]:
+        """
+        Navbatdagi buyurtma (JSONDatabase.next_order bilan bir xil) -
+        (status, created_at) indeksi bo'yicha
+
+        Args:
+            status: Navbat statusi (default: yangi)
+            skip: Shu buyurtmadan tashqari (ko'rilayotgan buyurtma)
+
+        Returns:
+            Optional[Dict]: Buyurtma yoki None (navbat bo'sh)
+        """
+        rows = self._query(
+            "SELECT * FROM orders WHERE status = ? AND id IS NOT ? "
+            "ORDER BY created_at, id LIMIT 1",
+            (str(status), skip)
+        )
+        return dict(rows[0]) if rows else None
+
+    def iter_orders(self, since: str = None, until: str = None,
+                    batch_size: int = 1000) -> Iterator[List[Dict]]:
+        """
+        Buyurtmalarni qismlab berish (eng eskisi birinchi)
+
+        Har bir qism alohida so'rov (created_at, id bo'yicha keyset), qulf
+        qismlar orasida bo'shatiladi.
+
+        Args:
+            since: Boshlanish vaqti 'YYYY-MM-DD HH:MM:SS' (shu jumladan)
+            until: Tugash vaqti 'YYYY-MM-DD HH:MM:SS' (shu jumladan)
+            batch_size: Bitta qismdagi buyurtmalar soni
+
+        Yields:
+            List[Dict]: Buyurtmalar
+        """
+        sql = "SELECT * FROM orders WHERE (created_at, id) > (?, ?) AND created_at <= ? " \
+              "ORDER BY created_at, id LIMIT ?"
+        cursor = (since or '', -1)
+        while True:
+            rows = self._query(sql, (*cursor, until or '\uffff', batch_size))
+            if not rows:
+                return
+            cursor = (rows[-1]['created_at'], rows[-1]['id'])
+            yield [dict(row) for row in rows]
+
+    def get_order_status_counts(self) -> Dict[str, int]:
+        """
+        Statuslar bo'yicha buyurtmalar soni
+
+        Returns:
+            Dict[str, int]: status -> soni
+        """
+        rows = self._query("SELECT status, COUNT(*) FROM orders GROUP BY status")
+        return {row[0]: row[1] for row in rows}
+
+    def get_statistics(self) -> Dict:
+        """
+        Admin panel statistikasi (JSONDatabase.get_statistics bilan bir xil ko'rinishda)
+
+        Returns:
+            Dict: {'products', 'available_products', 'unavailable_products',
+                'categories', 'orders', 'order_statuses': {status: soni}, 'users'}
+        """
+        with self._lock:
+            products, available, categories, users = self._conn.execute(
+                f"SELECT (SELECT COUNT(*) FROM products WHERE {LIVE}), "
+                f"(SELECT COUNT(*) FROM products WHERE is_available = 1 AND {LIVE}), "
+                f"(SELECT COUNT(*) FROM categories WHERE {LIVE}), "
+                "(SELECT COUNT(*) FROM users)"
+            ).fetchone()
+            order_statuses = self.get_order_status_counts()
+
+        return {
+            'products': products,
+            'available_products': available,
+            'unavailable_products': products - available,
+            'categories': categories,
+            'orders': sum(order_statuses.values()),
+            'order_statuses': order_statuses,
+            'users': users,
+        }
+
+    def update_order_status(self, order_id: int, status: str) -> bool:
+        """
+        Buyurtma statusini yangilash
+
+        Args:
+            order_id: Buyurtma ID
+            status: Yangi status
+
+        Returns:
+            bool: Muvaffaqiyatli bo'lsa True
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE orders SET status = ? WHERE id = ?", (status, order_id)
+            )
+
+        if cursor.rowcount == 0:
+            logger.warning(f"⚠️ Buyurtma topilmadi: ID {order_id}")
+            return False
+
+        logger.info(f"✅ Buyurtma statusi o'zgartirildi: ID {order_id} -> {status}")
+        return True
+
+    # ==================== SALES ====================
+
+    def record_post_event(self, event: str):
+        """
+        Avtomatik post hodisasini hisoblash (konversiya uchun)
+
+        Args:
+            event: "posted" yoki "opened"
+        """
+        if event not in sales.POST_EVENTS:
+            raise ValueError(f"Noma'lum post hodisasi: {event}")
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO post_events (day, event, count) VALUES (?, ?, 1) "
+                "ON CONFLICT (day, event) DO UPDATE SET count = count + 1",
+                (datetime.now().strftime('%Y-%m-%d'), event)
+            )
+
+    def get_sales_report(self, days: int = 30) -> Dict:
+        """
+        Savdo hisoboti (JSONDatabase.get_sales_report bilan bir xil ko'rinishda)
+
+        Alohida ko'rinish saqlanmaydi: kunlik hisob created_at indeksi
+        bo'yicha, tovarlar hisobi esa GROUP BY bilan olinadi.
+
+        Args:
+            days: Kunlik hisob necha kun uchun
+
+        Returns:
+            Dict: database.sales.report() natijasi
+        """
+        since = (datetime.now() - timedelta(days=days - 1)).strftime('%Y-%m-%d')
+        active = f"o.status != '{OrderStatus.CANCELLED.value}'"
+        revenue = f"SUM(CASE WHEN {active} THEN o.quantity * COALESCE(o.price, p.price, 0) ELSE 0 END)"
+        view = sales.empty()
+
+        day_rows = self._query(
+            f"SELECT substr(o.created_at, 1, 10) AS day, "
+            f"SUM({active}), SUM(CASE WHEN {active} THEN o.quantity ELSE 0 END), {revenue}, "
+            f"SUM(NOT {active}), SUM({active} AND o.source IS ?) "
+            f"FROM orders o LEFT JOIN products p ON p.id = o.product_id "
+            f"WHERE o.created_at >= ? GROUP BY day",
+            (sales.POST_SOURCE, since)
+        )
+        for day, orders, quantity, day_revenue, cancelled, post_orders in day_rows:
+            view['days'][day] = {
+                'orders': orders, 'quantity': quantity, 'revenue': day_revenue,
+                'cancelled': cancelled, 'posted': 0, 'opened': 0, 'post_orders': post_orders
+            }
+
+        for day, event, count in self._query(
+                "SELECT day, event, count FROM post_events WHERE day >= ?", (since,)):
+            view['days'].setdefault(day, {
+                'orders': 0, 'quantity': 0, 'revenue': 0, 'cancelled': 0,
+                'posted': 0, 'opened': 0, 'post_orders': 0
+            })[event] = count
+
+        product_rows = self._query(
+            f"SELECT o.product_id, SUM({active}), "
+            f"SUM(CASE WHEN {active} THEN o.quantity ELSE 0 END), {revenue} "
+            f"FROM orders o LEFT JOIN products p ON p.id = o.product_id "
+            f"GROUP BY o.product_id HAVING SUM({active}) > 0"
+        )
+        for product_id, orders, quantity, product_revenue in product_rows:
+            view['products'][str(product_id)] = {'orders': orders, 'quantity': quantity, 'revenue': product_revenue}
+
+        products_by_id = {
+            row['id']: _product_row(row)
+            for row in self._query(
+                f"SELECT * FROM product_rows WHERE id IN (SELECT product_id FROM orders) AND {LIVE}"
+            )
+        }
+
+        return sales.report(view, products_by_id, days)
+
+    # ==================== USERS ====================
+
+    def add_user(self, user_id: int, username: str = None,
+                 first_name: str = None, last_name: str = None) -> Dict:
+        """
+        Foydalanuvchi qo'shish yoki yangilash
+
+        Profili o'zgarmagan foydalanuvchi uchun yozish tranzaksiyasi ochilmaydi.
+
+        Args:
+            user_id: Telegram user ID
+            username: Username (ixtiyoriy)
+            first_name: Ism (ixtiyoriy)
+            last_name: Familiya (ixtiyoriy)
+
+        Returns:
+            Dict: Foydalanuvchi ma'lumotlari
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM users WHERE user_id = ?", (user_id,)).fetchone()
+            if row is not None and (row['username'], row['first_name'], row['last_name']) \
+                    == (username, first_name, last_name):
+                return _user_row(row)
+
+            with self._conn:
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE users SET username = ?, first_name = ?, last_name = ? WHERE user_id = ?",
+                        (username, first_name, last_name, user_id)
+                    )
+                else:
+                    # Yangi foydalanuvchi qo'shish
+                    self._conn.execute(
+                        "INSERT INTO users (user_id, username, first_name, last_name, is_blocked, created_at) "
+                        "VALUES (?, ?, ?, ?, 0, ?)",
+                        (user_id, username, first_name, last_name,
+                         datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+                    )
+                    logger.info(f"✅ Yangi foydalanuvchi: {user_id} (@{username})")
+
+            row = self._conn.execute("SELECT * FROM users WHERE user_id = ?", (user_id,)).fetchone()
+
+        return _user_row(row)
+
+    def get_all_users(self) -> List[Dict]:
+        """
+        Barcha foydalanuvchilarni olish
+
+        Returns:
+            List[Dict]: Foydalanuvchilar ro'yxati
+        """
+        return [_user_row(row) for row in self._query("SELECT * FROM users ORDER BY rowid")]
+
+    def get_users(self, since: str = None, until: str = None, limit: int = None) -> List[Dict]:
+        """
+        Vaqt oralig'ida ro'yxatdan o'tgan foydalanuvchilar (created_at indeksi bo'yicha)
+
+        Args:
+            since: Boshlanish vaqti 'YYYY-MM-DD HH:MM:SS' (shu jumladan)
+            until: Tugash vaqti 'YYYY-MM-DD HH:MM:SS' (shu jumladan)
+            limit: Maksimal soni
+
+        Returns:
+            List[Dict]: Foydalanuvchilar (eng yangisi birinchi)
+        """
+        rows = self._query(
+            "SELECT * FROM users WHERE created_at >= ? AND created_at <= ? "
+            "ORDER BY created_at DESC, user_id DESC LIMIT ?",
+            (since or '', until or '\uffff', -1 if limit is None else limit)
+        )
+        return [_user_row(row) for row in rows]
+
+    def count_users(self, since: str = None, until: str = None) -> int:
+        """
+        Vaqt oralig'ida ro'yxatdan o'tgan foydalanuvchilar soni
+
+        Args:
+            since: Boshlanish vaqti 'YYYY-MM-DD HH:MM:SS' (shu jumladan)
+            until: Tugash vaqti 'YYYY-MM-DD HH:MM:SS' (shu jumladan)
+
+        Returns:
+            int: Foydalanuvchilar soni
+        """
+        rows = self._query(
+            "SELECT COUNT(*) FROM users WHERE created_at >= ? AND created_at <= ?",
+            (since or '', until or '\uffff')
+        )
+        return rows[0][0]
+
+    def iter_users(self, batch_size: int = 1000) -> Iterator[List[Dict]]:
+        """
+        Foydalanuvchilarni qismlab berish (ro'yxatdan o'tish tartibida)
+
+        Args:
+            batch_size: Bitta qismdagi foydalanuvchilar soni
+
+        Yields:
+            List[Dict]: Foydalanuvchilar
+        """
+        last_rowid = 0
+        while True:
+            rows = self._query(
+                "SELECT rowid, * FROM users WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                (last_rowid, batch_size)
+            )
+            if not rows:
+                return
+            last_rowid = rows[-1]['rowid']
+            batch = []
+            for row in rows:
+                user = _user_row(row)
+                del user['rowid']
+                batch.append(user)
+            yield batch
+
+    def get_users_count(self) -> int:
+        """
+        Foydalanuvchilar sonini olish
+
+        Returns:
+            int: Foydalanuvchilar soni
+        """
+        return self._query("SELECT COUNT(*) FROM users")[0][0]
@@ -0,0 +1,410 @@
+"""
+Fayl darajasidagi saqlash yordamchilari
+Atomik yozish, group commit (bir nechta yozishni bitta fsync ga birlashtirish)
+va jarayonlararo qulf
+"""
+
+import os
+import tempfile
+import threading
+import time
+import logging
+from typing import Dict, List, Optional, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: jarayonlararo qulf yo'q, bot bitta jarayonda ishlashi kerak
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Jarayon umask i (yangi fayllar huquqlari uchun). os.umask faqat
+# o'rnatish orqali o'qiladi - import paytida, oqimlar hali yo'qligida
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+class DatabaseError(Exception):
+    """Ma'lumotlar faylini o'qib yoki yozib bo'lmaganda"""
+
+
+def _fsync_dir(dirpath: str):
+    """
+    Papkani fsync qilish - rename natijasi diskka tushishi uchun
+    (Windowsda papkani ochib bo'lmaydi, u yerda o'tkazib yuboriladi)
+
+    Args:
+        dirpath: Papka yo'li
+    """
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+
+    fd = os.open(dirpath or '.', os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _file_mode(filepath: str) -> int:
+    """
+    Almashtiriladigan fayl huquqlari: mavjud faylniki yoki open() yaratadigan
+    odatiy huquqlar (0o666 & ~umask). mkstemp 0600 bilan yaratadi va rename
+    uni saqlab qoladi - boshqa foydalanuvchidagi jarayonlar (alohida
+    scheduler yoki worker) fayllarni o'qiy olmay qoladi.
+
+    Args:
+        filepath: Fayl yo'li
+
+    Returns:
+        int: Huquqlar (masalan, 0o644)
+    """
+    try:
+        return os.stat(filepath).st_mode & 0o7777
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+def atomic_write(filepath: str, payload: bytes, sync_dir: bool = True):
+    """
+    Faylni atomik almashtirish: vaqtinchalik fayl -> fsync -> rename
+
+    Jarayon istalgan joyda uzilsa ham, fayl yo eski, yo yangi holatda
+    qoladi - hech qachon yarim yozilgan bo'lmaydi.
+
+    Args:
+        filepath: Fayl yo'li
+        payload: Faylning yangi to'liq mazmuni
+        sync_dir: Rename dan keyin papkani ham fsync qilish
+    """
+    dirpath = os.path.dirname(filepath)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=dirpath or '.',
+        prefix=f".{os.path.basename(filepath)}.",
+        suffix='.tmp'
+    )
+
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            if hasattr(os, 'fchmod'):
+                os.fchmod(f.fileno(), _file_mode(filepath))
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    if sync_dir:
+        _fsync_dir(dirpath)
+
+
+def durable_append(filepath: str, payload: bytes):
+    """
+    Fayl oxiriga qo'shish va fsync qilish
+
+    Args:
+        filepath: Fayl yo'li
+        payload: Qo'shiladigan baytlar
+    """
+    with open(filepath, 'ab') as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+class _PendingFile:
+    """Bitta fayl uchun hali yozilmagan o'zgarishlar"""
+
+    __slots__ = ('base', 'appends')
+
+    def __init__(self):
+        # Faylning yangi to'liq mazmuni (None - fayl almashtirilmaydi)
+        self.base: Optional[bytes] = None
+        # base dan keyin (yoki mavjud fayl oxiriga) qo'shiladigan qismlar
+        self.appends: List[bytes] = []
+
+
+class GroupCommitter:
+    """
+    Group commit - bir vaqtda kelgan yozishlarni bitta diskka yozishga birlashtirish
+
+    Har bir yozuvchi o'zgarishini navbatga qo'yadi (submit) va u diskka
+    tushishini kutadi (wait). Kutayotganlardan biri "lider" bo'lib, shu
+    paytgacha to'plangan barcha o'zgarishlarni yozadi va fsync qiladi;
+    qolganlar shunchaki natijani kutadi. Bitta faylga bir paket ichida
+    kelgan bir nechta almashtirishdan faqat oxirgisi yoziladi.
+
+    Fayllar oxirgi o'zgarish navbatga qo'yilgan tartibda yoziladi, shuning
+    uchun "avval snapshot, keyin jurnalni tozalash" kabi ketma-ketliklar
+    saqlanib qoladi.
+    """
+
+    def __init__(self, window_ms: float = 0):
+        """
+        Args:
+            window_ms: Parallel yozuvchilar bo'lganda lider qo'shimcha
+                o'zgarishlarni kutadigan vaqt (millisekund)
+        """
+        self._window = window_ms / 1000
+        self._cond = threading.Condition()
+        self._pending: Dict[str, _PendingFile] = {}
+        # To'planayotgan paket raqami va oxirgi yozilgan paket
+        self._batch = 1
+        self._committed = 0
+        self._leader_active = False
+        # Navbatga qo'yib, hali natijasini olmagan yozuvchilar soni
+        self._inflight = 0
+        # paket -> yozib bo'lmagan fayllar
+        self._failures: Dict[int, Set[str]] = {}
+
+    def submit(self, filepath: str, payload: bytes, append: bool = False) -> Tuple[int, str]:
+        """
+        O'zgarishni navbatga qo'yish (diskka yozilishini kutmasdan)
+
+        Args:
+            filepath: Fayl yo'li
+            payload: Faylning to'liq mazmuni yoki qo'shiladigan qism
+            append: True bo'lsa fayl oxiriga qo'shiladi
+
+        Returns:
+            Tuple[int, str]: wait() uchun chipta
+        """
+        with self._cond:
+            pending = self._pending.pop(filepath, None) or _PendingFile()
+            if append:
+                pending.appends.append(payload)
+            else:
+                pending.base = payload
+                pending.appends = []
+            # Oxirga ko'chirish - yozish tartibi oxirgi o'zgarish tartibi bo'yicha
+            self._pending[filepath] = pending
+            self._inflight += 1
+            return self._batch, filepath
+
+    def wait(self, ticket: Tuple[int, str]) -> bool:
+        """
+        Navbatga qo'yilgan o'zgarish diskka tushishini kutish
+
+        Args:
+            ticket: submit() qaytargan chipta
+
+        Returns:
+            bool: Muvaffaqiyatli yozilgan bo'lsa True
+        """
+        batch, filepath = ticket
+
+        with self._cond:
+            while self._committed < batch:
+                if not self._leader_active:
+                    self._leader_active = True
+                    break
+                self._cond.wait()
+            else:
+                self._inflight -= 1
+                return filepath not in self._failures.get(batch, ())
+
+        # Lider: to'plangan paketni yozish
+        failures: Set[str] = set()
+        batch_no = batch
+        try:
+            if self._window and self._inflight > 1:
+                time.sleep(self._window)
+
+            with self._cond:
+                pending = self._pending
+                self._pending = {}
+                batch_no = self._batch
+                self._batch += 1
+
+            failures = self._flush(pending)
+        finally:
+            with self._cond:
+                self._committed = batch_no
+                self._failures[batch_no] = failures
+                self._failures.pop(batch_no - 16, None)
+                self._leader_active = False
+                self._inflight -= 1
+                self._cond.notify_all()
+
+        return filepath not in failures
+
+    def write(self, filepath: str, payload: bytes, append: bool = False) -> bool:
+        """
+        submit() + wait()
+
+        Args:
+            filepath: Fayl yo'li
+            payload: Faylning to'liq mazmuni yoki qo'shiladigan qism
+            append: True bo'lsa fayl oxiriga qo'shiladi
+
+        Returns:
+            bool: Muvaffaqiyatli yozilgan bo'lsa True
+        """
+        return self.wait(self.submit(filepath, payload, append=append))
+
+    @staticmethod
+    def _flush(pending: Dict[str, _PendingFile]) -> Set[str]:
+        """
+        Paketdagi barcha fayllarni diskka yozish
+
+        Args:
+            pending: fayl -> o'zgarishlar
+
+        Returns:
+            Set[str]: Yozib bo'lmagan fayllar
+        """
+        failures: Set[str] = set()
+        dirs: Set[str] = set()
+
+        for filepath, changes in pending.items():
+            if failures:
+                # Keyingi o'zgarishlar oldingilariga tayanishi mumkin
+                # (masalan, snapshot -> jurnalni tozalash), shuning uchun
+                # xatolikdan keyin paketning qolgan qismi yozilmaydi
+                failures.add(filepath)
+                continue
+
+            try:
+                if changes.base is not None:
+                    atomic_write(filepath, changes.base + b"".join(changes.appends), sync_dir=False)
+                    dirs.add(os.path.dirname(filepath))
+                elif changes.appends:
+                    durable_append(filepath, b"".join(changes.appends))
+            except Exception as e:
+                logger.error(f"❌ Faylga yozishda xatolik ({filepath}): {e}")
+                failures.add(filepath)
+
+        # Bir papkadagi barcha rename lar uchun bitta fsync
+        for dirpath in dirs:
+            try:
+                _fsync_dir(dirpath)
+            except OSError as e:
+                logger.warning(f"⚠️ Papkani fsync qilib bo'lmadi ({dirpath}): {e}")
+
+        return failures
+
+
+class ProcessLock:
+    """
+    Bir nechta jarayon (masalan, bot va alohida scheduler) bitta data/
+    papka bilan ishlashi uchun qulf va avlod (generation) hisoblagichi
+
+    Qulf fcntl.flock orqali olinadi: o'qishlar - umumiy (shared),
+    o'zgartirishlar - eksklyuziv. Jarayon ichidagi oqimlar qulfni
+    birgalikda ushlaydi (hisoblagich bilan): birinchi oqim uni oladi,
+    oxirgisi bo'shatadi. Shuning uchun group commit buzilmaydi - qulf
+    navbatdagi barcha yozishlar diskka tushgandan keyin bo'shatiladi.
+
+    Qulf fayli ichida avlod raqami turadi. Ma'lumotlarni o'zgartirgan
+    jarayon qulfni bo'shatishdan oldin uni oshiradi; qulfni olgan jarayon
+    esa raqamni o'qib, boshqa jarayon biror narsa yozganmi - shuni
+    aniqlaydi. Raqam o'zgarmagan bo'lsa kesh fayllarni tekshirmasdan
+    ishlatiladi.
+    """
+
+    _WIDTH = 20
+
+    def __init__(self, filepath: str):
+        """
+        Args:
+            filepath: Qulf va avlod fayli (hech qachon almashtirilmaydi,
+                faqat joyida yoziladi - aks holda qulf boshqa faylda qoladi)
+        """
+        self._filepath = filepath
+        self._file = self._open()
+        self._mutex = threading.Lock()
+        # Qulfni ushlab turgan oqimlar (ichma-ich chaqiruvlar bilan)
+        self._holders = 0
+        self._exclusive = False
+        # Shu jarayon oxirgi ko'rgan avlod
+        self._generation = self._read_generation()
+        # Qulf ushlanganda ma'lumotlar o'zgartirildimi
+        self._changed = False
+
+        if hasattr(os, 'register_at_fork'):
+            # fork qilingan jarayon ota-jarayon bilan bitta flock ni bo'lishmasin
+            os.register_at_fork(after_in_child=self._reopen)
+
+    def _open(self):
+        fd = os.open(self._filepath, os.O_RDWR | os.O_CREAT, 0o644)
+        return os.fdopen(fd, 'r+b', buffering=0)
+
+    def _reopen(self):
+        self._file.close()
+        self._file = self._open()
+        self._mutex = threading.Lock()
+        self._holders = 0
+        self._exclusive = False
+        self._changed = False
+
+    def acquire(self, exclusive: bool = False) -> bool:
+        """
+        Qulfni olish (kerak bo'lsa boshqa jarayon bo'shatishini kutib)
+
+        Args:
+            exclusive: True - o'zgartirish uchun, False - o'qish uchun
+
+        Returns:
+            bool: Shu jarayon oxirgi marta qulfni ushlagandan beri boshqa
+                jarayon ma'lumotlarni o'zgartirgan bo'lsa True
+        """
+        with self._mutex:
+            if self._holders and (self._exclusive or not exclusive):
+                self._holders += 1
+                return False
+
+            # Birinchi oluvchi yoki umumiy qulfni eksklyuzivga ko'tarish
+            # (flock ko'tarishda qulfni bir lahza bo'shatadi - avlod qayta o'qiladi)
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            self._holders += 1
+            self._exclusive = exclusive
+
+            generation = self._read_generation()
+            changed = generation != self._generation
+            self._generation = generation
+            return changed
+
+    def release(self):
+        """
+        Qulfni bo'shatish - oxirgi oluvchi ma'lumotlar o'zgargan bo'lsa
+        avlodni oshiradi va flock ni bo'shatadi
+        """
+        with self._mutex:
+            self._holders -= 1
+            if self._holders:
+                return
+
+            if self._changed:
+                self._changed = False
+                self._generation += 1
+                self._write_generation(self._generation)
+
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._exclusive = False
+
+    def mark_changed(self):
+        """
+        Qulf ostida fayllar o'zgartirildi - bo'shatishda avlod oshiriladi
+        """
+        self._changed = True
+
+    def _read_generation(self) -> int:
+        self._file.seek(0)
+        raw = self._file.read(self._WIDTH)
+        try:
+            return int(raw)
+        except ValueError:
+            return 0
+
+    def _write_generation(self, generation: int):
+        # Qat'iy uzunlikdagi yozuv - faylni qisqartirish shart emas
+        self._file.seek(0)
+        self._file.write(f"{generation:0{self._WIDTH}d}".encode())
@@ -9,7 +9,7 @@ from aiogram.fsm.state import State, StatesGroup
 import asyncio
 
 from keyboars.admin_kb import get_admin_main_menu
-from database.json_db import db
+from database.async_db import adb
 from middlewares.admin_check import AdminFilter
 
 router = Router()
@@ -26,7 +26,7 @@ async def start_broadcast(message: Message, state: FSMContext):
     """Xabar yuborishni boshlash"""
     await state.set_state(BroadcastState.waiting_for_message)
 
-    users_count = db.get_users_count()
+    users_count = await adb.get_users_count()
 
     await message.answer(
         f"📢 <b>Xabar yuborish</b>\n\n"
@@ -53,9 +53,10 @@ async def cancel_broadcast(message: Message, state: FSMContext):
 @router.message(BroadcastState.waiting_for_message)
 async def process_broadcast(message: Message, state: FSMContext):
     """Xabarni barcha userlarga yuborish"""
-    users = db.get_all_users()
+    # Foydalanuvchilar qismlab o'qiladi - butun ro'yxat xotiraga yuklanmaydi
+    total = await adb.get_users_count()
 
-    if not users:
+    if not total:
         await message.answer("❌ Foydalanuvchilar yo'q")
         await state.clear()
         return
@@ -63,39 +64,44 @@ async def process_broadcast(message: Message, state: FSMContext):
     # Yuborish jarayonini boshlash
     status_msg = await message.answer(
         f"📤 Xabar yuborilmoqda...\n\n"
-        f"Jami: {len(users)}\n"
+        f"Jami: {total}\n"
         f"Yuborildi: 0\n"
         f"Xatolik: 0"
     )
 
     success_count = 0
     error_count = 0
-
-    for i, user in enumerate(users):
-        try:
-            # Xabarni nusxalash (copy_to)
-            await message.copy_to(user['user_id'])
-            success_count += 1
-
-            # Har 10 ta foydalanuvchidan keyin statusni yangilash
-            if (i + 1) % 10 == 0 or (i + 1) == len(users):
-                try:
-                    await status_msg.edit_text(
-                        f"📤 Xabar yuborilmoqda...\n\n"
-                        f"Jami: {len(users)}\n"
-                        f"Yuborildi: {success_count}\n"
-                        f"Xatolik: {error_count}\n"
-                        f"Jarayon: {((i+1)/len(users)*100):.1f}%"
-                    )
-                except:
-                    pass
-
-            # Telegram limitlarini hurmat qilish
-            await asyncio.sleep(0.05)  # 50ms kutish
-
-        except Exception as e:
-            error_count += 1
-            print(f"Xabar yuborishda xatolik ({user['user_id']}): {e}")
+    i = 0
+
+    async for users in adb.iter_users(batch_size=500):
+        for user in users:
+            i += 1
+            # Yuborish paytida qo'shilgan foydalanuvchilar ham hisobga olinadi
+            total = max(total, i)
+            try:
+                # Xabarni nusxalash (copy_to)
+                await message.copy_to(user['user_id'])
+                success_count += 1
+
+                # Har 10 ta foydalanuvchidan keyin statusni yangilash
+                if i % 10 == 0 or i == total:
+                    try:
+                        await status_msg.edit_text(
+                            f"📤 Xabar yuborilmoqda...\n\n"
+                            f"Jami: {total}\n"
+                            f"Yuborildi: {success_count}\n"
+                            f"Xatolik: {error_count}\n"
+                            f"Jarayon: {(i/total*100):.1f}%"
+                        )
+                    except:
+                        pass
+
+                # Telegram limitlarini hurmat qilish
+                await asyncio.sleep(0.05)  # 50ms kutish
+
+            except Exception as e:
+                error_count += 1
+                print(f"Xabar yuborishda xatolik ({user['user_id']}): {e}")
 
     # Yakuniy natija
     await state.clear()
@@ -104,7 +110,7 @@ async def process_broadcast(message: Message, state: FSMContext):
         await status_msg.edit_text(
             f"✅ <b>Xabar yuborish yakunlandi!</b>\n\n"
             f"📊 Natijalar:\n"
-            f"• Jami foydalanuvchilar: {len(users)}\n"
+            f"• Jami foydalanuvchilar: {i}\n"
             f"• ✅ Muvaffaqiyatli: {success_count}\n"
             f"• ❌ Xatolik: {error_count}"
         )
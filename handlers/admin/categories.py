@@ -9,7 +9,7 @@ from aiogram.fsm.state import State, StatesGroup
 
 import config
 from keyboars.admin_kb import get_categories_admin_keyboard, get_category_manage_keyboard, get_admin_main_menu
-from database.json_db import db
+from database.async_db import adb
 from middlewares.admin_check import AdminFilter
 
 router = Router()
@@ -31,7 +31,7 @@ class EditCategory(StatesGroup):
 @router.message(F.text == "📂 Kategoriyalar")
 async def categories_menu(message: Message):
     """Kategoriyalar menyusi"""
-    categories = db.get_categories()
+    categories = await adb.get_categories()
 
     text = f"""
 📂 <b>KATEGORIYALAR BOSHQARUVI</b>
@@ -50,7 +50,7 @@ Kategoriyani tanlang yoki yangi qo'shing:
 @router.callback_query(F.data == "admin_categories_menu")
 async def categories_menu_callback(callback: CallbackQuery):
     """Kategoriyalar menyusiga qaytish"""
-    categories = db.get_categories()
+    categories = await adb.get_categories()
 
     text = f"""
 📂 <b>KATEGORIYALAR BOSHQARUVI</b>
@@ -90,7 +90,7 @@ async def input_category_name(message: Message, state: FSMContext):
         return
 
     # Kategoriyani qo'shish
-    success = db.add_category(category_name)
+    success = await adb.add_category(category_name)
 
     if success:
         await message.answer(
@@ -113,7 +113,7 @@ async def manage_category(callback: CallbackQuery):
     category = callback.data.split(":", 1)[1]
 
     # Kategoriyada nechta tovar borligini aniqlash
-    products = db.get_products_by_category(category)
+    products = await adb.get_products_by_category(category)
     products_count = len(products)
 
     text = f"""
@@ -160,7 +160,7 @@ async def input_new_category_name(message: Message, state: FSMContext):
     old_name = data['old_name']
 
     # Kategoriyani yangilash
-    success = db.update_category(old_name, new_name)
+    success = await adb.update_category(old_name, new_name)
 
     if success:
         await message.answer(
@@ -184,11 +184,11 @@ async def confirm_delete_category(callback: CallbackQuery):
     category = callback.data.split(":", 1)[1]
 
     # Kategoriyada nechta tovar borligini aniqlash
-    products = db.get_products_by_category(category)
+    products = await adb.get_products_by_category(category)
     products_count = len(products)
 
     # O'chirish
-    success = db.delete_category(category)
+    success = await adb.delete_category(category)
 
     if success:
         warning = f"\n\n⚠️ {products_count} ta tovar ham o'chirildi!" if products_count > 0 else ""
@@ -199,7 +199,7 @@ async def confirm_delete_category(callback: CallbackQuery):
         await callback.answer("🗑 O'chirildi", show_alert=True)
 
         # Kategoriyalar menyusiga qaytish
-        categories = db.get_categories()
+        categories = await adb.get_categories()
         await callback.bot.send_message(
             chat_id=callback.message.chat.id,
             text=f"📂 Jami kategoriyalar: {len(categories)}",
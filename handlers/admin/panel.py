@@ -2,6 +2,8 @@
 Admin panel asosiy handlerlari
 """
 
+from datetime import datetime, timedelta
+
 from aiogram import Router, F
 from aiogram.filters import Command
 from aiogram.types import Message, CallbackQuery
@@ -10,7 +12,7 @@ from aiogram.fsm.context import FSMContext
 import config
 from keyboars.admin_kb import get_admin_main_menu, get_orders_list_keyboard, get_order_status_keyboard
 from keyboars.user_kb import get_main_menu
-from database.json_db import db
+from database.async_db import adb
 from middlewares.admin_check import AdminFilter
 
 router = Router()
@@ -42,71 +44,180 @@ async def user_mode(message: Message, state: FSMContext):
 @router.message(F.text == "📊 Statistika")
 async def show_statistics(message: Message):
     """Statistika ko'rsatish"""
-    products = db.get_all_products()
-    available_products = db.get_available_products()
-    orders = db.get_all_orders()
-    users_count = db.get_users_count()
-    categories = db.get_categories()
+    stats = await adb.get_statistics()
+
+    # Bugungi buyurtmalar va shu haftada (dushanbadan) qo'shilgan foydalanuvchilar
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    week_start = today - timedelta(days=today.weekday())
+    orders_today = await adb.count_orders(since=today.strftime('%Y-%m-%d %H:%M:%S'))
+    users_this_week = await adb.count_users(since=week_start.strftime('%Y-%m-%d %H:%M:%S'))
 
     # Statuslar bo'yicha buyurtmalar
-    new_orders = len([o for o in orders if o['status'] == 'yangi'])
-    confirmed_orders = len([o for o in orders if o['status'] == 'tasdiqlandi'])
-    delivering_orders = len([o for o in orders if o['status'] == 'yetkazilmoqda'])
-    delivered_orders = len([o for o in orders if o['status'] == 'yetkazildi'])
-    cancelled_orders = len([o for o in orders if o['status'] == 'bekor'])
+    status_counts = stats['order_statuses']
+    new_orders = status_counts.get('yangi', 0)
+    confirmed_orders = status_counts.get('tasdiqlandi', 0)
+    delivering_orders = status_counts.get('yetkazilmoqda', 0)
+    delivered_orders = status_counts.get('yetkazildi', 0)
+    cancelled_orders = status_counts.get('bekor', 0)
 
     stats_text = f"""
 📊 <b>STATISTIKA</b>
 
 📦 <b>Tovarlar:</b>
-• Jami: {len(products)}
-• Mavjud: {len(available_products)}
-• Mavjud emas: {len(products) - len(available_products)}
+• Jami: {stats['products']}
+• Mavjud: {stats['available_products']}
+• Mavjud emas: {stats['unavailable_products']}
 
-📂 <b>Kategoriyalar:</b> {len(categories)}
+📂 <b>Kategoriyalar:</b> {stats['categories']}
 
 🛒 <b>Buyurtmalar:</b>
-• Jami: {len(orders)}
+• Jami: {stats['orders']}
+• 📅 Bugun: {orders_today}
 • 🆕 Yangi: {new_orders}
 • ✅ Tasdiqlangan: {confirmed_orders}
 • 🚚 Yetkazilmoqda: {delivering_orders}
 • ✔️ Yetkazilgan: {delivered_orders}
 • ❌ Bekor qilingan: {cancelled_orders}
 
-👥 <b>Foydalanuvchilar:</b> {users_count}
+👥 <b>Foydalanuvchilar:</b> {stats['users']}
+• Shu hafta qo'shilgan: {users_this_week}
     """
 
     await message.answer(stats_text)
 
 
+@router.message(F.text == "📈 Savdo hisoboti")
+async def show_sales_report(message: Message):
+    """Savdo hisoboti: kunlik tushum, top tovarlar, kategoriyalar, postlar konversiyasi"""
+    report = await adb.get_sales_report(days=30)
+    totals = report['totals']
+
+    daily_lines = "\n".join(
+        f"• {d['day'][8:10]}.{d['day'][5:7]}: {d['orders']} ta, {d['revenue']:,.0f} so'm"
+        for d in report['days'][:7]
+    ) or "• Buyurtmalar yo'q"
+
+    product_lines = []
+    for i, product in enumerate(report['products'][:5], 1):
+        name = product['name'] or f"#{product['product_id']} (o'chirilgan)"
+        product_lines.append(f"{i}. {name} - {product['quantity']} dona, {product['revenue']:,.0f} so'm")
+    product_lines = "\n".join(product_lines) or "—"
+
+    category_lines = "\n".join(
+        f"• {c['category']}: {c['orders']} ta, {c['revenue']:,.0f} so'm"
+        for c in report['categories']
+    ) or "—"
+
+    conversion = totals['post_orders'] / totals['opened'] * 100 if totals['opened'] else 0
+
+    report_text = f"""
+📈 <b>SAVDO HISOBOTI</b>
+
+🗓 <b>Oxirgi 30 kun:</b>
+• Buyurtmalar: {totals['orders']} ta ({totals['quantity']} dona)
+• Tushum: {totals['revenue']:,.0f} so'm
+• Bekor qilingan: {totals['cancelled']} ta
+
+📅 <b>Kunlar bo'yicha:</b>
+{daily_lines}
+
+📢 <b>Kanal postlari (30 kun):</b>
+• Postlar: {totals['posted']}
+• Bot ochildi: {totals['opened']}
+• Buyurtmalar: {totals['post_orders']}
+• Konversiya: {conversion:.1f}%
+
+🏆 <b>Top tovarlar (jami):</b>
+{product_lines}
+
+📂 <b>Kategoriyalar (jami):</b>
+{category_lines}
+    """
+
+    await message.answer(report_text)
+
+
+async def _orders_page(status: str = None, cursor: str = None):
+    """
+    Buyurtmalar ro'yxatining bitta sahifasi
+
+    Args:
+        status: Status bo'limi (None - hammasi)
+        cursor: Sahifa kursori (None - eng yangi buyurtmalar)
+
+    Returns:
+        Tuple[str, InlineKeyboardMarkup]: (matn, klaviatura)
+
+    Raises:
+        ValueError: Kursor noto'g'ri bo'lsa
+    """
+    page = await adb.query_orders(status=status, cursor=cursor, limit=20)
+    counts = await adb.get_order_status_counts()
+    total = counts.get(status, 0) if status else sum(counts.values())
+
+    if status:
+        header = f"📦 Buyurtmalar ({status}): {total}"
+    else:
+        header = f"📦 Jami buyurtmalar: {total}"
+    body = "Buyurtmani tanlang:" if page['orders'] else "📭 Bu bo'limda buyurtmalar yo'q"
+
+    markup = get_orders_list_keyboard(
+        page['orders'],
+        status=status,
+        next_cursor=page['next'],
+        prev_cursor=page['prev'],
+        counts=counts
+    )
+    return f"{header}\n\n{body}", markup
+
+
 @router.message(F.text == "📦 Buyurtmalar")
 async def show_orders(message: Message):
     """Buyurtmalar ro'yxatini ko'rsatish"""
-    orders = db.get_all_orders()
-
-    if not orders:
+    if not sum((await adb.get_order_status_counts()).values()):
         await message.answer("📭 Buyurtmalar yo'q")
         return
 
-    await message.answer(
-        f"📦 Jami buyurtmalar: {len(orders)}\n\n"
-        "Buyurtmani tanlang:",
-        reply_markup=get_orders_list_keyboard(orders)
-    )
+    text, markup = await _orders_page()
+    await message.answer(text, reply_markup=markup)
 
 
-@router.callback_query(F.data.startswith("admin_order:"))
-async def show_order_detail(callback: CallbackQuery):
-    """Buyurtma tafsilotlari"""
-    order_id = int(callback.data.split(":")[1])
-    order = db.get_order(order_id)
+@router.callback_query(F.data.startswith("admin_orders:"))
+async def show_orders_page(callback: CallbackQuery):
+    """Status bo'limi yoki sahifani almashtirish"""
+    _, tab, cursor = callback.data.split(":", 2)
+    status = None if tab == 'all' else tab
 
-    if not order:
-        await callback.answer("❌ Buyurtma topilmadi", show_alert=True)
+    try:
+        text, markup = await _orders_page(status, cursor or None)
+    except ValueError:
+        await callback.answer("❌ Sahifa eskirgan, ro'yxatni qayta oching", show_alert=True)
         return
 
-    product = db.get_product(order['product_id'])
-    total_price = product['price'] * order['quantity']
+    try:
+        await callback.message.edit_text(text, reply_markup=markup)
+    except Exception:
+        # Xabar o'zgarmadi (o'sha bo'lim qayta bosildi)
+        pass
+    await callback.answer()
+
+
+async def _send_order_detail(callback: CallbackQuery, order: dict):
+    """
+    Buyurtma tafsilotlarini ko'rsatish (joriy xabar o'rnida)
+
+    Args:
+        callback: Callback query
+        order: Buyurtma
+    """
+    order_id = order['id']
+
+    # Tovar arxivdan ham olib tashlangan bo'lishi mumkin (masalan, qo'lda)
+    product = await adb.get_product(order['product_id'], include_deleted=True) or {}
+    product_name = product.get('name') or "Tovar topilmadi"
+    # Buyurtma paytidagi narx (eski buyurtmalarda - tovarning joriy narxi)
+    price = order.get('price') or product.get('price') or 0
+    total_price = price * order['quantity']
 
     status_emoji = {
         'yangi': '🆕',
@@ -123,8 +234,8 @@ async def show_order_detail(callback: CallbackQuery):
 📅 <b>Sana:</b> {order['created_at']}
 📊 <b>Status:</b> {order['status'].capitalize()}
 
-📦 <b>Tovar:</b> {product['name']}
-💰 <b>Narxi:</b> {product['price']:,.0f} so'm
+📦 <b>Tovar:</b> {product_name}
+💰 <b>Narxi:</b> {price:,.0f} so'm
 🔢 <b>Miqdor:</b> {order['quantity']}
 💵 <b>Jami:</b> {total_price:,.0f} so'm
 
@@ -151,11 +262,51 @@ async def show_order_detail(callback: CallbackQuery):
                 reply_markup=get_order_status_keyboard(order_id)
             )
     else:
-        await callback.message.edit_text(
-            order_text,
-            reply_markup=get_order_status_keyboard(order_id)
-        )
+        try:
+            await callback.message.edit_text(
+                order_text,
+                reply_markup=get_order_status_keyboard(order_id)
+            )
+        except Exception:
+            # Oldingi buyurtma rasmli edi - rasmli xabarni matnga aylantirib bo'lmaydi
+            await callback.message.delete()
+            await callback.bot.send_message(
+                chat_id=callback.message.chat.id,
+                text=order_text,
+                reply_markup=get_order_status_keyboard(order_id)
+            )
+
+
+@router.callback_query(F.data.startswith("admin_order:"))
+async def show_order_detail(callback: CallbackQuery):
+    """Buyurtma tafsilotlari"""
+    order_id = int(callback.data.split(":")[1])
+    order = await adb.get_order(order_id)
+
+    if not order:
+        await callback.answer("❌ Buyurtma topilmadi", show_alert=True)
+        return
+
+    await _send_order_detail(callback, order)
+    await callback.answer()
+
+
+@router.callback_query(F.data.startswith("admin_next_order:"))
+async def show_next_order(callback: CallbackQuery):
+    """
+    Navbatdagi yangi buyurtma (eng eskisi)
+
+    Buyurtma tafsilotlaridan bosilganda ko'rilayotgan buyurtmadan
+    boshqa eng eski yangi buyurtma ochiladi.
+    """
+    skip = callback.data.split(":", 1)[1]
+    order = await adb.next_order(skip=int(skip) if skip else None)
+
+    if not order:
+        await callback.answer("🎉 Navbatda yangi buyurtmalar yo'q", show_alert=True)
+        return
 
+    await _send_order_detail(callback, order)
     await callback.answer()
 
 
@@ -166,9 +317,9 @@ async def change_order_status(callback: CallbackQuery):
     order_id = int(parts[1])
     new_status = parts[2]
 
-    db.update_order_status(order_id, new_status)
+    await adb.update_order_status(order_id, new_status)
 
-    order = db.get_order(order_id)
+    order = await adb.get_order(order_id)
 
     # Mijozga xabar yuborish
     status_messages = {
@@ -196,13 +347,13 @@ async def change_order_status(callback: CallbackQuery):
 @router.callback_query(F.data == "admin_orders")
 async def back_to_orders(callback: CallbackQuery):
     """Buyurtmalar ro'yxatiga qaytish"""
-    orders = db.get_all_orders()
+    text, markup = await _orders_page()
 
     await callback.message.delete()
     await callback.bot.send_message(
         chat_id=callback.message.chat.id,
-        text=f"📦 Jami buyurtmalar: {len(orders)}\n\nBuyurtmani tanlang:",
-        reply_markup=get_orders_list_keyboard(orders)
+        text=text,
+        reply_markup=markup
     )
     await callback.answer()
 
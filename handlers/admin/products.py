@@ -15,7 +15,7 @@ from keyboars.admin_kb import (
     get_confirm_delete_keyboard,
     get_admin_main_menu
 )
-from database.json_db import db
+from database.async_db import adb
 from middlewares.admin_check import AdminFilter
 
 router = Router()
@@ -36,7 +36,7 @@ class AddProduct(StatesGroup):
 @router.message(F.text == "➕ Tovar qo'shish")
 async def start_add_product(message: Message, state: FSMContext):
     """Tovar qo'shishni boshlash"""
-    categories = db.get_categories()
+    categories = await adb.get_categories()
 
     if not categories:
         await message.answer(
@@ -141,7 +141,7 @@ async def input_photo(message: Message, state: FSMContext):
     data = await state.get_data()
 
     # Tovarni qo'shish
-    product = db.add_product(
+    product = await adb.add_product(
         category=data['category'],
         name=data['name'],
         description=data.get('description'),
@@ -181,7 +181,7 @@ async def input_no_photo(message: Message, state: FSMContext):
     data = await state.get_data()
 
     # Tovarni qo'shish
-    product = db.add_product(
+    product = await adb.add_product(
         category=data['category'],
         name=data['name'],
         description=data.get('description'),
@@ -207,7 +207,7 @@ async def input_no_photo(message: Message, state: FSMContext):
 @router.message(F.text == "📋 Tovarlar ro'yxati")
 async def show_products_list(message: Message):
     """Tovarlar ro'yxati"""
-    products = db.get_all_products()
+    products = await adb.get_all_products()
 
     if not products:
         await message.answer(config.MESSAGES['no_products'])
@@ -224,7 +224,7 @@ async def show_products_list(message: Message):
 async def show_product_detail(callback: CallbackQuery):
     """Tovar tafsilotlari"""
     product_id = int(callback.data.split(":")[1])
-    product = db.get_product(product_id)
+    product = await adb.get_product(product_id)
 
     if not product:
         await callback.answer("❌ Tovar topilmadi", show_alert=True)
@@ -274,7 +274,7 @@ async def show_product_detail(callback: CallbackQuery):
 async def toggle_availability(callback: CallbackQuery):
     """Mavjudlikni o'zgartirish"""
     product_id = int(callback.data.split(":")[1])
-    db.toggle_product_availability(product_id)
+    await adb.toggle_product_availability(product_id)
 
     await callback.answer("✅ Mavjudlik o'zgartirildi", show_alert=True)
 
@@ -286,7 +286,7 @@ async def toggle_availability(callback: CallbackQuery):
 async def confirm_delete_product(callback: CallbackQuery):
     """O'chirishni tasdiqlash"""
     product_id = int(callback.data.split(":")[1])
-    product = db.get_product(product_id)
+    product = await adb.get_product(product_id)
 
     if not product:
         await callback.answer("❌ Tovar topilmadi", show_alert=True)
@@ -311,11 +311,11 @@ async def confirm_delete_product(callback: CallbackQuery):
 async def delete_product(callback: CallbackQuery):
     """Tovarni o'chirish"""
     product_id = int(callback.data.split(":")[1])
-    product = db.get_product(product_id)
+    product = await adb.get_product(product_id)
     product_name = product['name'] if product else "Noma'lum"
 
     # O'chirish
-    db.delete_product(product_id)
+    await adb.delete_product(product_id)
 
     await callback.message.edit_text(
         f"✅ {config.MESSAGES['product_deleted']}\n\n"
@@ -333,7 +333,7 @@ async def delete_product(callback: CallbackQuery):
 @router.callback_query(F.data == "admin_products_list")
 async def back_to_products_list(callback: CallbackQuery):
     """Tovarlar ro'yxatiga qaytish"""
-    products = db.get_all_products()
+    products = await adb.get_all_products()
 
     await callback.message.delete()
     await callback.bot.send_message(
@@ -348,7 +348,7 @@ async def back_to_products_list(callback: CallbackQuery):
 async def change_page(callback: CallbackQuery):
     """Sahifani o'zgartirish"""
     page = int(callback.data.split(":")[1])
-    products = db.get_all_products()
+    products = await adb.get_all_products()
 
     await callback.message.edit_text(
         f"📋 Jami tovarlar: {len(products)}\n\nTovarni tanlang:",
@@ -12,7 +12,7 @@ from keyboars.user_kb import (
     get_products_keyboard,
     get_product_detail_keyboard
 )
-from database.json_db import db
+from database.async_db import adb
 
 router = Router()
 
@@ -27,7 +27,7 @@ async def show_categories(message: Message, state: FSMContext):
     await state.clear()
 
     # Kategoriyalarni olish
-    categories = db.get_categories()
+    categories = (await adb.catalog()).categories
 
     if not categories:
         await message.answer(
@@ -54,7 +54,7 @@ async def show_products_in_category(callback: CallbackQuery, state: FSMContext):
     category = callback.data.split(":", 1)[1]
 
     # Kategoriya bo'yicha tovarlarni olish
-    products = db.get_products_by_category(category)
+    products = (await adb.catalog()).products_in(category)
 
     if not products:
         await callback.answer(
@@ -85,7 +85,7 @@ async def back_to_categories(callback: CallbackQuery, state: FSMContext):
     await state.clear()
 
     # Kategoriyalarni olish
-    categories = db.get_categories()
+    categories = (await adb.catalog()).categories
 
     await callback.message.edit_text(
         f"📂 <b>Kategoriyalar</b> ({len(categories)} ta)\n\n"
@@ -103,8 +103,8 @@ async def show_product_detail(callback: CallbackQuery, state: FSMContext):
     # Tovar ID ni olish
     product_id = int(callback.data.split(":")[1])
 
-    # Tovarni bazadan olish
-    product = db.get_product(product_id)
+    # Tovarni katalogdan olish
+    product = (await adb.catalog()).product(product_id)
 
     if not product:
         await callback.answer(
@@ -203,7 +203,7 @@ async def back_to_products(callback: CallbackQuery, state: FSMContext):
 
     if category:
         # Kategoriya ma'lum bo'lsa, o'sha kategoriya tovarlarini ko'rsatish
-        products = db.get_products_by_category(category)
+        products = (await adb.catalog()).products_in(category)
 
         # Eski xabarni o'chirish
         await callback.message.delete()
@@ -217,7 +217,7 @@ async def back_to_products(callback: CallbackQuery, state: FSMContext):
         )
     else:
         # Kategoriya noma'lum bo'lsa, kategoriyalar ro'yxatiga qaytish
-        categories = db.get_categories()
+        categories = (await adb.catalog()).categories
 
         await callback.message.delete()
 
@@ -13,7 +13,7 @@ from keyboars.user_kb import (
     get_phone_keyboard,
     get_main_menu
 )
-from database.json_db import db
+from database.async_db import adb
 
 router = Router()
 
@@ -37,7 +37,7 @@ async def start_order(callback: CallbackQuery, state: FSMContext):
     product_id = int(callback.data.split(":")[1])
 
     # Tovarni tekshirish
-    product = db.get_product(product_id)
+    product = await adb.get_product(product_id)
 
     if not product:
         await callback.answer("❌ Tovar topilmadi", show_alert=True)
@@ -51,8 +51,8 @@ async def start_order(callback: CallbackQuery, state: FSMContext):
         )
         return
 
-    # Holatga tovar ID ni saqlash
-    await state.update_data(product_id=product_id)
+    # Holatga tovar ID ni saqlash (katalogdan - post orqali emas)
+    await state.update_data(product_id=product_id, source=None)
     await state.set_state(OrderForm.waiting_for_name)
 
     # Buyurtma formasi boshlanishi
@@ -347,7 +347,7 @@ async def process_quantity(message: Message, state: FSMContext):
     product_size = data.get('product_size')
 
     # Tovar ma'lumotlarini olish
-    product = db.get_product(product_id)
+    product = await adb.get_product(product_id)
 
     if not product:
         await message.answer(
@@ -438,7 +438,7 @@ async def process_payment_check(message: Message, state: FSMContext):
     payment_photo_id = message.photo[-1].file_id
 
     # Tovar ma'lumotlarini olish
-    product = db.get_product(product_id)
+    product = await adb.get_product(product_id)
 
     if not product:
         await message.answer("❌ Tovar topilmadi", reply_markup=get_main_menu())
@@ -446,14 +446,15 @@ async def process_payment_check(message: Message, state: FSMContext):
         return
 
     # Buyurtmani bazaga saqlash
-    order = db.create_order(
+    order = await adb.create_order(
         user_id=message.from_user.id,
         username=message.from_user.username or "noma'lum",
         product_id=product_id,
         customer_name=customer_name,
         phone=phone,
         address=address,
-        quantity=quantity
+        quantity=quantity,
+        source=data.get('source')
     )
 
     # Mijozga tasdiqlash
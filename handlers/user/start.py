@@ -10,7 +10,7 @@ from aiogram.fsm.context import FSMContext
 
 import config
 from keyboars.user_kb import get_main_menu, get_faq_keyboard, get_orders_history_keyboard
-from database.json_db import db
+from database.async_db import adb
 
 router = Router()
 
@@ -25,7 +25,7 @@ async def cmd_start(message: Message, state: FSMContext):
     await state.clear()
 
     # Foydalanuvchini bazaga qo'shish/yangilash
-    db.add_user(
+    await adb.add_user(
         user_id=message.from_user.id,
         username=message.from_user.username,
         first_name=message.from_user.first_name,
@@ -39,15 +39,18 @@ async def cmd_start(message: Message, state: FSMContext):
         try:
             product_id = int(args[1].replace('order_', ''))
 
+            # Kanal postidan kelganlar soni (savdo hisobotidagi konversiya uchun)
+            await adb.record_post_event('opened')
+
             # Tovarni olish
-            product = db.get_product(product_id)
+            product = await adb.get_product(product_id)
 
             if product and product.get('is_available'):
                 # To'g'ridan-to'g'ri buyurtma formasi
                 from handlers.user.order import OrderForm
                 from keyboars.user_kb import get_cancel_keyboard
 
-                await state.update_data(product_id=product_id)
+                await state.update_data(product_id=product_id, source='post')
                 await state.set_state(OrderForm.waiting_for_name)
 
                 await message.answer(
@@ -158,8 +161,9 @@ async def my_orders(message: Message):
     """
     Foydalanuvchi buyurtmalari tarixi
     """
-    # Foydalanuvchi buyurtmalarini olish
-    orders = db.get_user_orders(message.from_user.id)
+    # Oxirgi 5 ta buyurtma va jami soni (butun tarix o'qilmaydi)
+    page = await adb.query_orders(user_id=message.from_user.id, limit=5)
+    orders = page['orders']
 
     if not orders:
         await message.answer(
@@ -169,13 +173,15 @@ async def my_orders(message: Message):
         )
         return
 
+    total = await adb.count_user_orders(message.from_user.id) if page['next'] else len(orders)
+
     # Buyurtmalar haqida qisqacha ma'lumot
-    text = f"📦 <b>Sizning buyurtmalaringiz</b> ({len(orders)} ta)\n\n"
+    text = f"📦 <b>Sizning buyurtmalaringiz</b> ({total} ta)\n\n"
 
     # Oxirgi 5 ta buyurtma haqida ma'lumot
-    for order in orders[:5]:
+    for order in orders:
         # Tovar ma'lumotlarini olish
-        product = db.get_product(order['product_id'])
+        product = await adb.get_product(order['product_id'], include_deleted=True)
         product_name = product['name'] if product else "Tovar topilmadi"
 
         # Status emoji
@@ -204,8 +210,8 @@ async def my_orders(message: Message):
         text += "━━━━━━━━━━━━━━━━━━━━\n\n"
 
     # Agar ko'proq buyurtma bo'lsa
-    if len(orders) > 5:
-        text += f"... va yana {len(orders) - 5} ta buyurtma\n\n"
+    if total > len(orders):
+        text += f"... va yana {total - len(orders)} ta buyurtma\n\n"
 
     text += "📋 Batafsil ma'lumot uchun buyurtma raqamiga bosing."
 
@@ -224,14 +230,14 @@ async def view_order_detail(callback: CallbackQuery):
     order_id = int(callback.data.split(":")[1])
 
     # Buyurtmani olish
-    order = db.get_order(order_id)
+    order = await adb.get_order(order_id)
 
     if not order:
         await callback.answer("❌ Buyurtma topilmadi", show_alert=True)
         return
 
     # Tovar ma'lumotlarini olish
-    product = db.get_product(order['product_id'])
+    product = await adb.get_product(order['product_id'], include_deleted=True)
 
     if not product:
         await callback.answer("❌ Tovar topilmadi", show_alert=True)
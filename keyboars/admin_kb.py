@@ -36,6 +36,11 @@ def get_admin_main_menu() -> ReplyKeyboardMarkup:
         KeyboardButton(text="🔄 Eski tovarlarni yuklash")
     )
 
+    # Savdo hisoboti
+    builder.row(
+        KeyboardButton(text="📈 Savdo hisoboti")
+    )
+
     # To'rtinchi qator - xabar va chiqish
     builder.row(
         KeyboardButton(text="✉️ Xabar yuborish"),
@@ -283,6 +288,14 @@ def get_order_status_keyboard(order_id: int) -> InlineKeyboardMarkup:
             )
         )
 
+    # Yangi buyurtmalar navbatidagi keyingisi
+    builder.row(
+        InlineKeyboardButton(
+            text="⏭ Keyingi yangi buyurtma",
+            callback_data=f"admin_next_order:{order_id}"
+        )
+    )
+
     # Orqaga
     builder.row(
         InlineKeyboardButton(
@@ -294,20 +307,58 @@ def get_order_status_keyboard(order_id: int) -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
-def get_orders_list_keyboard(orders: List[Dict], limit: int = 20) -> InlineKeyboardMarkup:
+# Buyurtmalar ro'yxatidagi status bo'limlari (None - hammasi)
+ORDER_STATUS_TABS = [
+    [(None, "📋 Hammasi"), ('yangi', "🆕 Yangi"), ('tasdiqlandi', "✅ Tasdiqlangan")],
+    [('yetkazilmoqda', "🚚 Yetkazilmoqda"), ('yetkazildi', "✔️ Yetkazilgan"), ('bekor', "❌ Bekor")],
+]
+
+
+def get_orders_list_keyboard(
+    orders: List[Dict],
+    status: str = None,
+    next_cursor: str = None,
+    prev_cursor: str = None,
+    counts: Dict[str, int] = None
+) -> InlineKeyboardMarkup:
     """
-    Buyurtmalar ro'yxati klaviaturasi
+    Buyurtmalar ro'yxati klaviaturasi (bitta sahifa)
 
     Args:
-        orders: Buyurtmalar ro'yxati
-        limit: Ko'rsatiladigan maksimal buyurtmalar soni
+        orders: Sahifadagi buyurtmalar
+        status: Tanlangan status bo'limi (None - hammasi)
+        next_cursor: Eskiroq buyurtmalar sahifasi kursori
+        prev_cursor: Yangiroq buyurtmalar sahifasi kursori
+        counts: Statuslar bo'yicha buyurtmalar soni (bo'limlar nomida)
     """
     builder = InlineKeyboardBuilder()
+    tab = status or 'all'
 
-    # Faqat eng yangi buyurtmalar
-    recent_orders = orders[:limit]
+    def tab_title(value, title):
+        if counts is not None:
+            title = f"{title} ({counts.get(value, 0) if value else sum(counts.values())})"
+        return f"• {title}" if value == status else title
 
-    for order in recent_orders:
+    # Status bo'limlari
+    for row in ORDER_STATUS_TABS:
+        builder.row(*[
+            InlineKeyboardButton(
+                text=tab_title(value, title),
+                callback_data=f"admin_orders:{value or 'all'}:"
+            )
+            for value, title in row
+        ])
+
+    # Eng eski ishlanmagan buyurtmani ochish
+    if counts is None or counts.get('yangi'):
+        builder.row(
+            InlineKeyboardButton(
+                text="⏭ Navbatdagi yangi buyurtma",
+                callback_data="admin_next_order:"
+            )
+        )
+
+    for order in orders:
         # Status emoji
         status_emoji = {
             'yangi': '🆕',
@@ -327,6 +378,21 @@ def get_orders_list_keyboard(orders: List[Dict], limit: int = 20) -> InlineKeybo
             )
         )
 
+    # Sahifalar
+    navigation = []
+    if prev_cursor:
+        navigation.append(InlineKeyboardButton(
+            text="« Yangiroq",
+            callback_data=f"admin_orders:{tab}:{prev_cursor}"
+        ))
+    if next_cursor:
+        navigation.append(InlineKeyboardButton(
+            text="Eskiroq »",
+            callback_data=f"admin_orders:{tab}:{next_cursor}"
+        ))
+    if navigation:
+        builder.row(*navigation)
+
     # Orqaga
     builder.row(
         InlineKeyboardButton(
@@ -14,6 +14,7 @@ from handlers.user import start, catalog, order
 from handlers.admin import panel, products, categories, broadcast
 from middlewares.admin_check import AdminCheckMiddleware
 from utils.schedular import setup_scheduler
+from database.async_db import adb
 
 # Logging sozlamalari
 logging.basicConfig(
@@ -49,6 +50,11 @@ async def on_shutdown(bot: Bot):
     """Bot to'xtaganda"""
     logger.info("Bot to'xtatilmoqda...")
 
+    # Xotirada to'plangan savdo hisoboti o'zgarishlari va write-behind
+    # rejimida yozilmagan o'zgarishlarni diskka yozish
+    await adb.flush_sales()
+    await adb.flush()
+
     # Adminga xabar
     for admin_id in config.ADMINS:
         try:
@@ -102,6 +108,7 @@ async def main():
         await dp.start_polling(bot, allowed_updates=dp.resolve_used_update_types())
     finally:
         scheduler.shutdown()
+        adb.shutdown()
         await bot.session.close()
 
 
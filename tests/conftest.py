@@ -0,0 +1,58 @@
+"""
+Testlar uchun umumiy sozlamalar
+
+database.json_db import qilinganda global baza obyekti joriy papkadagi
+data/ ni ochadi, shuning uchun testlar vaqtinchalik papkada ishlaydi.
+Har bir test o'z bo'sh papkasini oladi (config dagi yo'llar nisbiy).
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(tempfile.mkdtemp(prefix="shop-tests-"))
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    """Har bir test uchun bo'sh ishchi papka"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def open_json(workdir):
+    """
+    JSONDatabase yaratuvchi
+
+    Test oxirida xotiradagi o'zgarishlar shu papkaga yoziladi - aks holda
+    ularni chiqishdagi (atexit) flush boshqa joriy papkaga yozib yuboradi.
+    """
+    from database.json_db import JSONDatabase
+    opened = []
+
+    def open_db():
+        db = JSONDatabase()
+        opened.append(db)
+        return db
+
+    yield open_db
+    for db in opened:
+        db.flush_sales()
+        db.flush()
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def backend(request, open_json):
+    """Ikkala backend uchun yangi baza yaratuvchi"""
+    def open_db():
+        if request.param == "sqlite":
+            from database.sqlite_db import SQLiteDatabase
+            os.makedirs("data", exist_ok=True)
+            return SQLiteDatabase("data/shop.db")
+        return open_json()
+    return open_db
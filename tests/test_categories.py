@@ -0,0 +1,73 @@
+"""
+Kategoriyalar: tovarlar kategoriyaga ID orqali bog'langan
+"""
+
+import os
+import sqlite3
+
+
+def test_rename_keeps_products(backend):
+    db = backend()
+    old_name = db.get_categories()[0]
+    product = db.add_product(old_name, "Ko'ylak", "Paxta", 100000)
+
+    assert db.update_category(old_name, "Yangi nom")
+
+    assert db.get_product(product['id'])['category'] == "Yangi nom"
+    assert [p['id'] for p in db.get_products_by_category("Yangi nom")] == [product['id']]
+    assert db.get_products_by_category(old_name) == []
+    assert "Yangi nom" in db.catalog().categories
+
+
+def test_rename_to_existing_name_fails(backend):
+    db = backend()
+    first, second = db.get_categories()[:2]
+
+    assert not db.update_category(first, second)
+    assert not db.update_category("Yo'q", "Boshqa")
+    assert db.get_categories()[:2] == [first, second]
+
+
+def test_deleted_category_name_is_reused(backend):
+    db = backend()
+    name = db.get_categories()[0]
+    old = db.add_product(name, "Eski", "", 1000)
+
+    assert db.delete_category(name)
+    assert db.add_category(name)
+    new = db.add_product(name, "Yangi", "", 2000)
+
+    assert [p['id'] for p in db.get_products_by_category(name)] == [new['id']]
+    # O'chirilgan tovar eski kategoriya nomini ko'rsataveradi
+    assert db.get_product(old['id'], include_deleted=True)['category'] == name
+
+
+def test_sqlite_migrates_category_names(workdir):
+    from database.sqlite_db import SQLiteDatabase
+
+    os.makedirs("data")
+    conn = sqlite3.connect("data/shop.db")
+    conn.executescript("""
+        CREATE TABLE categories (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL UNIQUE);
+        CREATE TABLE products (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, category TEXT NOT NULL, name TEXT NOT NULL,
+            description TEXT, price REAL NOT NULL, size TEXT, photo_id TEXT,
+            is_available INTEGER NOT NULL DEFAULT 1, created_at TEXT NOT NULL
+        );
+        INSERT INTO categories (name) VALUES ('Kiyim'), ('Oyoq kiyim');
+        INSERT INTO products (category, name, price, created_at) VALUES
+            ('Kiyim', 'Ko''ylak', 100, '2024-01-01 10:00:00'),
+            ('Sumka', 'Sumka', 50, '2024-01-01 10:00:00'),
+            ('Kiyim', 'Shim', 70, '2024-01-01 10:00:00');
+        DELETE FROM products WHERE id = 3;
+    """)
+    conn.close()
+
+    db = SQLiteDatabase("data/shop.db")
+
+    assert db.get_categories() == ['Kiyim', 'Oyoq kiyim']
+    assert [p['name'] for p in db.get_products_by_category('Kiyim')] == ["Ko'ylak"]
+    # Eski versiyada o'chirilgan kategoriya nomi saqlanib qoladi
+    assert db.get_product(2)['category'] == 'Sumka'
+    # AUTOINCREMENT hisoblagichi saqlanadi - o'chirilgan ID qayta berilmaydi
+    assert db.add_product('Kiyim', 'Kurtka', '', 200)['id'] == 4
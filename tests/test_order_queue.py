@@ -0,0 +1,35 @@
+"""
+Yangi buyurtmalar navbati (next_order)
+"""
+
+import time
+
+from database.models import OrderStatus
+
+
+def _place(db, count):
+    orders = []
+    for _ in range(count):
+        orders.append(db.create_order(1, "u", 1, "Ali", "+998901234567", "Toshkent"))
+        # created_at soniya aniqligida - tartib aniq bo'lsin
+        time.sleep(1.01)
+    return orders
+
+
+def test_next_returns_oldest_pending(backend):
+    db = backend()
+    oldest, middle, newest = _place(db, 3)
+
+    assert db.next_order()['id'] == oldest['id']
+    # Ro'yxatdan eng yangisi ochilib, "keyingi" bosilganda eskilari o'tkazib yuborilmaydi
+    assert db.next_order(skip=newest['id'])['id'] == oldest['id']
+    assert db.next_order(skip=oldest['id'])['id'] == middle['id']
+
+
+def test_next_skips_processed_and_viewed(backend):
+    db = backend()
+    first, second = _place(db, 2)
+
+    db.update_order_status(first['id'], OrderStatus.CONFIRMED)
+    assert db.next_order()['id'] == second['id']
+    assert db.next_order(skip=second['id']) is None
@@ -0,0 +1,153 @@
+"""
+Buyurtmalar partitsiyalari: eski formatdan ko'chirish, arxivlash,
+arxivdagi buyurtmani yangilash, uzilgan yozishni tuzatish va sahifalash
+"""
+
+import json
+import os
+from datetime import datetime
+
+import config
+from database import partitions
+
+
+def _month(delta):
+    return partitions.shift_month(datetime.now().strftime('%Y-%m'), delta)
+
+
+def _legacy(order_id, month, day=15, status='yangi', user_id=10):
+    return {
+        'id': order_id, 'order_number': f"ORD-{order_id}", 'user_id': user_id,
+        'username': 'u', 'product_id': 1, 'customer_name': 'Ali', 'phone': '+998901234567',
+        'address': 'Toshkent', 'quantity': 1, 'status': status,
+        'created_at': f"{month}-{day:02d} 10:{order_id // 60 % 60:02d}:{order_id % 60:02d}"
+    }
+
+
+def _seed(orders, journal=()):
+    os.makedirs(config.DATA_DIR, exist_ok=True)
+    with open(config.ORDERS_FILE, 'w') as f:
+        json.dump(orders, f)
+    if journal:
+        with open(config.ORDERS_JOURNAL_FILE, 'w') as f:
+            f.writelines(json.dumps(entry) + "\n" for entry in journal)
+
+
+def _manifest():
+    with open(config.ORDERS_MANIFEST_FILE) as f:
+        return json.load(f)['archived']
+
+
+def test_migrates_legacy_orders_json(open_json):
+    old, hot = _month(-12), _month(0)
+    _seed(
+        [_legacy(i, old) for i in range(1, 6)] + [_legacy(i, hot) for i in range(6, 9)],
+        journal=[{'op': 'status', 'id': 2, 'status': 'bekor'},
+                 {'op': 'status', 'id': 7, 'status': 'yetkazildi'}]
+    )
+
+    db = open_json()
+
+    for legacy in (config.ORDERS_FILE, config.ORDERS_JOURNAL_FILE):
+        assert not os.path.exists(legacy) and os.path.exists(legacy + ".migrated")
+    assert os.path.exists(partitions.hot_path(hot))
+    assert os.path.exists(partitions.cold_path(old)) and not os.path.exists(partitions.hot_path(old))
+    assert _manifest()[old]['count'] == 5
+
+    assert [o['id'] for o in db.get_orders()] == list(range(8, 0, -1))
+    assert db.get_order(2)['status'] == 'bekor'
+    assert db.get_order(7)['status'] == 'yetkazildi'
+    assert db.create_order(1, 'u', 1, 'n', 'p', 'a')['id'] == 9
+
+    # Qayta ochilganda ko'chirish takrorlanmaydi
+    assert len(open_json().get_all_orders()) == 9
+
+
+def test_archive_across_month_boundary(open_json, monkeypatch):
+    previous, current = _month(-1), _month(0)
+    _seed([_legacy(i, previous, 28) for i in range(1, 4)] + [_legacy(i, current, 1) for i in range(4, 6)])
+    db = open_json()
+    assert partitions.scan() == ([previous, current], [])
+
+    monkeypatch.setattr(config, 'ORDERS_HOT_MONTHS', 1)
+    assert db.archive_orders() == [previous]
+    assert db.archive_orders() == []
+
+    assert partitions.scan() == ([current], [previous])
+    info = _manifest()[previous]
+    assert (info['min_id'], info['max_id'], info['count']) == (1, 3, 3)
+
+    assert [o['id'] for o in db.get_orders()] == [5, 4, 3, 2, 1]
+    assert db.get_order(2)['created_at'].startswith(previous)
+    assert db.count_orders(since=f"{previous}-01 00:00:00") == 5
+    assert [o['id'] for o in open_json().get_orders(limit=3)] == [5, 4, 3]
+
+
+def test_cold_status_update_survives_restart(open_json):
+    old = _month(-12)
+    _seed([_legacy(i, old) for i in range(1, 4)])
+    db = open_json()
+    assert _manifest()[old]['statuses'] == {'yangi': 3}
+
+    assert db.update_order_status(2, 'yetkazildi')
+    assert db.get_order(2)['status'] == 'yetkazildi'
+
+    fresh = open_json()
+    assert fresh.get_order(2)['status'] == 'yetkazildi'
+    assert fresh.get_order_status_counts() == {'yangi': 2, 'yetkazildi': 1}
+    assert _manifest()[old]['statuses'] == {'yangi': 2, 'yetkazildi': 1}
+
+
+def test_repairs_truncated_last_line(open_json):
+    db = open_json()
+    for _ in range(3):
+        db.create_order(1, 'u', 1, 'n', 'p', 'a')
+    path = partitions.hot_path(_month(0))
+    with open(path, 'rb') as f:
+        intact = f.read()
+
+    # Yozish o'rtasida uzilgan qator
+    with open(path, 'ab') as f:
+        f.write(b'{"op": "status", "id": 2, "sta')
+
+    # O'qish faylga tegmaydi va to'liq bo'lmagan qatorni o'tkazib yuboradi
+    orders, _ = partitions.read_partition(path)
+    assert len(orders) == 3
+    with open(path, 'rb') as f:
+        assert f.read().endswith(b'"sta')
+
+    # Ishga tushish (eksklyuziv qulf) uni kesadi - keyingi yozuv yopishib qolmaydi
+    fresh = open_json()
+    with open(path, 'rb') as f:
+        assert f.read() == intact
+    assert fresh.update_order_status(2, 'bekor')
+    assert open_json().get_order(2)['status'] == 'bekor'
+
+
+def test_query_orders_cursor_across_hot_and_cold(open_json):
+    months = [_month(-14), _month(-13), _month(-1), _month(0)]
+    ids = iter(range(1, 100))
+    _seed([_legacy(next(ids), month, day) for month in months for day in (3, 9, 21)])
+    db = open_json()
+    assert len(partitions.scan()[1]) == 2
+
+    expected = [o['id'] for o in db.get_orders()]
+    assert len(expected) == 12
+
+    pages, cursor = [], None
+    while True:
+        page = db.query_orders(limit=5, cursor=cursor)
+        pages.append(page)
+        cursor = page['next']
+        if cursor is None:
+            break
+    assert [o['id'] for p in pages for o in p['orders']] == expected
+    assert [len(p['orders']) for p in pages] == [5, 5, 2]
+
+    # Orqaga: oxirgi sahifaning 'prev' kursori oldingi sahifani qaytaradi
+    back = db.query_orders(limit=5, cursor=pages[-1]['prev'])
+    assert [o['id'] for o in back['orders']] == [o['id'] for o in pages[1]['orders']]
+
+    # Faqat bitta foydalanuvchi - arxiv manifestga ko'ra tanlanadi
+    user_page = db.query_orders(user_id=10, limit=20)
+    assert [o['id'] for o in user_page['orders']] == expected
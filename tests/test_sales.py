@@ -0,0 +1,76 @@
+"""
+Savdo ko'rinishi: xotiradagi delta, davriy yozish va qayta qurish
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import config
+from database.models import OrderStatus
+
+from tests.conftest import ROOT
+
+
+def _order(db, quantity=1):
+    return db.create_order(1, "u", 1, "Ali", "+998901234567", "Toshkent", quantity, price=1000)
+
+
+def _totals(db):
+    return db.get_sales_report(days=1)['totals']
+
+
+def _file_totals():
+    with open(config.SALES_FILE) as f:
+        days = json.load(f)['days'].values()
+    return sum(d['orders'] for d in days), sum(d['cancelled'] for d in days)
+
+
+def test_order_writes_do_not_rewrite_sales_file(open_json):
+    db = open_json()
+    before = os.stat(config.SALES_FILE).st_mtime_ns
+
+    first = _order(db, 2)
+    _order(db)
+    db.update_order_status(first['id'], OrderStatus.CANCELLED)
+
+    assert os.stat(config.SALES_FILE).st_mtime_ns == before
+    totals = _totals(db)
+    assert (totals['orders'], totals['quantity'], totals['cancelled']) == (1, 1, 1)
+
+    assert db.flush_sales() is True
+    assert db.flush_sales() is False
+    assert _file_totals() == (1, 1)
+    assert _totals(open_json()) == totals
+
+
+def test_rebuilds_after_lost_deltas(open_json):
+    # Jarayon flush qilmasdan o'ldi - buyurtmalar bor, ko'rinishda yo'q
+    script = (
+        "import os\n"
+        "from database.json_db import db\n"
+        "db.record_post_event('opened'); db.flush_sales()\n"
+        "for _ in range(3): db.create_order(1, 'u', 1, 'n', 'p', 'a', price=1000)\n"
+        "os._exit(0)\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True,
+                   env=dict(os.environ, PYTHONPATH=ROOT))
+    assert _file_totals() == (0, 0)
+
+    db = open_json()
+    assert _file_totals() == (3, 0)
+    totals = _totals(db)
+    assert (totals['orders'], totals['opened']) == (3, 1)
+
+
+def test_rebuild_drops_deltas_already_counted(open_json):
+    # Boshqa jarayon qayta qurgan ko'rinish bu jarayonning yozilmagan
+    # buyurtmasini ham hisoblagan - flush uni ikkinchi marta qo'shmasligi kerak
+    db = open_json()
+    _order(db)
+    open_json()
+    db.flush_sales()
+
+    assert _file_totals() == (1, 0)
+    assert _totals(db)['orders'] == 1
@@ -0,0 +1,32 @@
+"""
+Atomik yozish
+"""
+
+import os
+import stat
+
+from database import storage
+
+
+def _mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_new_file_gets_default_mode(workdir):
+    path = str(workdir / "new.json")
+    storage.atomic_write(path, b"[]")
+
+    assert _mode(path) == 0o666 & ~storage._UMASK
+    assert open(path, "rb").read() == b"[]"
+
+
+def test_replace_keeps_existing_mode(workdir):
+    path = str(workdir / "shared.json")
+    with open(path, "wb") as f:
+        f.write(b"{}")
+    os.chmod(path, 0o664)
+
+    storage.atomic_write(path, b'{"a": 1}')
+
+    assert _mode(path) == 0o664
+    assert open(path, "rb").read() == b'{"a": 1}'
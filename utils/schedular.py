@@ -4,11 +4,12 @@ Avtomatik post qilish scheduler - To'liq versiya
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from aiogram import Bot
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from datetime import datetime
 import config
-from database.json_db import db
+from database.async_db import adb
 import logging
 
 logger = logging.getLogger(__name__)
@@ -23,7 +24,7 @@ async def post_random_products(bot: Bot):
         logger.info(f"[{datetime.now()}] Avtomatik post boshlandi...")
 
         # Random tovarlarni olish
-        products = db.get_random_products(count=config.DAILY_POSTS_COUNT)
+        products = await adb.get_random_products(count=config.DAILY_POSTS_COUNT)
 
         if not products:
             logger.warning(f"[{datetime.now()}] Tovarlar topilmadi!")
@@ -106,6 +107,9 @@ async def post_random_products(bot: Bot):
                     except Exception as e:
                         logger.error(f"[{datetime.now()}] ❌ Guruhga yuborishda xatolik: {e}")
 
+                # Savdo hisobotidagi postlar konversiyasi uchun
+                await adb.record_post_event('posted')
+
             except Exception as e:
                 logger.error(f"[{datetime.now()}] ❌ Tovar post qilishda xatolik: {e}")
 
@@ -115,6 +119,40 @@ async def post_random_products(bot: Bot):
         logger.error(f"[{datetime.now()}] ❌ Scheduler xatolik: {e}")
 
 
+async def archive_old_orders():
+    """
+    Eski oylarning buyurtmalarini arxivga o'tkazish (har kuni tunda)
+    """
+    try:
+        months = await adb.archive_orders()
+        if months:
+            logger.info(f"[{datetime.now()}] 📦 Buyurtmalar arxivlandi: {', '.join(months)}")
+    except Exception as e:
+        logger.error(f"[{datetime.now()}] ❌ Buyurtmalarni arxivlashda xatolik: {e}")
+
+
+async def compact_catalog():
+    """
+    O'chirilgan tovar va kategoriyalarni fayllardan olib tashlash (har kuni tunda)
+    """
+    try:
+        moved = await adb.compact_catalog()
+        if moved:
+            logger.info(f"[{datetime.now()}] 🗑 Katalog siqildi: {moved} ta tovar arxivga ko'chirildi")
+    except Exception as e:
+        logger.error(f"[{datetime.now()}] ❌ Katalogni siqishda xatolik: {e}")
+
+
+async def flush_sales():
+    """
+    Xotirada to'plangan savdo o'zgarishlarini hisobot fayliga yozish (har daqiqada)
+    """
+    try:
+        await adb.flush_sales()
+    except Exception as e:
+        logger.error(f"[{datetime.now()}] ❌ Savdo hisobotini yozishda xatolik: {e}")
+
+
 def setup_scheduler(bot: Bot) -> AsyncIOScheduler:
     """
     Schedulerni sozlash va ishga tushirish
@@ -153,6 +191,33 @@ def setup_scheduler(bot: Bot) -> AsyncIOScheduler:
         except Exception as e:
             logger.error(f"❌ Scheduler qo'shishda xatolik ({time_str}): {e}")
 
+    # Buyurtmalar arxivi (oy almashganda eski partitsiyalar arxivlanadi)
+    scheduler.add_job(
+        archive_old_orders,
+        trigger=CronTrigger(hour=3, minute=30, timezone="Asia/Tashkent"),
+        id="archive_orders",
+        replace_existing=True,
+        name="Buyurtmalarni arxivlash"
+    )
+
+    # O'chirilgan tovarlarni fayllardan tozalash
+    scheduler.add_job(
+        compact_catalog,
+        trigger=CronTrigger(hour=3, minute=45, timezone="Asia/Tashkent"),
+        id="compact_catalog",
+        replace_existing=True,
+        name="Katalogni siqish"
+    )
+
+    # Savdo hisoboti o'zgarishlari xotirada to'planadi - ularni vaqti-vaqti bilan yozish
+    scheduler.add_job(
+        flush_sales,
+        trigger=IntervalTrigger(minutes=1),
+        id="flush_sales",
+        replace_existing=True,
+        name="Savdo hisobotini yozish"
+    )
+
     logger.info("=" * 50)
     logger.info(f"📊 Jami {len(config.AUTO_POST_TIMES)} ta avtomatik post sozlandi")
     logger.info(f"📦 Har bir post: {config.DAILY_POSTS_COUNT} ta random tovar")